@@ -1,5 +1,6 @@
 from typing import Any
 from typing import Optional
+from typing import Tuple
 import os
 
 import os
@@ -26,6 +27,8 @@ from telliot_feeds.integrations.diva_protocol import DIVA_DIAMOND_ADDRESS
 from telliot_feeds.integrations.diva_protocol import DIVA_FETCH_MIDDLEWARE_ADDRESS
 from telliot_feeds.integrations.diva_protocol.report import DIVAProtocolReporter
 from telliot_feeds.queries.query_catalog import query_catalog
+from telliot_feeds.reporters.feed_scheduler import FeedScheduler
+from telliot_feeds.reporters.feed_scheduler import ScheduledFeed
 from telliot_feeds.reporters.flashbot import FlashbotsReporter
 from telliot_feeds.reporters.rng_interval import RNGReporter
 from telliot_feeds.reporters.rng_interval_custom import RNGCustomReporter
@@ -33,6 +36,7 @@ from telliot_feeds.reporters.fetch_360 import Fetch360Reporter
 from telliot_feeds.reporters.fetch_flex import FetchFlexReporter
 from telliot_feeds.utils.cfg import check_endpoint
 from telliot_feeds.utils.cfg import setup_config
+from telliot_feeds.utils.http_client import close_client_session
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.reporter_utils import create_custom_contract
 from telliot_feeds.utils.reporter_utils import prompt_for_abi
@@ -95,6 +99,15 @@ def reporter() -> None:
     nargs=1,
     type=click.Choice([q.tag for q in query_catalog.find()]),
 )
+@click.option(
+    "--query-tags",
+    "-qts",
+    "query_tags",
+    help="report several datafeeds, each every wait period, using query tags",
+    required=False,
+    multiple=True,
+    type=click.Choice([q.tag for q in query_catalog.find()]),
+)
 @click.option(
     "--gas-limit",
     "-gl",
@@ -337,6 +350,7 @@ def reporter() -> None:
 async def report(
     ctx: Context,
     query_tag: str,
+    query_tags: Tuple[str, ...],
     build_feed: bool,
     tx_type: int,
     gas_limit: int,
@@ -436,9 +450,14 @@ async def report(
         else:
             chosen_feed = None
 
+        missing_tags = [tag for tag in query_tags if tag not in CATALOG_FEEDS]
+        if missing_tags:
+            click.echo(f"No corresponding datafeed found for query tags: {', '.join(missing_tags)}\n")
+            return
+
         print_reporter_settings(
             signature_address=sig_acct_addr,
-            query_tag=query_tag,
+            query_tag=query_tag or ", ".join(query_tags),
             transaction_type=tx_type,
             gas_limit=gas_limit,
             max_fee=max_fee,
@@ -560,15 +579,29 @@ async def report(
 
         os.environ["PRICE_VALIDATION_METHOD"] = price_validation_method
 
-        if submit_once:
-
-            if (chosen_feed is not None and
-                hasattr(chosen_feed.query, 'asset') and
-                chosen_feed.query.asset in managed_feeds.assets):
-                await reporter.managed_feed_report(submit_once=True)
-                return
-
-            _, _ = await reporter.report_once()
-
-        else:
-            await reporter.report()
+        try:
+            if query_tags:
+                scheduled_feeds = [
+                    ScheduledFeed(datafeed=CATALOG_FEEDS[tag], interval=reporter.wait_period)  # type: ignore
+                    for tag in query_tags
+                ]
+                scheduler = FeedScheduler(reporter, scheduled_feeds)
+                if submit_once:
+                    _ = await scheduler.report_due()
+                else:
+                    await scheduler.run()
+
+            elif submit_once:
+
+                if (chosen_feed is not None and
+                    hasattr(chosen_feed.query, 'asset') and
+                    chosen_feed.query.asset in managed_feeds.assets):
+                    await reporter.managed_feed_report(submit_once=True)
+                else:
+                    _, _ = await reporter.report_once()
+
+            else:
+                await reporter.report()
+        finally:
+            # connections of the price sources, shared by all requests
+            await close_client_session()
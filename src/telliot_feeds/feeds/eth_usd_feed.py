@@ -13,6 +13,8 @@ eth_usd_median_feed = DataFeed(
         asset="eth",
         currency="usd",
         algorithm="median",
+        deadline=10.0,
+        quorum=3,
         sources=[
             CoinGeckoSpotPriceSource(asset="eth", currency="usd"),
             BinanceSpotPriceSource(asset="eth", currency="usdt"),
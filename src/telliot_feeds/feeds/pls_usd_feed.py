@@ -39,5 +39,6 @@ else:
             currency="usd",
             algorithm="weighted_average",
             sources=get_sources_objs(),
+            deadline=15.0,
         ),
     )
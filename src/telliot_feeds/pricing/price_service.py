@@ -2,10 +2,13 @@ from abc import ABC
 from abc import abstractmethod
 from typing import Any
 from typing import Dict
+from typing import Optional
 
 import requests
 
 from telliot_feeds.dtypes.datapoint import OptionalWeightedDataPoint
+from telliot_feeds.utils.http_client import get_json
+from telliot_feeds.utils.http_client import post_json
 
 
 class PriceServiceInterface(ABC):
@@ -72,3 +75,33 @@ class WebPriceService(PriceServiceInterface):
 
             except Exception as e:
                 return {"error": str(type(e)), "exception": e}
+
+    async def get_url_async(self, url: str = "", headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Non-blocking version of `get_url`
+
+        The request goes through the connection pool shared by all web price
+        services, bounded by this service's timeout.
+
+        Args:
+            url: URL to fetch
+            headers: optional request headers
+
+        Returns:
+            Same dictionary as `get_url`
+        """
+        return await get_json(self.url + url, timeout=self.timeout, headers=headers)
+
+    async def post_url_async(
+        self, url: str = "", json_data: Any = None, headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """POST a JSON body (i.e. a subgraph query) through the shared connection pool
+
+        Args:
+            url: URL to post to
+            json_data: JSON request body
+            headers: optional request headers
+
+        Returns:
+            Same dictionary as `get_url`
+        """
+        return await post_json(self.url + url, json_data=json_data, timeout=self.timeout, headers=headers)
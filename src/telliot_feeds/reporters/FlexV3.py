@@ -1,16 +1,23 @@
+import asyncio
 import os
 from collections.abc import Callable
+from typing import Optional
 
 from urllib.parse import urlencode
 
-import requests
 from web3 import Web3
 from telliot_core.utils.key_helpers import lazy_unlock_account
 from telliot_feeds.datafeed import DataFeed
 from chained_accounts import ChainedAccount
 from telliot_core.contract.contract import Contract
 from telliot_core.model.endpoints import RPCEndpoint
+from telliot_feeds.reporters.submit_template import get_submit_template
+from telliot_feeds.reporters.submit_template import SubmitValueTemplate
+from telliot_feeds.utils.fee_oracle import FeeOracle
+from telliot_feeds.utils.http_client import get_json
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.nonce_manager import NonceManager
+from telliot_feeds.utils.tx_manager import TransactionManager
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -91,7 +98,10 @@ class FlexV3(Contract):
       oracle: Contract,
       price_validation_method: str,
       price_validation_consensus: str,
-      continue_reporting_on_validator_unreachable: bool
+      continue_reporting_on_validator_unreachable: bool,
+      nonce_manager: Optional[NonceManager] = None,
+      fee_oracle: Optional[FeeOracle] = None,
+      tx_manager: Optional[TransactionManager] = None
     ):
         super().__init__(endpoint.url)
         self.datafeed = datafeed
@@ -104,24 +114,21 @@ class FlexV3(Contract):
         self.price_validation_consensus = price_validation_consensus
         self.continue_reporting_on_validator_unreachable = continue_reporting_on_validator_unreachable
         self.flexv3_contract = self._get_contract(self.oracle.address)
+        # submitValue calldata and gas estimates by query id
+        self.submit_templates: dict[bytes, SubmitValueTemplate] = {}
+        # shared with the reporter sending other transactions from the account
+        self.nonce_manager = nonce_manager or NonceManager(self.w3, Web3.toChecksumAddress(self.account.address))
+        self.fee_oracle = fee_oracle
+        self.tx_manager = tx_manager or TransactionManager(self.w3, self.account, self.nonce_manager)
+        # submissions being confirmed
+        self.confirmations: set[asyncio.Task] = set()
         self.tolerance = float(os.getenv("PRICE_TOLERANCE", 1e-2))
         tolerance_info = f" ({self.tolerance * 100}%)" if self.price_validation_method != 'absolute_difference' else ""
+        self.price_validation_timeout = float(os.getenv("PRICE_VALIDATION_TIMEOUT", 10))
         logger.info(f"FlexV3 price tolerance: {self.tolerance}{tolerance_info}")
 
-    def _send_request(self, url: str) -> requests.Response:
+    async def _is_price_valid(self, value: float):
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return response
-        except requests.RequestException as e:
-            logger.error(f"Error fetching data from {url}: {e}")
-            if e.response is not None:
-                logger.error(f"Error response: {e.response.text}")
-
-    def _is_price_valid(self, value: float):
-        try:
-            self.session = requests.Session()
-
             query_params = urlencode({
                 "price": value,
                 "tolerance": self.tolerance * 100 if "percentage" in self.price_validation_method else self.tolerance,
@@ -132,10 +139,11 @@ class FlexV3(Contract):
 
             logger.info(f"Validating price with Price Service API: {requests_url}")
 
-            response = self._send_request(requests_url)
-            if not response:
-                raise Exception(f"Could not get price validator response")
-            data = response.json()
+            # shared async client, so the loop isn't blocked while the validator answers
+            response = await get_json(requests_url, timeout=self.price_validation_timeout)
+            if "error" in response:
+                raise Exception(f"Could not get price validator response: {response['error']} {response.get('exception')}")
+            data = response["response"]
 
             green_color = '\033[92m'
             endc_color = '\033[0m'
@@ -150,7 +158,7 @@ class FlexV3(Contract):
             logger.info(f"""
                 {green_color}
                 Price Validator Service API info:
-                Request URL: {response.url}
+                Request URL: {requests_url}
                 Validation method: {data['validation_method']}
                 Consensus: {data["consensus_method"]}
                 Tolerance: {data['price_tolerance']}{'%' if 'percentage' in data['validation_method'] else ''}
@@ -169,8 +177,6 @@ class FlexV3(Contract):
             
             logger.error(f"Error validating price with Price Service API: {e}, stopping reporting")
             raise SystemExit(1)
-        finally:
-            self.session.close()
 
     async def fetch_new_datapoint(self):
         try:
@@ -195,17 +201,18 @@ class FlexV3(Contract):
         return self.flexv3_contract.functions.getNewValueCountbyQueryId(query_id).call()
     
     def fetch_gas_price(self) -> float:
-        priceGwei = self.w3.fromWei(self.w3.eth.gas_price, "gwei")
+        if self.fee_oracle is not None and self.fee_oracle.fresh:
+            # next base fee plus the median priority fee of recent blocks, without an RPC call
+            price = self.fee_oracle.next_base_fee + (self.fee_oracle.percentile(50) or 0)
+        else:
+            price = self.w3.eth.gas_price
+        priceGwei = self.w3.fromWei(price, "gwei")
         return float(priceGwei) * 1.4
 
-    def submitValue(self, value, nonce, queryData, queryId):
-        contract_function = self.flexv3_contract.get_function_by_name('submitValue')
-        transaction = contract_function(
-            _queryId=queryId,
-            _value=value,
-            _nonce=nonce,
-            _queryData=queryData
-        )
+    async def submitValue(self, value, nonce, queryData, queryId, fees):
+        template = get_submit_template(self.submit_templates, self.flexv3_contract, queryId, queryData)
+        if template is None:
+            raise Exception("Unable to build submitValue transaction")
         logger.info(f"""
             Submitting value to Flex V3 contract:
             value: {value.hex()}
@@ -213,64 +220,111 @@ class FlexV3(Contract):
             _queryId: {queryId.hex()}
         """)
         account_address = Web3.toChecksumAddress(self.account.address)
-        logger.info("Estimating gas limit")
-        gas_limit = transaction.estimateGas({"from": account_address})
-
-        priority_fee, max_fee = self.get_fees()
-        tx_dict = {
-            "from": account_address,
-            "nonce": self.w3.eth.get_transaction_count(account_address),
-            "gas": gas_limit,
+        # estimated once per value size
+        gas_limit = await asyncio.to_thread(template.estimate_gas, self.w3, account_address, value, nonce)
+
+        priority_fee, max_fee = fees
+        fee_params = {
             "maxFeePerGas": self.w3.toWei(max_fee, "gwei"),
             "maxPriorityFeePerGas": self.w3.toWei(priority_fee, "gwei"),
-            "chainId": self.chain_id,
         }
-        built_tx = transaction.buildTransaction(tx_dict)
+        lazy_unlock_account(self.account)
 
-        logger.info(f"""
-            Transaction info:
-            from: {built_tx['from']}
-            nonce: {built_tx['nonce']}
-            gas_limit: {built_tx['gas']}
-            maxFeePerGas: {built_tx['maxFeePerGas']}
-            maxPriorityFeePerGas: {built_tx['maxPriorityFeePerGas']}
-            chainId: {built_tx['chainId']}
-        """)
+        account_nonce = await asyncio.to_thread(self.nonce_manager.reserve)
+        try:
+            built_tx = template.build(value, nonce, account_nonce, gas_limit, self.chain_id, fee_params)
 
-        lazy_unlock_account(self.account)
-        local_account = self.account.local_account
-        tx_signed = local_account.sign_transaction(built_tx)
-        logger.info("Sending submitValue transaction")
-        tx_hash = self.w3.eth.send_raw_transaction(tx_signed.rawTransaction)
-        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=360)
+            logger.info(f"""
+                Transaction info:
+                from: {account_address}
+                nonce: {built_tx['nonce']}
+                gas_limit: {built_tx['gas']}
+                maxFeePerGas: {built_tx['maxFeePerGas']}
+                maxPriorityFeePerGas: {built_tx['maxPriorityFeePerGas']}
+                chainId: {built_tx['chainId']}
+            """)
+
+            logger.info("Sending submitValue transaction")
+            submission, status = await self.tx_manager.send(built_tx)
+        except Exception:
+            # not sent, the nonce can be reused by the next transaction
+            self.nonce_manager.release(account_nonce)
+            raise
+        if submission is None:
+            if "nonce" in str(status.e).lower():
+                self.nonce_manager.reset()
+            else:
+                self.nonce_manager.release(account_nonce)
+            raise Exception(status.error)
+
+        # confirmed in the background, new triggers are evaluated meanwhile
+        confirmation = asyncio.create_task(self._confirm(submission, template, queryId, nonce))
+        self.confirmations.add(confirmation)
+        confirmation.add_done_callback(self.confirmations.discard)
+        return submission
+
+    async def _confirm(self, submission, template, queryId, nonce):
+        """Wait for a submission to be mined and log the outcome"""
+        async def still_needed():
+            # someone else reported meanwhile, the value would be rejected
+            return await asyncio.to_thread(self.getNewValueCountbyQueryId, queryId) == nonce
+
+        # replaced with higher fees while stuck, cancelled if no longer needed
+        tx_receipt, status = await self.tx_manager.wait(submission, timeout=360, still_needed=still_needed)
+        metrics = self.tx_manager.receipts.metrics
+        logger.info(
+            f"Receipts: {metrics.confirmed} confirmed, {metrics.reverted} reverted, "
+            f"{len(self.tx_manager.receipts.in_flight)} in flight, "
+            f"mean confirmation time: {metrics.mean_confirmation_seconds or 0:.1f}s"
+        )
+        if tx_receipt is None:
+            logger.error(f"Failed to confirm transaction: {status.error}")
+            # not mined in time: ask the node for the nonce again
+            self.nonce_manager.reset()
+            return None
+        tx_url = f"{self.endpoint.explorer}/tx/{tx_receipt['transactionHash'].hex()}"
+        if tx_receipt["transactionHash"] in submission.cancel_hashes:
+            logger.info(f"Transaction cancelled, query {queryId.hex()} reported meanwhile: {tx_url}")
+            return None
         if tx_receipt["status"] == 0:
-            logger.error(tx_receipt)
-            raise Exception(f"Transaction reverted. ({tx_hash.hex()})\nFailed to confirm transaction\n{tx_receipt}")
+            # the revert may come from an outdated gas estimate
+            template.forget_gas_limits()
+            logger.error(f"Transaction reverted. ({tx_url})\nFailed to confirm transaction\n{tx_receipt}")
+            return None
+        logger.info(f"View reported data: \n{tx_url}")
         return tx_receipt
-        
+
+    async def wait_for_confirmations(self):
+        """Wait for the submissions being confirmed in the background"""
+        await asyncio.gather(*self.confirmations, return_exceptions=True)
+
     async def callSubmitValue(self):
         logger.info("Calling Submit Value")
         try:
           query_id = self.datafeed.query.query_id
           query_data = self.datafeed.query.query_data
 
-          report_count = self.getNewValueCountbyQueryId(query_id)
+          report_count = await asyncio.to_thread(self.getNewValueCountbyQueryId, query_id)
           logger.info(f'Report count: {report_count} (query_id: {query_id.hex()})')
 
           value, value_enconded = await self.fetch_new_datapoint()
 
-          if not self._is_price_valid(value):
+          if not await self._is_price_valid(value):
             raise Exception(f"Datafeed value {value} is not close to price service api pls price")
 
-          tx_receipt = self.submitValue(
+          priority_fee, max_fee = await self.get_fees()
+          if priority_fee is None or max_fee is None:
+            raise Exception("Unable to suggest type 2 txn fees")
+
+          submission = await self.submitValue(
               value=value_enconded,
               nonce=report_count,
               queryData=query_data,
-              queryId=query_id
+              queryId=query_id,
+              fees=(priority_fee, max_fee)
           )
-          tx_hash = tx_receipt['transactionHash'].hex()
-          tx_url = f"{self.endpoint.explorer}/tx/{tx_hash}"
-          logger.info(f"View reported data: \n{tx_url}")
+          tx_hash = submission.tx_hash.hex()
+          logger.info(f"Submitted transaction: {self.endpoint.explorer}/tx/{tx_hash}")
           return tx_hash
         except Exception as e:
             logger.error(f"Error submitting report: {e}")
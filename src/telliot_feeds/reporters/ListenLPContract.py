@@ -1,13 +1,18 @@
 import os
 from collections.abc import Callable
+from typing import Optional
 import logging
 from logging.handlers import RotatingFileHandler
 import time
 import asyncio
-import threading
+import json
 from web3 import Web3
 from web3.contract import Contract
 from eth_abi import decode_abi
+import websockets
+from telliot_feeds.sources.price.spot.pulsechain_pulsex import pls_lps_order
+from telliot_feeds.sources.price.spot.pulsechain_pulsex import get_price_and_tvl
+from telliot_feeds.sources.price_aggregator import weighted_average
 from telliot_feeds.utils.log import get_logger
 from dotenv import load_dotenv
 
@@ -36,6 +41,17 @@ class Contract:
         ],
         "name": "Sync",
         "type": "event"
+    },
+    {
+        "inputs": [],
+        "name": "getReserves",
+        "outputs": [
+            {"internalType": "uint112", "name": "reserve0", "type": "uint112"},
+            {"internalType": "uint112", "name": "reserve1", "type": "uint112"},
+            {"internalType": "uint32", "name": "blockTimestampLast", "type": "uint32"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
     }
     ]
     """
@@ -72,11 +88,13 @@ class Contract:
         return self.w3.eth.contract(address=address, abi=self.ABI)
 
 class ListenLPContract(Contract):
+    SYNC_TOPIC = Web3.keccak(text="Sync(uint112,uint112)").hex()
+
     def __init__(
             self,
-            sync_event: threading.Event,
-            time_limit_event: threading.Event,
-            is_submitting_report: threading.Event,
+            sync_event: asyncio.Event,
+            time_limit_event: asyncio.Event,
+            is_submitting_report: asyncio.Event,
             current_report_time: dict[str,int],
             fetch_new_datapoint: Callable
     ):
@@ -96,15 +114,70 @@ class ListenLPContract(Contract):
         self.is_initialized = False
 
         self.reorg_safe_default = int(os.getenv('REORG_SAFE_DEFAULT', 10))
+        self.ws_url = os.getenv('LP_PULSE_WS_URL')
+        self.ws_retry_interval = int(os.getenv('LP_WS_RETRY_INTERVAL', 60))
+        self.tasks: list[asyncio.Task] = []
+        self.reserves: dict[str, tuple[int, int]] = {}
+        self.lps_currency: dict[str, str] = self._get_LPs_currency()
 
         logger.info(f"Time limit: {self.time_limit} seconds")
         logger.info(f"ListenLPContract percentage change threshold: {self.percentage_change_threshold} ({self.percentage_change_threshold * 100}%)")
     
+    def _get_LPs_currency(self) -> dict[str, str]:
+        """Currency of every listened LP, the non-PLS token of its pair name"""
+        lps_currency = {}
+        for address, pair_name in self.lps_config.items():
+            tokens = [token.strip().lower() for token in pair_name.split('/')]
+            currencies = [token for token in tokens if "pls" not in token]
+            if len(currencies) != 1 or currencies[0] not in pls_lps_order:
+                logger.warning(f"No currency found for LP {address} ({pair_name}), its reserves are not used for the price")
+                continue
+            lps_currency[address] = currencies[0]
+        return lps_currency
+
+    async def _load_reserves(self):
+        """Seed the reserves of every LP, later kept up to date from Sync events"""
+        for lp_contract in self.lps_contracts:
+            try:
+                reserve0, reserve1, _ = await asyncio.to_thread(lp_contract.functions.getReserves().call)
+                self.reserves[lp_contract.address] = (reserve0, reserve1)
+            except Exception as e:
+                logger.warning(f"Unable to load reserves of LP {lp_contract.address}: {e}")
+
+    def _compute_price(self) -> Optional[float]:
+        """TVL-weighted PLS price of the known LP reserves, computed like PulsechainPulseXService"""
+        prices = []
+        weights = []
+        for address, (reserve0, reserve1) in self.reserves.items():
+            currency = self.lps_currency.get(address)
+            if currency is None:
+                continue
+            try:
+                price, tvl = get_price_and_tvl(currency, reserve0, reserve1)
+            except Exception as e:
+                logger.warning(f"Unable to compute price of LP {address} from reserves: {e}")
+                continue
+            prices.append(float(price))
+            weights.append(float(tvl))
+
+        if not prices:
+            return None
+        return weighted_average(prices, weights)
+
+    async def _get_price(self) -> Optional[float]:
+        """Price from the LP reserves, or from the datafeed sources if no reserves are known"""
+        value = self._compute_price()
+        if value is None:
+            logger.info("No LP reserves available, fetching price from datafeed sources")
+            value, _ = await self.fetch_new_datapoint()
+        return value
+
     async def initialize_price(self):
         try:
             if self.is_initialized: return
             logger.info("Initializing value")
-            value, _ = await self.fetch_new_datapoint()
+            await self._load_reserves()
+            value = await self._get_price()
             if value is None: raise Exception("Error fetching new datapoint for initialization")
             self.previous_value = value
             logger.info(f"Initialized with value: {value}")
@@ -121,55 +194,74 @@ class ListenLPContract(Contract):
         if time_elapsed > self.time_limit:
             if not self.time_limit_event.is_set():
                 logger.info(f"Time limit reached, setting time limit event (time elapsed={time_elapsed:.2f}, time limit={self.time_limit})")
-                value, _ = await self.fetch_new_datapoint()
+                value = await self._get_price()
                 if value is None: raise Exception("Error fetching new datapoint for time limit event")
                 self.previous_value = value
                 self.time_limit_event.set()
                 self.sync_event.set()
 
     def _address_to_pair_name(self, lp_address: str):
-        return self.lps_config[lp_address]
-
-    async def _handle_event(self, event):
-        data_processed = event['data'][2:] if event['data'].startswith('0x') else event['data']
-        reserve0, reserve1 = decode_abi(['uint112', 'uint112'], bytes.fromhex(data_processed))
-
-        logger.info(f"""
-            LP Sync event received:
-            address: {event['address']}
-            Pair: {self._address_to_pair_name(event['address'])}
-            reserve0: {reserve0}
-            reserve1: {reserve1}
-        """)
-
-        if self.is_sync_event_handled:
-            logger.info(
-                f"""
-                Sync event already handled in the current poll:
-                Pair: {self.pair_handled_data['name']}
-                reserve0: {self.pair_handled_data['reserve0']}
-                reserve1: {self.pair_handled_data['reserve1']}
-                """
-            )
-            return
-
-        value, _ = await self.fetch_new_datapoint()
+        return self.lps_config[Web3.toChecksumAddress(lp_address)]
+
+    def _decode_sync_events(self, events) -> dict[str, tuple[int, int]]:
+        """Decode a batch of Sync logs, keeping only the latest reserves of each pair
+
+        Logs are returned by `eth_getLogs` in (block, log index) order, so the
+        last log of an address holds the current reserves of its pair.
+        """
+        latest_reserves = {}
+        for event in events:
+            data_processed = event['data'][2:] if event['data'].startswith('0x') else event['data']
+            latest_reserves[Web3.toChecksumAddress(event['address'])] = decode_abi(['uint112', 'uint112'], bytes.fromhex(data_processed))
+        return latest_reserves
+
+    async def _handle_reserves(self, latest_reserves: dict[str, tuple[int, int]]):
+        for address, (reserve0, reserve1) in latest_reserves.items():
+            logger.info(f"""
+                LP Sync event received:
+                address: {address}
+                Pair: {self._address_to_pair_name(address)}
+                reserve0: {reserve0}
+                reserve1: {reserve1}
+            """)
+            self.reserves[address] = (reserve0, reserve1)
+
+        value = await self._get_price()
+        if value is None: raise Exception("Error fetching new datapoint for Sync events")
         percentage_change = self._get_percentage_change(self.previous_value, value)
-        
+
         if percentage_change >= self.percentage_change_threshold * 100:
             logger.info(f"Triggering report - Percentage change threshold reached ({percentage_change:.4f}%)")
             self.previous_value = value
             self.sync_event.set()
         else:
             logger.info(f"Not triggering report - Percentage change threshold not reached ({percentage_change:.4f}%)")
-        
-        self.is_sync_event_handled = True
-        self.pair_handled_data = {
-            'name': self._address_to_pair_name(event['address']), 'reserve0': reserve0, 'reserve1': reserve1
+
+    async def _poll_logs(self):
+        block_number = await asyncio.to_thread(self.w3.eth.get_block_number)
+
+        if block_number < self.from_block:
+            logger.info(f"Reorg detected, resetting from_block ({self.from_block}) to {block_number - self.reorg_safe_default}")
+            self.from_block = block_number - self.reorg_safe_default
+
+        event_filter = {
+            "fromBlock": self.from_block,
+            "toBlock": block_number,
+            "address": [lp_contract.address for lp_contract in self.lps_contracts],
+            "topics": [self.SYNC_TOPIC],
         }
+        events = await asyncio.to_thread(self.w3.eth.get_logs, event_filter)
+        latest_reserves = self._decode_sync_events(events)
+        if latest_reserves:
+            logger.info(f"{len(events)} Sync events received for {len(latest_reserves)} pairs")
+            await self._handle_reserves(latest_reserves)
 
-    async def _log_loop(self, polling_interval=8):
-        while True:
+        self.from_block = block_number
+
+    async def _log_loop(self, polling_interval=8, until: Optional[float] = None):
+        """Poll Sync logs every `polling_interval` seconds (until the `until` loop time, if given)"""
+        loop = asyncio.get_running_loop()
+        while until is None or loop.time() < until:
             logger.info("Listening Sync events...")
             if not self.is_initialized: await self.initialize_price()
             if self.is_submitting_report.is_set():
@@ -177,45 +269,89 @@ class ListenLPContract(Contract):
                 await asyncio.sleep(polling_interval)
                 continue
             try:
-                self.is_sync_event_handled = False
-                self.pair_handled_data = None
-                block_number = self.w3.eth.get_block_number()
-
-                if block_number < self.from_block:
-                    logger.info(f"Reorg detected, resetting from_block ({self.from_block}) to {block_number - self.reorg_safe_default}")
-                    self.from_block = block_number - self.reorg_safe_default
-
-                event_filters = [
-                    {
-                        "fromBlock": self.from_block,
-                        "toBlock": block_number,
-                        "address": lp_contract.address,
-                        "topics": [Web3.keccak(text="Sync(uint112,uint112)").hex()],
-                    } for lp_contract in self.lps_contracts
-                ]
-
-                for event_filter in event_filters:
-                    events = self.w3.eth.get_logs(event_filter)
-
-                    for event in events:
-                        await self._handle_event(event)
-
-                self.from_block = block_number
-                await self._check_time_limit()
-                await asyncio.sleep(polling_interval)
+                await self._poll_logs()
             except Exception as e:
                 logger.error(f"Error in log loop: {e}")
+            await asyncio.sleep(polling_interval)
 
-    def initialize_log_loop_thread(self):
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            asyncio.run_coroutine_threadsafe(self._log_loop(), loop)
-            loop.run_forever()
-        except Exception as e:
-            logger.error(f"Error in initialize_log_loop_thread: {e}")
+    async def _subscribe_logs(self, polling_interval=8):
+        """Handle Sync logs pushed by an `eth_subscribe` logs subscription as they arrive
+
+        Logs received while a report is being submitted are merged and
+        handled once the submission is done.
+        """
+        async with websockets.connect(self.ws_url) as ws:
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "eth_subscribe",
+                "params": ["logs", {
+                    "address": [lp_contract.address for lp_contract in self.lps_contracts],
+                    "topics": [self.SYNC_TOPIC],
+                }],
+            }))
+            response = json.loads(await ws.recv())
+            if "result" not in response:
+                raise Exception(f"eth_subscribe failed: {response.get('error')}")
+            logger.info(f"Subscribed to LP Sync logs on {self.ws_url} (subscription={response['result']})")
+
+            # catch up with logs emitted since the last poll
+            await self._poll_logs()
+
+            pending_logs = []
+            while True:
+                try:
+                    message = json.loads(await asyncio.wait_for(ws.recv(), timeout=polling_interval))
+                    log = message["params"]["result"]
+                    if not log.get("removed", False):
+                        # subscription logs have lowercase addresses
+                        pending_logs.append(dict(log, address=Web3.toChecksumAddress(log["address"])))
+                        self.from_block = max(self.from_block, int(log["blockNumber"], 16))
+                except asyncio.TimeoutError:
+                    pass
+
+                if pending_logs and not self.is_submitting_report.is_set():
+                    latest_reserves = self._decode_sync_events(pending_logs)
+                    pending_logs = []
+                    try:
+                        await self._handle_reserves(latest_reserves)
+                    except Exception as e:
+                        logger.error(f"Error handling Sync logs: {e}")
+
+    async def _subscription_loop(self, polling_interval=8):
+        """Watch Sync logs through the websocket subscription, polling while it is unavailable"""
+        while True:
+            if not self.is_initialized: await self.initialize_price()
+            try:
+                await self._subscribe_logs(polling_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"LP logs subscription unavailable ({e}), polling for {self.ws_retry_interval} seconds")
+            await self._log_loop(polling_interval, until=asyncio.get_running_loop().time() + self.ws_retry_interval)
+
+    async def _time_limit_loop(self, polling_interval=8):
+        while True:
+            if self.is_initialized and not self.is_submitting_report.is_set():
+                try:
+                    await self._check_time_limit()
+                except Exception as e:
+                    logger.error(f"Error in time limit loop: {e}")
+            await asyncio.sleep(polling_interval)
+
+    def listen_sync_events(self) -> list[asyncio.Task]:
+        """Start the Sync event and time limit watchers as tasks on the running event loop"""
+        watcher = self._subscription_loop() if self.ws_url else self._log_loop()
+        self.tasks = [
+            asyncio.create_task(watcher),
+            asyncio.create_task(self._time_limit_loop()),
+        ]
+        logger.info("Started listening to LP Sync contract events")
+        return self.tasks
 
-    def listen_sync_events(self):
-        th = threading.Thread(target=self.initialize_log_loop_thread, daemon=True)
-        th.start()
-        logger.info("Started listening to LP Sync contract events")
\ No newline at end of file
+    async def stop(self) -> None:
+        """Cancel the watcher tasks"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
@@ -63,6 +63,12 @@ class CustomXReporter(IntervalReporter):
         self.eth_usd_median_feed = eth_usd_median_feed
         self.custom_contract = custom_contract
         self.gas_info: dict[str, Union[float, int]] = {}
+        self.web3 = self.endpoint._web3
+        self.use_estimate_fee = False
+        self.use_gas_api = False
+        self.force_nonce: Optional[int] = None
+        self.tx_timeout = 120
+        self.setup_transactions()
 
     async def ensure_staked(self) -> Tuple[bool, ResponseStatus]:
         """Make sure the current user is staked
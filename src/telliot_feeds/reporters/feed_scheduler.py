@@ -0,0 +1,219 @@
+"""Many datafeeds reported by one reporter.
+
+`IntervalReporter.report` reports a single datafeed, so reporting several
+feeds used to take one process, with its own connections, per feed. The feed
+scheduler reports them all with one reporter instead. Each feed has its own
+schedule, report lock (a feed is never reported twice at once) and
+profitability threshold, through a copy of the reporter (see
+`IntervalReporter.for_feed`). All feeds share the account nonces, the web3
+connection with its contract read cache and receipt tracker, the fee oracle
+and the token price cache.
+
+The feeds due are prepared concurrently: staking and reporter lock checks,
+values, fees, gas and profitability. Their profitable reports are then sent
+one at a time, highest expected tip first, and confirmed concurrently. Each
+submission sets the account's reporter lock once mined: no report is sent while
+one is pending, all feeds read the lock again, and reports prepared before a
+submission read the staker info and lock again before being sent. Staking
+checks, which may deposit stake for the account, run for one feed at a time.
+
+Managed feeds, reported on liquidity pool triggers, are not scheduled.
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.feeds.managed_feeds.ManagedFeeds import managed_feeds
+from telliot_feeds.reporters.interval import IntervalReporter
+from telliot_feeds.reporters.interval import PreparedReport
+from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.read_cache import get_read_cache
+
+
+logger = get_logger(__name__)
+
+#: Seconds between checks for feeds due
+FEED_SCHEDULER_TICK = float(os.getenv("FEED_SCHEDULER_TICK", 1))
+
+
+@dataclass
+class ScheduledFeed:
+    """A datafeed and its reporting schedule"""
+
+    datafeed: DataFeed[Any]
+    #: seconds between reports
+    interval: float
+    #: profitability threshold, the reporter's if None
+    expected_profit: Optional[Union[str, float]] = None
+    #: monotonic time of the next report
+    next_report: float = 0.0
+    #: held while the feed is being reported
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    #: status of the last report
+    last_status: Optional[ResponseStatus] = None
+    #: copy of the scheduler's reporter for this feed
+    reporter: Optional[IntervalReporter] = None
+
+    @property
+    def due(self) -> bool:
+        return not self.lock.locked() and time.monotonic() >= self.next_report
+
+
+class FeedScheduler:
+    """Report many datafeeds on their own schedules with one reporter"""
+
+    def __init__(self, reporter: IntervalReporter, feeds: List[ScheduledFeed], tick: float = FEED_SCHEDULER_TICK):
+        self.reporter = reporter
+        self.tick = tick
+        self.feeds: List[ScheduledFeed] = []
+        for feed in feeds:
+            if getattr(feed.datafeed.query, "asset", "") in managed_feeds.assets:
+                logger.warning(f"Not scheduling managed feed {feed.datafeed.query.descriptor}")
+                continue
+            feed.reporter = reporter.for_feed(feed.datafeed, feed.expected_profit)
+            self.feeds.append(feed)
+        #: reports submitted so far
+        self.submissions = 0
+        #: reports submitted and not mined yet
+        self.in_flight = 0
+        # reports are sent one at a time, across rounds
+        self._submit_lock = asyncio.Lock()
+        self._rounds: "Set[asyncio.Task[Any]]" = set()
+
+    async def report_due(
+        self, feeds: Optional[List[ScheduledFeed]] = None
+    ) -> List[Tuple[ScheduledFeed, Optional[ResponseStatus]]]:
+        """Prepare the feeds due concurrently, then submit their profitable reports by expected tip
+
+        Returns:
+            feeds reported and the status of their report
+        """
+        due = [feed for feed in (self.feeds if feeds is None else feeds) if feed.due]
+        for feed in due:
+            await feed.lock.acquire()
+        try:
+            # reports sent since, or not mined yet, may put the account in reporter lock
+            submissions = self.submissions - self.in_flight
+            results = await asyncio.gather(*[self._prepare(feed) for feed in due])
+            ready: List[Tuple[ScheduledFeed, PreparedReport]] = []
+            for feed, (report, status) in zip(due, results):
+                feed.last_status = status
+                if report is not None:
+                    ready.append((feed, report))
+
+            ready.sort(key=lambda item: item[1].tip, reverse=True)
+            # the submit lock is queued for in order of tip, and held until each report is sent
+            statuses = await asyncio.gather(*[self._submit(feed, report, submissions) for feed, report in ready])
+            for (feed, _), status in zip(ready, statuses):
+                feed.last_status = status
+        finally:
+            for feed in due:
+                feed.next_report = time.monotonic() + feed.interval
+                feed.lock.release()
+        return [(feed, feed.last_status) for feed in due]
+
+    async def _prepare(self, feed: ScheduledFeed) -> Tuple[Optional[PreparedReport], ResponseStatus]:
+        try:
+            return await feed.reporter.prepare_report()  # type: ignore
+        except Exception as e:
+            msg = f"Unable to prepare report of {feed.datafeed.query.descriptor}"
+            return None, error_status(msg, e=e, log=logger.error)
+
+    async def _submit(self, feed: ScheduledFeed, report: PreparedReport, submissions: int) -> ResponseStatus:
+        """Send a report if the account can still report, then wait for it to be mined
+
+        Args:
+            submissions: count of mined submissions when the report was prepared
+        """
+        reporter: IntervalReporter = feed.reporter  # type: ignore
+        name = feed.datafeed.query.descriptor
+        async with self._submit_lock:
+            if self.in_flight:
+                # the reporter lock it sets can't be read until it's mined
+                return error_status(f"Not submitting {name}, a submission is pending", log=logger.info)
+            if self.submissions != submissions:
+                # submitted since the checks: the account may be in reporter lock
+                status = await self._recheck(reporter)
+                if not status.ok:
+                    return status
+
+            logger.info(f"Submitting {name} (tip: {report.tip / 1e18})")
+            try:
+                submission, status = await reporter.send_report(report)
+            except Exception as e:
+                return error_status(f"Unable to submit {name}", e=e, log=logger.error)
+            if submission is None:
+                return status
+            self.submissions += 1
+            self.in_flight += 1
+
+        try:
+            _, status = await reporter.confirm_report(report, submission)
+        except Exception as e:
+            status = error_status(f"Unable to confirm {name}", e=e, log=logger.error)
+        finally:
+            self.in_flight -= 1
+            # the account's reporter lock changed, feeds cache its last submission timestamp
+            for scheduled in self.feeds:
+                scheduled.reporter.last_submission_timestamp = 0  # type: ignore
+        return status
+
+    @staticmethod
+    async def _recheck(reporter: IntervalReporter) -> ResponseStatus:
+        """Read the staker info and reporter lock of the account again"""
+        get_read_cache(reporter.web3).refresh()
+        reporter.last_submission_timestamp = 0
+        status = await reporter.check_staked()
+        if not status.ok:
+            return status
+        return await reporter.check_reporter_lock()
+
+    def _start_round(self, due: List[ScheduledFeed]) -> None:
+        task = asyncio.create_task(self.report_due(due))
+        self._rounds.add(task)
+        task.add_done_callback(self._rounds.discard)
+
+    async def run(self) -> None:
+        """Report the feeds on their schedules, until cancelled
+
+        A round of reports starts as soon as a feed is due, while feeds of
+        earlier rounds may still be waiting for their transactions."""
+        reporter = self.reporter
+        logger.info(f"Reporting {len(self.feeds)} feeds: {', '.join(f.datafeed.query.descriptor for f in self.feeds)}")
+        if reporter.transaction_type == 2:
+            reporter.start_fee_oracle()
+        try:
+            while True:
+                due = [feed for feed in self.feeds if feed.due]
+                if due:
+                    reporter.handle_rpc_connection_failures()
+                    if not await reporter.is_online():
+                        logger.warning("Unable to connect to the internet!")
+                        self._postpone(due)
+                    elif not await asyncio.to_thread(reporter.has_native_token):
+                        self._postpone(due)
+                    else:
+                        self._start_round(due)
+                await asyncio.sleep(self.tick)
+        finally:
+            for task in self._rounds:
+                task.cancel()
+            await asyncio.gather(*self._rounds, return_exceptions=True)
+            await reporter.fee_oracle.stop()
+
+    @staticmethod
+    def _postpone(feeds: List[ScheduledFeed]) -> None:
+        for feed in feeds:
+            feed.next_report = time.monotonic() + feed.interval
@@ -1,3 +1,4 @@
+import asyncio
 import math
 import time
 from dataclasses import dataclass
@@ -14,9 +15,12 @@ from telliot_core.utils.response import ResponseStatus
 from telliot_feeds.feeds import DataFeed
 from telliot_feeds.reporters.rewards.time_based_rewards import get_time_based_rewards
 from telliot_feeds.reporters.fetch_flex import FetchFlexReporter
+from telliot_feeds.reporters.tips.listener.autopay_mirror import AutopayMirror
 from telliot_feeds.reporters.tips.suggest_datafeed import get_feed_and_tip
 from telliot_feeds.reporters.tips.tip_amount import fetch_feed_tip
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.read_cache import cached_read
+from telliot_feeds.utils.read_cache import get_read_cache
 from telliot_feeds.utils.reporter_utils import suggest_random_feed
 
 logger = get_logger(__name__)
@@ -55,6 +59,8 @@ class Fetch360Reporter(FetchFlexReporter):
         super().__init__(*args, **kwargs)
         self.stake: float = stake
         self.use_random_feeds: bool = use_random_feeds
+        # funded feeds and tips indexed from autopay and oracle logs, created on first use
+        self.autopay_mirror: Optional[AutopayMirror] = None
 
         assert self.acct_addr == to_checksum_address(self.account.address)
 
@@ -65,9 +71,12 @@ class Fetch360Reporter(FetchFlexReporter):
         Return:
         - (bool, ResponseStatus)
         """
-        # get oracle required stake amount
+        # get oracle required stake amount and accounts current stake total, in one multicall
         stake_amount: int
-        stake_amount, status = await self.oracle.read("getStakeAmount")
+        (stake_amount, status), (staker_info, staker_info_status) = await asyncio.gather(
+            cached_read(self.oracle, "getStakeAmount"),
+            cached_read(self.oracle, "getStakerInfo", _stakerAddress=self.acct_addr),
+        )
 
         if (not status.ok) or (stake_amount is None):
             msg = "Unable to read current stake amount"
@@ -75,12 +84,7 @@ class Fetch360Reporter(FetchFlexReporter):
 
         logger.info(f"Current Oracle stakeAmount: {stake_amount / 1e18!r}")
 
-        # get accounts current stake total
-        staker_info, status = await self.oracle.read(
-            "getStakerInfo",
-            _stakerAddress=self.acct_addr,
-        )
-        if (not status.ok) or (staker_info is None):
+        if (not staker_info_status.ok) or (staker_info is None):
             msg = "Unable to read reporters staker info"
             return False, error_status(msg, log=logger.info)
 
@@ -131,7 +135,7 @@ class Fetch360Reporter(FetchFlexReporter):
             stake_diff = max(int(self.stake_amount - account_staked_bal), int((self.stake * 1e18) - account_staked_bal))
 
             # check FETCH wallet balance!
-            wallet_balance, wallet_balance_status = await self.token.read("balanceOf", account=self.acct_addr)
+            wallet_balance, wallet_balance_status = await cached_read(self.token, "balanceOf", account=self.acct_addr)
 
             if not wallet_balance_status.ok:
                 msg = "unable to read account FETCH balance"
@@ -148,7 +152,8 @@ class Fetch360Reporter(FetchFlexReporter):
                 if priority_fee is None or max_fee is None:
                     return False, error_status("Unable to suggest type 2 txn fees", log=logger.error)
                 # Approve token spending for a transaction type 2
-                receipt, approve_status = await self.token.write(
+                receipt, approve_status = await self.write_tx(
+                    self.token,
                     func_name="approve",
                     gas_limit=self.gas_limit,
                     max_priority_fee_per_gas=priority_fee,
@@ -161,7 +166,8 @@ class Fetch360Reporter(FetchFlexReporter):
                     return False, error_status(msg, log=logger.error)
                 logger.debug(f"Approve transaction status: {receipt.status}, block: {receipt.blockNumber}")
                 # deposit stake for a transaction type 2
-                _, deposit_status = await self.oracle.write(
+                _, deposit_status = await self.write_tx(
+                    self.oracle,
                     func_name="depositStake",
                     gas_limit=self.gas_limit,
                     max_priority_fee_per_gas=priority_fee,
@@ -182,7 +188,8 @@ class Fetch360Reporter(FetchFlexReporter):
                 else:
                     gas_price_in_gwei = self.legacy_gas_price
                 # Approve token spending for a transaction type 0 and deposit stake
-                receipt, approve_status = await self.token.write(
+                receipt, approve_status = await self.write_tx(
+                    self.token,
                     func_name="approve",
                     gas_limit=self.gas_limit,
                     legacy_gas_price=gas_price_in_gwei,
@@ -192,11 +199,10 @@ class Fetch360Reporter(FetchFlexReporter):
                 if not approve_status.ok:
                     msg = "Unable to approve staking"
                     return False, error_status(msg, log=logger.error)
-                # Add this to avoid nonce error from txn happening too fast
-                time.sleep(1)
                 logger.debug(f"Approve transaction status: {receipt.status}, block: {receipt.blockNumber}")
                 # Deposit stake to oracle contract
-                _, deposit_status = await self.oracle.write(
+                _, deposit_status = await self.write_tx(
+                    self.oracle,
                     func_name="depositStake",
                     gas_limit=self.gas_limit,
                     legacy_gas_price=gas_price_in_gwei,
@@ -210,6 +216,7 @@ class Fetch360Reporter(FetchFlexReporter):
                         + "currency and the oracle's currency (FETCH)"
                     )
                     return False, error_status(msg, log=logger.error)
+            get_read_cache(self.web3).invalidate()
             # add staked balance after successful stake deposit
             self.staker_info.stake_balance += stake_diff
 
@@ -279,7 +286,9 @@ class Fetch360Reporter(FetchFlexReporter):
 
         # Fetch datafeed based on whichever is most funded in the AutoPay contract
         if self.datafeed is None:
-            suggested_feed, tip_amount = await get_feed_and_tip(self.autopay)
+            if self.autopay_mirror is None:
+                self.autopay_mirror = AutopayMirror(self.autopay, self.oracle)
+            suggested_feed, tip_amount = await get_feed_and_tip(self.autopay, mirror=self.autopay_mirror)
 
             if suggested_feed is not None:
                 self.autopaytip = tip_amount  # type: ignore
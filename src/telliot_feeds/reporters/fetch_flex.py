@@ -24,6 +24,8 @@ from telliot_feeds.reporters.reporter_autopay_utils import autopay_suggested_rep
 from telliot_feeds.reporters.reporter_autopay_utils import CATALOG_QUERY_IDS
 from telliot_feeds.reporters.reporter_autopay_utils import get_feed_tip
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.read_cache import cached_read
+from telliot_feeds.utils.read_cache import get_read_cache
 from telliot_feeds.utils.reporter_utils import get_native_token_feed
 from telliot_feeds.utils.reporter_utils import fetch_suggested_report
 from telliot_feeds.utils.reporter_utils import tkn_symbol
@@ -105,6 +107,7 @@ class FetchFlexReporter(IntervalReporter):
 
         self.account: ChainedAccount = account
         assert self.acct_addr == to_checksum_address(self.account.address)
+        self.setup_transactions()
 
     async def in_dispute(self, new_stake_amount: Any) -> bool:
         """Check if staker balance decreased"""
@@ -118,7 +121,11 @@ class FetchFlexReporter(IntervalReporter):
         Returns a bool signifying whether the current address is
         staked. If the address is not initially, it attempts to deposit
         the given stake amount."""
-        staker_info, read_status = await self.oracle.read(func_name="getStakerInfo", _staker=self.acct_addr)
+        # read together, in one multicall
+        (staker_info, read_status), (minimum_stake_amount, m_stake_amount_status) = await asyncio.gather(
+            cached_read(self.oracle, "getStakerInfo", _staker=self.acct_addr),
+            cached_read(self.oracle, "minimumStakeAmount"),
+        )
 
         if (not read_status.ok) or (staker_info is None):
             msg = "Unable to read reporters staker info"
@@ -136,7 +143,6 @@ class FetchFlexReporter(IntervalReporter):
             staked
         ) = staker_info
 
-        minimum_stake_amount, m_stake_amount_status = await self.oracle.read(func_name='minimumStakeAmount')
         if minimum_stake_amount is None or not m_stake_amount_status.ok:
             logger.error(f"Unable to read minimum stake amount: {m_stake_amount_status.error}")
 
@@ -173,7 +179,8 @@ class FetchFlexReporter(IntervalReporter):
                 return False, error_status("Unable to fetch gas price for staking", log=logger.info)
             amount = int(Decimal(self.stake) * Decimal(1e18) - Decimal(staker_balance))
 
-            _, write_status = await self.token.write(
+            _, write_status = await self.write_tx(
+                self.token,
                 func_name="approve",
                 gas_limit=100000,
                 legacy_gas_price=gas_price_gwei,
@@ -184,12 +191,14 @@ class FetchFlexReporter(IntervalReporter):
                 msg = "Unable to approve staking"
                 return False, error_status(msg, log=logger.error)
 
-            _, write_status = await self.oracle.write(
+            _, write_status = await self.write_tx(
+                self.oracle,
                 func_name="depositStake",
                 gas_limit=300000,
                 legacy_gas_price=gas_price_gwei,
                 _amount=amount,
             )
+            get_read_cache(self.web3).invalidate()
             if not write_status.ok:
                 msg = (
                     "Unable to stake deposit: "
@@ -216,7 +225,8 @@ class FetchFlexReporter(IntervalReporter):
 
         Returns bool signifying whether a given address is in a
         reporter lock or not."""
-        staker_info, read_status = await self.oracle.read(func_name="getStakerInfo", _staker=self.acct_addr)
+        # already read by ensure_staked in the same block
+        staker_info, read_status = await cached_read(self.oracle, "getStakerInfo", _staker=self.acct_addr)
 
         if (not read_status.ok) or (staker_info is None):
             msg = "Unable to read reporters staker info"
@@ -252,6 +262,17 @@ class FetchFlexReporter(IntervalReporter):
 
         return ResponseStatus()
 
+    def for_feed(
+        self, datafeed: DataFeed[Any], expected_profit: Optional[Union[str, float]] = None
+    ) -> "FetchFlexReporter":
+        """Copy of the reporter for one datafeed, see `IntervalReporter.for_feed`"""
+        reporter: FetchFlexReporter = super().for_feed(datafeed, expected_profit)  # type: ignore
+        # keep the datafeed instead of asking for suggestions
+        reporter.qtag_selected = True
+        reporter.use_random_feeds = False
+        reporter.autopaytip = 0
+        return reporter
+
     async def rewards(self) -> int:
         tip = 0
         datafeed: DataFeed[Any] = self.datafeed  # type: ignore
@@ -316,16 +337,15 @@ class FetchFlexReporter(IntervalReporter):
     async def ensure_profitable(self, datafeed: DataFeed[Any]) -> ResponseStatus:
 
         status = ResponseStatus()
+        self.expected_tip = self.autopaytip
         if not self.check_rewards:
             return status
 
         tip = self.autopaytip
-        # Fetch token prices in USD
+        # Fetch token prices in USD, shared with the other feeds of the reporter
         native_token_feed = get_native_token_feed(self.chain_id)
         price_feeds = [native_token_feed, fetch_usd_median_feed]
-        _ = await asyncio.gather(*[feed.source.fetch_new_datapoint() for feed in price_feeds])
-        price_native_token = native_token_feed.source.latest[0]
-        price_fetch_usd = fetch_usd_median_feed.source.latest[0]
+        price_native_token, price_fetch_usd = await self.price_cache.fetch_all(price_feeds)
 
         if price_native_token is None or price_fetch_usd is None:
             return error_status("Unable to fetch token price", log=logger.warning)
@@ -360,6 +380,7 @@ class FetchFlexReporter(IntervalReporter):
                 Txn type: 2 (EIP-1559)
                 """
             )
+            self.log_expected_fee()
 
         # Calculate profit
         rev_usd = tip / 1e18 * price_fetch_usd
@@ -2,15 +2,15 @@
 Example of a subclassed Reporter.
 """
 import asyncio
+import copy
 import time
-import threading
+from dataclasses import dataclass
 from typing import Any
+from typing import List
 from typing import Optional
 from typing import Tuple
 from typing import Union
 
-import requests
-
 from chained_accounts import ChainedAccount
 from eth_utils import to_checksum_address
 from telliot_core.contract.contract import Contract
@@ -27,17 +27,46 @@ from telliot_feeds.feeds import CATALOG_FEEDS
 from telliot_feeds.feeds.eth_usd_feed import eth_usd_median_feed
 from telliot_feeds.feeds.fetch_usd_feed import fetch_usd_median_feed
 from telliot_feeds.feeds.managed_feeds.ManagedFeeds import managed_feeds
+from telliot_feeds.utils.fee_oracle import FeeOracle
+from telliot_feeds.utils.fee_sources import EstimatorFeeSource
+from telliot_feeds.utils.fee_sources import FeeSource
+from telliot_feeds.utils.fee_sources import FeeSourceChain
+from telliot_feeds.utils.fee_sources import GasNowFeeSource
+from telliot_feeds.utils.fee_sources import NodeGasPriceFeeSource
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.nonce_manager import NonceManager
+from telliot_feeds.utils.price_cache import PriceCache
+from telliot_feeds.utils.read_cache import cached_read
+from telliot_feeds.utils.read_cache import get_read_cache
 from telliot_feeds.utils.reporter_utils import has_native_token_funds
 from telliot_feeds.utils.reporter_utils import is_online
 from telliot_feeds.utils.reporter_utils import fetch_suggested_report
+from telliot_feeds.utils.reporter_utils import gather_until_failure
 from telliot_feeds.utils.reporter_utils import tkn_symbol
+from telliot_feeds.utils.tx_manager import Submission
+from telliot_feeds.utils.tx_manager import TransactionManager
 from telliot_feeds.reporters.ListenLPContract import ListenLPContract
 from telliot_feeds.reporters.FlexV3 import FlexV3
+from telliot_feeds.reporters.submit_template import get_submit_template
+from telliot_feeds.reporters.submit_template import SubmitValueTemplate
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class PreparedReport:
+    """A profitable submitValue transaction, ready to be signed"""
+
+    datafeed: DataFeed[Any]
+    template: SubmitValueTemplate
+    value: bytes
+    report_count: int
+    gas_limit: int
+    fee_params: dict[str, Any]
+    #: reward expected for the report, in wei
+    tip: int = 0
+
+
 class IntervalReporter:
     """Reports values from given datafeeds to a FetchX Oracle
     every 7 seconds."""
@@ -91,9 +120,25 @@ class IntervalReporter:
         self.tx_timeout = tx_timeout
 
         self.gas_info: dict[str, Union[float, int]] = {}
+        self.setup_transactions()
 
         logger.info(f"Reporting with account: {self.acct_addr}")
 
+    def setup_transactions(self) -> None:
+        """Set up the nonce and transaction managers, fees, submitValue templates,
+        price cache and stake lock of the account, shared by `for_feed` copies"""
+        # submitValue calldata and gas estimates by query id
+        self.submit_templates: dict[bytes, SubmitValueTemplate] = {}
+        self.nonce_manager = NonceManager(self.web3, to_checksum_address(self.account.address))
+        self.fee_oracle = FeeOracle(self.web3)
+        self.fee_sources = self.build_fee_sources()
+        self.tx_manager = TransactionManager(self.web3, self.account, self.nonce_manager)
+        self.price_cache = PriceCache()
+        # reward of the report last checked for profitability, in wei
+        self.expected_tip = 0
+        # staking sends transactions, held by one copy of the reporter at a time
+        self.stake_lock = asyncio.Lock()
+
     async def check_reporter_lock(self) -> ResponseStatus:
         """Ensure enough time has passed since last report
         Returns a bool signifying whether a given address is in a
@@ -103,7 +148,7 @@ class IntervalReporter:
 
         # Save last submission timestamp to reduce web3 calls
         if self.last_submission_timestamp == 0:
-            last_timestamp, read_status = await self.oracle.read("getReporterLastTimestamp", _reporter=self.acct_addr)
+            last_timestamp, read_status = await cached_read(self.oracle, "getReporterLastTimestamp", _reporter=self.acct_addr)
 
             # Log web3 errors
             if (not read_status.ok) or (last_timestamp is None):
@@ -133,7 +178,7 @@ class IntervalReporter:
             None if the gas price could not be retrieved.
         """
         try:
-            price = self.web3.eth.gas_price
+            price = await asyncio.to_thread(lambda: self.web3.eth.gas_price)
             priceGwei = self.web3.fromWei(price, "gwei")
         except Exception as e:
             logger.error(f"Error fetching gas price: {e}")
@@ -155,7 +200,7 @@ class IntervalReporter:
             note = "Unable to fetch gas price during during ensure_staked()"
             return False, error_status(note=note, log=logger.warning)
 
-        staker_info, read_status = await self.master.read(func_name="getStakerInfo", _staker=self.acct_addr)
+        staker_info, read_status = await cached_read(self.master, "getStakerInfo", _staker=self.acct_addr)
 
         if (not read_status.ok) or (staker_info is None):
             msg = "Unable to read reporters staker status: " + read_status.error  # error won't be none # noqa: E501
@@ -173,11 +218,13 @@ class IntervalReporter:
         elif staker_info[0] == 0:
             logger.info("Address not yet staked. Depositing stake.")
 
-            _, write_status = await self.master.write(
+            _, write_status = await self.write_tx(
+                self.master,
                 func_name="depositStake",
                 gas_limit=350000,
                 legacy_gas_price=gas_price_gwei,
             )
+            get_read_cache(self.web3).invalidate()
 
             if write_status.ok:
                 return True, status
@@ -207,7 +254,7 @@ class IntervalReporter:
         status = ResponseStatus()
 
         # Get current tips and time-based reward for given queryID
-        rewards, read_status = await self.oracle.read("getCurrentReward", _queryId=datafeed.query.query_id)
+        rewards, read_status = await cached_read(self.oracle, "getCurrentReward", _queryId=datafeed.query.query_id)
 
         # Log web3 errors
         if (not read_status.ok) or (rewards is None):
@@ -217,12 +264,9 @@ class IntervalReporter:
             status.e = read_status.e
             return status
 
-        # Fetch token prices
+        # Fetch token prices, shared with the other feeds of the reporter
         price_feeds = [self.eth_usd_median_feed, self.fetch_usd_median_feed]
-        _ = await asyncio.gather(*[feed.source.fetch_new_datapoint() for feed in price_feeds])
-
-        price_eth_usd = self.eth_usd_median_feed.source.latest[0]
-        price_fetch_usd = self.fetch_usd_median_feed.source.latest[0]
+        price_eth_usd, price_fetch_usd = await self.price_cache.fetch_all(price_feeds)
 
         if price_eth_usd is None:
             note = "Unable to fetch ETH/USD price for profit calculation"
@@ -232,6 +276,7 @@ class IntervalReporter:
             return error_status(note=note, log=logger.warning)
 
         tips, tb_reward = rewards
+        self.expected_tip = tips + tb_reward
 
         if not self.gas_info:
             return error_status("Gas info not set", log=logger.warning)
@@ -266,6 +311,7 @@ class IntervalReporter:
                 Txn type: 2 (EIP-1559)
                 """
             )
+            self.log_expected_fee()
 
         # Calculate profit
         revenue = tb_reward + tips
@@ -291,6 +337,10 @@ class IntervalReporter:
             https://web3py.readthedocs.io/en/v5/web3.eth.html?highlight=fee%20history#web3.eth.Eth.fee_history
         """
         if self.max_fee is None:
+            if self.fee_oracle.fresh:
+                base_fee = self.fee_oracle.next_base_fee / 1e9  # type: ignore
+                priority_fee = self.fee_oracle.priority_fee_estimate(blocks=5, percentile=25) / 1e9
+                return priority_fee, base_fee + priority_fee
             try:
                 fee_history = self.web3.eth.fee_history(
                     block_count=5, newest_block="latest", reward_percentiles=[25, 50, 75]
@@ -306,6 +356,37 @@ class IntervalReporter:
                 return None, None
         return self.priority_fee, self.max_fee
 
+    def expected_fee_per_gas(self) -> Optional[float]:
+        """Fee per gas likely paid by a type 2 transaction, in gwei
+
+        Next base fee plus the median priority fee of recent blocks, capped
+        at the max fee. None if the fee oracle isn't fresh."""
+        median_priority_fee = self.fee_oracle.percentile(50)
+        if not self.fee_oracle.fresh or median_priority_fee is None or "max_fee" not in self.gas_info:
+            return None
+        expected_fee = (self.fee_oracle.next_base_fee + median_priority_fee) / 1e9  # type: ignore
+        return min(expected_fee, float(self.gas_info["max_fee"]))
+
+    def log_expected_fee(self) -> None:
+        """Log the transaction fee likely paid, from the fee oracle's priority fee percentiles"""
+        expected_fee = self.expected_fee_per_gas()
+        if expected_fee is None:
+            return
+        percentiles = {p: fee / 1e9 for p, fee in self.fee_oracle.percentiles().items() if fee is not None}
+        logger.info(
+            f"""
+            Expected fee per gas: {expected_fee:.9f} gwei (next base fee + median priority fee)
+            Expected transaction fee: {expected_fee * self.gas_info["gas_limit"] / 1e9:.18f} {tkn_symbol(self.chain_id)}
+            Priority fee percentiles (gwei): {percentiles}
+            """
+        )
+
+    def start_fee_oracle(self) -> None:
+        """Keep fee history up to date in the background if fees are estimated"""
+        is_fees_set = self.max_fee is not None and self.priority_fee is not None
+        if not is_fees_set and not self.use_gas_api:
+            self.fee_oracle.start()
+
     def round_to_whole_gwei(self, wei: int) -> int:
             GWEI = 1e9
             return (wei // GWEI + int(wei % GWEI > GWEI // 2)) * GWEI
@@ -321,12 +402,9 @@ class IntervalReporter:
         else:
             return 120
     
-    def calculate_priority_fee_estimate(self, fee_history) -> Optional[int]:
+    def calculate_priority_fee_estimate(self, rewards: Optional[List[int]]) -> Optional[int]:
+        """Estimate the priority fee from sorted non-zero rewards"""
         PRIORITY_FEE_INCREASE_BOUNDARY = 200
-        if not fee_history: return None
-
-        rewards = sorted([int(r[0]) for r in fee_history.get("reward", []) if int(r[0]) > 0])
-
         if not rewards: return None
 
         percentage_increases = [
@@ -343,7 +421,7 @@ class IntervalReporter:
 
         return values[len(values) // 2]
 
-    def calculate_fees(self, base_fee, fee_history) -> dict[str, Union[float, int]]:
+    def calculate_fees(self, base_fee, rewards: Optional[List[int]]) -> dict[str, Union[float, int]]:
         MAX_GAS_FAST = self.web3.toWei(50000000, "gwei")
         DEFAULT_PRIORITY_FEE = self.web3.toWei(3, "gwei")
         FALLBACK_ESTIMATE = {
@@ -353,7 +431,7 @@ class IntervalReporter:
         }
 
         try:
-            estimated_priority_fee = self.calculate_priority_fee_estimate(fee_history)
+            estimated_priority_fee = self.calculate_priority_fee_estimate(rewards)
 
             max_priority_fee_per_gas = max([estimated_priority_fee or 0, DEFAULT_PRIORITY_FEE])
 
@@ -383,51 +461,61 @@ class IntervalReporter:
         FEE_HISTORY_PERCENTILE = 5
         PRIORITY_FEE_ESTIMATION_TRIGGER = self.web3.toWei(100, "gwei")
 
+        if self.fee_oracle.fresh and self.fee_oracle.base_fee is not None:
+            # window of FEE_ORACLE_WINDOW blocks kept up to date in the background
+            base_fee = self.fee_oracle.base_fee
+            if base_fee < PRIORITY_FEE_ESTIMATION_TRIGGER:
+                return self.calculate_fees(base_fee, None)
+            return self.calculate_fees(base_fee, self.fee_oracle.sorted_rewards(FEE_HISTORY_PERCENTILE))
+
         latest_block = self.web3.eth.get_block('latest')
 
         base_fee = latest_block["baseFeePerGas"]
 
-        fee_history_data = self.web3.eth.fee_history(
+        if base_fee < PRIORITY_FEE_ESTIMATION_TRIGGER:
+            return self.calculate_fees(base_fee, None)
+
+        fee_history = self.web3.eth.fee_history(
             block_count=FEE_HISTORY_BLOCKS, newest_block='latest', reward_percentiles=[FEE_HISTORY_PERCENTILE]
         )
+        rewards = sorted([int(r[0]) for r in fee_history.get("reward", []) if int(r[0]) > 0])
 
-        fee_history = (
-            fee_history_data
-            if base_fee >= PRIORITY_FEE_ESTIMATION_TRIGGER
-            else None
-        )
-        
-        return self.calculate_fees(base_fee, fee_history)
+        return self.calculate_fees(base_fee, rewards)
 
-    def get_fees(self) -> Tuple[Optional[float], Optional[float]]:
-        is_fees_set = self.max_fee is not None and self.priority_fee is not None
+    def estimate_fee_info(self) -> Tuple[Optional[float], Optional[float]]:
+        """Priority fee and max fee of `estimate_fees`, in gwei"""
+        fees = self.estimate_fees()
+        priority_fee = float(self.web3.fromWei(fees["maxPriorityFeePerGas"], "gwei"))
+        max_fee = float(self.web3.fromWei(fees["maxFeePerGas"], "gwei"))
+        return priority_fee, max_fee
 
-        option = None
+    def build_fee_sources(self) -> FeeSourceChain:
+        """Fee sources for the fee options, in order of preference"""
+        sources: List[FeeSource] = []
+        if self.use_estimate_fee and not self.use_gas_api:
+            sources.append(EstimatorFeeSource("estimate_fees", self.estimate_fee_info))
+        elif self.use_gas_api and not self.use_estimate_fee:
+            sources.append(GasNowFeeSource(self.chain_id))
+            sources.append(EstimatorFeeSource("estimate_fees", self.estimate_fee_info))
+        sources.append(EstimatorFeeSource("get_fee_info", self.get_fee_info))
+        sources.append(NodeGasPriceFeeSource(self.web3))
+        return FeeSourceChain(sources)
+
+    async def get_fees(self) -> Tuple[Optional[float], Optional[float]]:
+        """Priority fee and max fee in gwei, with the gas multiplier applied
+
+        Uses --max-fee and --priority-fee if set, otherwise the first fee
+        source answering."""
+        is_fees_set = self.max_fee is not None and self.priority_fee is not None
 
         if is_fees_set:
             priority_fee = self.priority_fee
             max_fee = self.max_fee
             option = "--max-fee and --priority-fee"
-
-        if not is_fees_set and self.use_estimate_fee and not self.use_gas_api:
-            fees = self.estimate_fees()
-            priority_fee = float(self.web3.fromWei(fees["maxPriorityFeePerGas"], "gwei"))
-            max_fee = float(self.web3.fromWei(fees["maxFeePerGas"], "gwei"))
-            option = "estimate_fees"
-        elif not is_fees_set and self.use_gas_api and not self.use_estimate_fee:
-            api_url = 'https://beacon.pulsechain.com/api/v1/execution/gasnow'
-            if self.chain_id == 943:
-                api_url = 'https://beacon.v4.testnet.pulsechain.com/api/v1/execution/gasnow'
-
-            request = requests.get(url=api_url, headers={'Accept': 'application/json'})
-            gas_price_gwei = self.web3.fromWei(request.json()['data']['rapid'], "gwei") 
-            
-            priority_fee = float(gas_price_gwei)
-            max_fee = float(gas_price_gwei)
-            option = "gas_api"
-        elif not is_fees_set:
-            priority_fee, max_fee = self.get_fee_info()
-            option = "get_fee_info"
+        else:
+            priority_fee, max_fee, option = await self.fee_sources.get_fees()
+            if priority_fee is None or max_fee is None:
+                return None, None
 
         multiplier = 1.0 + (self.gas_multiplier / 100.0)
         max_fee = max_fee * multiplier
@@ -456,7 +544,7 @@ class IntervalReporter:
         return self.datafeed
 
     async def get_num_reports_by_id(self, query_id: bytes) -> Tuple[int, ResponseStatus]:
-        count, read_status = await self.oracle.read(func_name="getNewValueCountbyQueryId", _queryId=query_id)
+        count, read_status = await cached_read(self.oracle, "getNewValueCountbyQueryId", _queryId=query_id)
         return count, read_status
 
     async def is_online(self) -> bool:
@@ -468,7 +556,10 @@ class IntervalReporter:
         return has_native_token_funds(self.acct_addr, self.web3, min_balance=self.min_native_token_balance)
 
     def get_acct_nonce(self) -> tuple[Optional[int], ResponseStatus]:
-        """Get transaction count for an address"""
+        """Get transaction count for an address
+
+        For reporters sending their transactions themselves, the nonce isn't
+        taken from the nonce manager, see `reserve_nonce`"""
         try:
             return self.web3.eth.get_transaction_count(self.acct_addr), ResponseStatus()
         except ValueError as e:
@@ -476,6 +567,47 @@ class IntervalReporter:
         except Exception as e:
             return None, error_status("Unable to retrieve account nonce", e=e, log=logger.error)
 
+    def sync_nonce(self) -> tuple[Optional[int], ResponseStatus]:
+        """Get the next nonce of the account, asking the node only if not known yet"""
+        try:
+            return self.nonce_manager.sync(), ResponseStatus()
+        except ValueError as e:
+            return None, error_status("Account nonce request timed out", e=e, log=logger.warning)
+        except Exception as e:
+            return None, error_status("Unable to retrieve account nonce", e=e, log=logger.error)
+
+    def reserve_nonce(self) -> tuple[Optional[int], ResponseStatus]:
+        """Take the next account nonce for a transaction"""
+        if self.force_nonce is not None:
+            return self.force_nonce, ResponseStatus()
+        try:
+            return self.nonce_manager.reserve(), ResponseStatus()
+        except ValueError as e:
+            return None, error_status("Account nonce request timed out", e=e, log=logger.warning)
+        except Exception as e:
+            return None, error_status("Unable to retrieve account nonce", e=e, log=logger.error)
+
+    def release_nonce(self, nonce: int, e: Exception) -> None:
+        """Give back the nonce of a transaction that failed to send"""
+        if self.force_nonce is not None:
+            return
+        if "nonce" in str(e).lower():
+            # nonce too low or already used: the local count is off
+            self.nonce_manager.reset()
+        else:
+            self.nonce_manager.release(nonce)
+
+    async def write_tx(self, contract: Contract, func_name: str, **kwargs: Any) -> Tuple[Any, ResponseStatus]:
+        """Send a contract transaction like `Contract.write`, with a nonce from the nonce manager"""
+        nonce, status = await asyncio.to_thread(self.reserve_nonce)
+        if not status.ok or nonce is None:
+            return None, status
+        receipt, status = await contract.write(func_name, acc_nonce=nonce, **kwargs)
+        if receipt is None:
+            # not sent, or not mined in time: ask the node for the nonce again
+            self.nonce_manager.reset()
+        return receipt, status
+
     # Estimate gas usage and set the gas limit if not provided
     def submit_val_tx_gas_limit(self, submit_val_tx: ContractFunction) -> tuple[Optional[int], ResponseStatus]:
         """Estimate gas usage for submitValue transaction
@@ -493,24 +625,44 @@ class IntervalReporter:
                 return None, error_status(msg, e=e, log=logger.error)
         return self.gas_limit, ResponseStatus()
 
-    async def report_once(
-        self,
-    ) -> Tuple[Optional[AttributeDict[Any, Any]], ResponseStatus]:
-        """Report query value once
-        This method checks to see if a user is able to submit
-        values to the FetchX oracle, given their staker status
-        and last submission time. Also, this method does not
-        submit values if doing so won't make a profit."""
-        # Check staker status
-        staked, status = await self.ensure_staked()
+    def submit_template_gas_limit(
+        self, template: SubmitValueTemplate, value: bytes, report_count: int
+    ) -> tuple[Optional[int], ResponseStatus]:
+        """Gas limit for a submitValue transaction from its template, estimated once per value size
+        Args:
+            template: The submitValue transaction template of the query
+            value: The encoded value to submit
+            report_count: The submitValue nonce
+        Returns a tuple of the gas limit and a ResponseStatus object"""
+        if self.gas_limit is None:
+            try:
+                gas_limit: int = template.estimate_gas(self.web3, self.acct_addr, value, report_count)
+                if not gas_limit:
+                    return None, error_status("Unable to estimate gas for submitValue transaction")
+                return gas_limit, ResponseStatus()
+            except Exception as e:
+                msg = "Unable to estimate gas for submitValue transaction"
+                return None, error_status(msg, e=e, log=logger.error)
+        return self.gas_limit, ResponseStatus()
+
+    async def check_staked(self) -> ResponseStatus:
+        """Check staker status, staking if needed"""
+        async with self.stake_lock:
+            staked, status = await self.ensure_staked()
         if not staked or not status.ok:
             logger.warning(status.error)
-            return None, status
+            if status.ok:
+                status = error_status("Reporter is not staked")
+        return status
 
-        status = await self.check_reporter_lock()
-        if not status.ok:
-            return None, status
+    async def check_can_report(self) -> Tuple[None, ResponseStatus]:
+        """Check the reporter lock"""
+        return None, await self.check_reporter_lock()
+
+    async def fetch_report_value(self) -> Tuple[Optional[Tuple[DataFeed[Any], bytes, int]], ResponseStatus]:
+        """Get the datafeed, then its updated value and report count
 
+        Returns the datafeed, its encoded value and the oracle's report count for its query id"""
         # Get suggested datafeed if none provided
         datafeed = await self.fetch_datafeed()
         if not datafeed:
@@ -519,17 +671,17 @@ class IntervalReporter:
 
         logger.info(f"Current query: {datafeed.query.descriptor}")
 
-        # Update datafeed value
-        await datafeed.source.fetch_new_datapoint()
+        # Update datafeed value and get report count, they're independent
+        query = datafeed.query
+        _, (report_count, read_status) = await asyncio.gather(
+            datafeed.source.fetch_new_datapoint(), self.get_num_reports_by_id(query.query_id)
+        )
         latest_data = datafeed.source.latest
         if latest_data[0] is None:
             msg = "Unable to retrieve updated datafeed value."
             return None, error_status(msg, log=logger.info)
 
-        # Get query info & encode value to bytes
-        query = datafeed.query
-        query_id = query.query_id
-        query_data = query.query_data
+        # Encode value to bytes
         try:
             value = query.value_type.encode(latest_data[0])
             logger.debug(f"IntervalReporter Encoded value: {value.hex()}")
@@ -537,39 +689,23 @@ class IntervalReporter:
             msg = f"Error encoding response value {latest_data[0]}"
             return None, error_status(msg, e=e, log=logger.error)
 
-        # Get nonce
-        report_count, read_status = await self.get_num_reports_by_id(query_id)
-
         if not read_status.ok:
-            status.error = "Unable to retrieve report count: " + read_status.error  # error won't be none # noqa: E501
-            logger.error(status.error)
-            status.e = read_status.e
-            return None, status
+            msg = "Unable to retrieve report count: " + read_status.error  # error won't be none # noqa: E501
+            return None, error_status(msg, e=read_status.e, log=logger.error)
 
-        # Start transaction build
-        submit_val_func = self.oracle.contract.get_function_by_name("submitValue")
-        submit_val_tx = submit_val_func(
-            _queryId=query_id,
-            _value=value,
-            _nonce=report_count,
-            _queryData=query_data,
-        )
-        # Estimate gas usage amount
-        gas_limit, status = self.submit_val_tx_gas_limit(submit_val_tx=submit_val_tx)
-        if not status.ok or gas_limit is None:
-            return None, status
+        return (datafeed, value, report_count), ResponseStatus()
 
-        self.gas_info["gas_limit"] = gas_limit
-        # Get account nonce
-        acc_nonce, nonce_status = self.get_acct_nonce()
-        if not nonce_status.ok:
-            return None, nonce_status
-        
-        nonce = self.force_nonce if self.force_nonce is not None else acc_nonce
+    async def fetch_nonce(self) -> Tuple[Optional[int], ResponseStatus]:
+        """Make sure the account nonce is known before sending the transaction"""
+        if self.force_nonce is not None:
+            return self.force_nonce, ResponseStatus()
+        return await asyncio.to_thread(self.sync_nonce)
 
+    async def fetch_fee_params(self) -> Tuple[Optional[dict[str, Any]], ResponseStatus]:
+        """Get transaction fee parameters, also stored in gas_info for the profitability check"""
         # Add transaction type 2 (EIP-1559) data
         if self.transaction_type == 2:
-            priority_fee, max_fee = self.get_fees()
+            priority_fee, max_fee = await self.get_fees()
             if priority_fee is None or max_fee is None:
                 return None, error_status("Unable to suggest type 2 txn fees", log=logger.error)
             # Set gas price to max fee used for profitability check
@@ -578,73 +714,151 @@ class IntervalReporter:
             self.gas_info["priority_fee"] = priority_fee
             self.gas_info["base_fee"] = max_fee - priority_fee
 
-            built_submit_val_tx = submit_val_tx.buildTransaction(
-                {
-                    "nonce": nonce,
-                    "gas": gas_limit,
-                    "maxFeePerGas": self.web3.toWei(max_fee, "gwei"),
-                    # TODO: Investigate more why etherscan txs using Flashbots have
-                    # the same maxFeePerGas and maxPriorityFeePerGas. Example:
-                    # https://etherscan.io/tx/0x0bd2c8b986be4f183c0a2667ef48ab1d8863c59510f3226ef056e46658541288 # noqa: E501
-                    "maxPriorityFeePerGas": self.web3.toWei(priority_fee, "gwei"),  # noqa: E501
-                    "chainId": self.chain_id,
-                }
-            )
+            return {
+                "maxFeePerGas": self.web3.toWei(max_fee, "gwei"),
+                # TODO: Investigate more why etherscan txs using Flashbots have
+                # the same maxFeePerGas and maxPriorityFeePerGas. Example:
+                # https://etherscan.io/tx/0x0bd2c8b986be4f183c0a2667ef48ab1d8863c59510f3226ef056e46658541288 # noqa: E501
+                "maxPriorityFeePerGas": self.web3.toWei(priority_fee, "gwei"),  # noqa: E501
+            }, ResponseStatus()
+
         # Add transaction type 0 (legacy) data
+        # Fetch legacy gas price if not provided by user
+        if not self.legacy_gas_price:
+            gas_price = await self.fetch_gas_price()
+            if not gas_price:
+                note = "Unable to fetch gas price for tx type 0"
+                return None, error_status(note, log=logger.warning)
         else:
-            # Fetch legacy gas price if not provided by user
-            if not self.legacy_gas_price:
-                gas_price = await self.fetch_gas_price()
-                if not gas_price:
-                    note = "Unable to fetch gas price for tx type 0"
-                    return None, error_status(note, log=logger.warning)
+            gas_price = self.legacy_gas_price
+        # Set gas price to legacy gas price used for profitability check
+        self.gas_info["type"] = 0
+        self.gas_info["gas_price"] = gas_price
+        return {"gasPrice": self.web3.toWei(gas_price, "gwei")}, ResponseStatus()
 
-            else:
-                gas_price = self.legacy_gas_price
-            # Set gas price to legacy gas price used for profitability check
-            self.gas_info["type"] = 0
-            self.gas_info["gas_price"] = gas_price
-            built_submit_val_tx = submit_val_tx.buildTransaction(
-                {
-                    "nonce": nonce,
-                    "gas": gas_limit,
-                    "gasPrice": self.web3.toWei(gas_price, "gwei"),
-                    "chainId": self.chain_id,
-                }
-            )
+    async def report_once(
+        self,
+    ) -> Tuple[Optional[AttributeDict[Any, Any]], ResponseStatus]:
+        """Report query value once
+        This method checks to see if a user is able to submit
+        values to the FetchX oracle, given their staker status
+        and last submission time. Also, this method does not
+        submit values if doing so won't make a profit.
+
+        Once staked, the reporter lock check, datafeed value, account nonce
+        and fees are fetched concurrently, stopping at the first failure."""
+        report, status = await self.prepare_report()
+        if report is None:
+            return None, status
+        return await self.submit_report(report)
+
+    async def prepare_report(self) -> Tuple[Optional[PreparedReport], ResponseStatus]:
+        """Run the checks of `report_once` and prepare its transaction, without sending it
+
+        Returns the report if it can be submitted and is profitable"""
+        # Contract reads are cached per block, check for a new one
+        get_read_cache(self.web3).refresh()
+
+        # Staking sends a transaction, so it isn't cancelled by failures of the other stages
+        status = await self.check_staked()
+        if not status.ok:
+            return None, status
+
+        results, status = await gather_until_failure(
+            self.check_can_report(),
+            self.fetch_report_value(),
+            self.fetch_nonce(),
+            self.fetch_fee_params(),
+        )
+        if not status.ok:
+            return None, status
+        _, (datafeed, value, report_count), _, fee_params = results
+
+        # Start transaction build from the query's precomputed calldata
+        query = datafeed.query
+        template = get_submit_template(self.submit_templates, self.oracle.contract, query.query_id, query.query_data)
+        if template is None:
+            return None, error_status("Unable to build submitValue transaction", log=logger.error)
+        # Estimate gas usage amount
+        gas_limit, status = await asyncio.to_thread(self.submit_template_gas_limit, template, value, report_count)
+        if not status.ok or gas_limit is None:
+            return None, status
+
+        self.gas_info["gas_limit"] = gas_limit
 
         # Check if profitable if not YOLO
         status = await self.ensure_profitable(datafeed)
         if not status.ok:
             return None, status
 
+        report = PreparedReport(
+            datafeed=datafeed,
+            template=template,
+            value=value,
+            report_count=report_count,
+            gas_limit=gas_limit,
+            fee_params=fee_params,
+            tip=self.expected_tip,
+        )
+        return report, ResponseStatus()
+
+    async def submit_report(
+        self, report: PreparedReport
+    ) -> Tuple[Optional[AttributeDict[Any, Any]], ResponseStatus]:
+        """Sign and send a prepared report, and wait for it to be mined"""
+        submission, status = await self.send_report(report)
+        if submission is None:
+            return None, status
+        return await self.confirm_report(report, submission)
+
+    async def send_report(self, report: PreparedReport) -> Tuple[Optional[Submission], ResponseStatus]:
+        """Sign and send a prepared report, without waiting for it"""
         lazy_unlock_account(self.account)
-        local_account = self.account.local_account
-        tx_signed = local_account.sign_transaction(built_submit_val_tx)
+
+        # Reserve the nonce just before signing
+        nonce, status = self.reserve_nonce()
+        if not status.ok or nonce is None:
+            return None, status
+        template = report.template
+        built_submit_val_tx = template.build(
+            report.value, report.report_count, nonce, report.gas_limit, self.chain_id, report.fee_params
+        )
 
         # Ensure reporter lock is checked again after attempting to submit val
         self.last_submission_timestamp = 0
 
-        try:
-            logger.debug("Sending submitValue transaction")
-            tx_hash = self.web3.eth.send_raw_transaction(tx_signed.rawTransaction)
-        except Exception as e:
-            note = "Send transaction failed"
-            return None, error_status(note, log=logger.error, e=e)
+        logger.debug("Sending submitValue transaction")
+        submission, status = await self.tx_manager.send(built_submit_val_tx)  # type: ignore
+        if submission is None:
+            self.release_nonce(nonce, status.e)  # type: ignore
+        return submission, status
 
-        try:
-            # Confirm transaction
-            tx_receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=self.tx_timeout)
+    async def confirm_report(
+        self, report: PreparedReport, submission: Submission
+    ) -> Tuple[Optional[AttributeDict[Any, Any]], ResponseStatus]:
+        """Wait for a sent report to be mined, replacing it with higher fees if stuck"""
+        query_id = report.datafeed.query.query_id
+        tx_receipt, status = await self.tx_manager.wait(
+            submission,
+            timeout=self.tx_timeout,
+            still_needed=lambda: self.is_report_needed(query_id, report.report_count),
+        )
+        if tx_receipt is None:
+            # not mined in time: ask the node for the nonce again
+            self.nonce_manager.reset()
+            return None, status
 
-            tx_url = f"{self.endpoint.explorer}/tx/{tx_hash.hex()}"
+        tx_url = f"{self.endpoint.explorer}/tx/{tx_receipt['transactionHash'].hex()}"
 
-            if tx_receipt["status"] == 0:
-                msg = f"Transaction reverted. ({tx_url})"
-                return tx_receipt, error_status(msg, log=logger.error)
+        if tx_receipt["transactionHash"] in submission.cancel_hashes:
+            logger.info(f"Cancellation mined: {tx_url}")
+            return tx_receipt, status
 
-        except Exception as e:
-            note = "Failed to confirm transaction"
-            return None, error_status(note, log=logger.error, e=e)
+        if tx_receipt["status"] == 0:
+            # the revert may come from an outdated gas estimate
+            report.template.forget_gas_limits()
+            msg = f"Transaction reverted. ({tx_url})"
+            return tx_receipt, error_status(msg, log=logger.error)
 
         if status.ok and not status.error:
             logger.info(f"View reported data: \n{tx_url}")
@@ -652,16 +866,40 @@ class IntervalReporter:
             logger.error(status)
 
         return tx_receipt, status
-    
+
+    async def is_report_needed(self, query_id: bytes, report_count: int) -> bool:
+        """Whether a value submitted with `report_count` can still be accepted,
+        i.e. nobody reported the query meanwhile"""
+        get_read_cache(self.web3).refresh()
+        count, status = await self.get_num_reports_by_id(query_id)
+        return not status.ok or count == report_count
+
+    def for_feed(
+        self, datafeed: DataFeed[Any], expected_profit: Optional[Union[str, float]] = None
+    ) -> "IntervalReporter":
+        """Copy of the reporter for one datafeed
+
+        The copy has its own datafeed, gas info and profitability threshold, and
+        shares the account, web3 connection, nonce and transaction managers, fee
+        oracle and sources, submitValue templates, price cache and stake lock."""
+        reporter = copy.copy(self)
+        reporter.datafeed = datafeed
+        reporter.gas_info = {}
+        reporter.expected_tip = 0
+        reporter.last_submission_timestamp = 0
+        if expected_profit is not None:
+            reporter.expected_profit = expected_profit
+        return reporter
+
     async def managed_feed_report(self, submit_once: bool = False) -> None:
         logger.info("Using managed feed to submit values")
 
         datafeed = await self.fetch_datafeed()
 
         current_report_time = { "timestamp": time.time() }
-        sync_event = threading.Event()
-        time_limit_event = threading.Event()
-        is_submitting_report = threading.Event()
+        sync_event = asyncio.Event()
+        time_limit_event = asyncio.Event()
+        is_submitting_report = asyncio.Event()
 
         flexV3 = FlexV3(
                 datafeed=datafeed,
@@ -670,9 +908,12 @@ class IntervalReporter:
                 chain_id=self.chain_id,
                 get_fees=self.get_fees,
                 oracle=self.oracle,
+                fee_oracle=self.fee_oracle,
+                tx_manager=self.tx_manager,
                 price_validation_method=self.price_validation_method,
                 price_validation_consensus=self.price_validation_consensus,
-                continue_reporting_on_validator_unreachable=self.continue_reporting_on_validator_unreachable)
+                continue_reporting_on_validator_unreachable=self.continue_reporting_on_validator_unreachable,
+                nonce_manager=self.nonce_manager)
         listen_lp_contract = ListenLPContract(
             sync_event=sync_event,
             time_limit_event=time_limit_event,
@@ -683,27 +924,36 @@ class IntervalReporter:
         await listen_lp_contract.initialize_price()
 
         listen_lp_contract.listen_sync_events()
+        self.start_fee_oracle()
 
         sync_event.set()
         logger.info("Triggered first LP sync event report")
-        while True:
-            self.handle_rpc_connection_failures()
-
-            logger.info("Waiting for LP sync event report trigger...")
-            sync_event.wait()
-            
-            if time_limit_event.is_set():
-                logger.info("Time limit reached! Submitting price")
-
-            logger.info("Report triggered")
-            is_submitting_report.set()
-            await flexV3.callSubmitValue()
-            current_report_time["timestamp"] = time.time()
-            sync_event.clear()
-            time_limit_event.clear()
-            is_submitting_report.clear()
+        try:
+            while True:
+                self.handle_rpc_connection_failures()
 
-            if submit_once: break
+                logger.info("Waiting for LP sync event report trigger...")
+                await sync_event.wait()
+
+                if time_limit_event.is_set():
+                    logger.info("Time limit reached! Submitting price")
+
+                logger.info("Report triggered")
+                is_submitting_report.set()
+                # the report count must include the previous submission
+                await flexV3.wait_for_confirmations()
+                await flexV3.callSubmitValue()
+                current_report_time["timestamp"] = time.time()
+                sync_event.clear()
+                time_limit_event.clear()
+                is_submitting_report.clear()
+
+                if submit_once:
+                    await flexV3.wait_for_confirmations()
+                    break
+        finally:
+            await listen_lp_contract.stop()
+            await self.fee_oracle.stop()
 
     def handle_rpc_connection_failures(self) -> None:
         rpc_connection_failures = 0
@@ -732,18 +982,23 @@ class IntervalReporter:
         if asset in managed_feeds.assets:
             await self.managed_feed_report()
         else:
-            while report_count is None or report_count > 0:
-                self.handle_rpc_connection_failures()
-                    
-                online = await self.is_online()
-                if online:
-                    if self.has_native_token():
-                        _, _ = await self.report_once()
-                else:
-                    logger.warning("Unable to connect to the internet!")
-
-                logger.info(f"Sleeping for {self.wait_period} seconds")
-                await asyncio.sleep(self.wait_period)
-
-                if report_count is not None:
-                    report_count -= 1
+            if self.transaction_type == 2:
+                self.start_fee_oracle()
+            try:
+                while report_count is None or report_count > 0:
+                    self.handle_rpc_connection_failures()
+
+                    online = await self.is_online()
+                    if online:
+                        if self.has_native_token():
+                            _, _ = await self.report_once()
+                    else:
+                        logger.warning("Unable to connect to the internet!")
+
+                    logger.info(f"Sleeping for {self.wait_period} seconds")
+                    await asyncio.sleep(self.wait_period)
+
+                    if report_count is not None:
+                        report_count -= 1
+            finally:
+                await self.fee_oracle.stop()
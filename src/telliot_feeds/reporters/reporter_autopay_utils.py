@@ -14,7 +14,6 @@ from typing import Tuple
 from clamfig.base import Registry
 from eth_abi import decode_single
 from multicall import Call
-from multicall import Multicall
 from telliot_core.fetch.fetchflex.autopay import FetchFlexAutopayContract
 from telliot_core.utils.response import error_status
 from telliot_core.utils.timestamp import TimeStamp
@@ -25,6 +24,7 @@ from telliot_feeds.feeds import CATALOG_FEEDS
 from telliot_feeds.queries.query_catalog import query_catalog
 from telliot_feeds.reporters.tips import CATALOG_QUERY_IDS
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.multicall_executor import get_multicall_executor
 
 logger = get_logger(__name__)
 
@@ -497,10 +497,8 @@ async def safe_multicall(calls: List[Call], endpoint: Web3, require_success: boo
     Returns:
         data if multicall is successful
     """
-    mc = Multicall(calls=calls, _w3=endpoint, require_success=require_success)
-
     try:
-        data: Dict[str, Any] = await mc.coroutine()
+        data: Dict[str, Any] = await get_multicall_executor(endpoint).execute(calls, require_success)
         return data
     except ContractLogicError as e:
         msg = f"Contract reversion in multicall request, ContractLogicError: {e}"
@@ -1,8 +1,11 @@
 """Utilities for calculating time-based rewards (TBR)"""
+import asyncio
+
 from telliot_core.fetch.fetch360.oracle import Fetch360OracleContract
 from telliot_core.utils.timestamp import TimeStamp
 
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.read_cache import cached_read
 
 logger = get_logger(__name__)
 
@@ -17,8 +20,10 @@ async def get_time_based_rewards(oracle: Fetch360OracleContract) -> int:
     tbr: int
     reward: int
 
-    time_of_last_new_value, last_val_status = await oracle.read("timeOfLastNewValue")
-    tbr, tbr_status = await oracle.read("getTotalTimeBasedRewardsBalance")
+    (time_of_last_new_value, last_val_status), (tbr, tbr_status) = await asyncio.gather(
+        cached_read(oracle, "timeOfLastNewValue"),
+        cached_read(oracle, "getTotalTimeBasedRewardsBalance"),
+    )
 
     # if any call fails return 0 and a msg that tbr can't calc'd
     if not tbr_status.ok or not last_val_status.ok:
@@ -0,0 +1,132 @@
+"""Precomputed submitValue transactions for a query.
+
+Reporting the same query over and over, only the value, the report count
+(`_nonce`) and the account nonce change between submitValue transactions. A
+template keeps the selector, query id and encoded query data, and splices the
+value and nonces into the calldata without going through web3's ABI encoding.
+
+The gas estimate is cached per value size (in 32 byte words), so `estimateGas`
+only runs again when the value size changes or after a reverted transaction.
+Since calldata gas still depends on the value bytes, the cached limit is the
+estimate plus `SUBMIT_GAS_MARGIN`.
+"""
+import os
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from eth_abi import encode_single
+from eth_utils import function_abi_to_4byte_selector
+from eth_utils import to_checksum_address
+from web3 import Web3
+from web3.contract import Contract
+from web3.types import TxParams
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Headroom on top of the gas estimate for value bytes costing more calldata gas
+SUBMIT_GAS_MARGIN = float(os.getenv("SUBMIT_GAS_MARGIN", 1.1))
+
+#: submitValue(bytes32 _queryId, bytes _value, uint256 _nonce, bytes _queryData)
+SUBMIT_VALUE_TYPES = ["bytes32", "bytes", "uint256", "bytes"]
+
+
+class SubmitValueTemplate:
+    """submitValue calldata and gas limits of one query on an oracle contract"""
+
+    def __init__(self, contract: Contract, query_id: bytes, query_data: bytes) -> None:
+        fn_abi = next(
+            (abi for abi in contract.abi if abi.get("type") == "function" and abi.get("name") == "submitValue"), None
+        )
+        if fn_abi is None or [arg["type"] for arg in fn_abi["inputs"]] != SUBMIT_VALUE_TYPES:
+            raise ValueError(f"Unsupported submitValue function: {fn_abi}")
+        if len(query_id) != 32:
+            raise ValueError(f"Invalid query id: 0x{query_id.hex()}")
+
+        self.address = to_checksum_address(contract.address)
+        self.query_id = query_id
+        self.query_data = query_data
+        self.head = function_abi_to_4byte_selector(fn_abi) + query_id
+        self.query_data_tail = encode_single("bytes", query_data)
+        #: gas limits by value size in words
+        self.gas_limits: Dict[int, int] = {}
+
+    def calldata(self, value: bytes, report_count: int) -> bytes:
+        """ABI encoded submitValue call for a value and report count"""
+        value_tail = encode_single("bytes", value)
+        # head: query id, offset of value, nonce, offset of query data
+        return b"".join(
+            (
+                self.head,
+                (128).to_bytes(32, "big"),
+                report_count.to_bytes(32, "big"),
+                (128 + len(value_tail)).to_bytes(32, "big"),
+                value_tail,
+                self.query_data_tail,
+            )
+        )
+
+    @staticmethod
+    def value_words(value: bytes) -> int:
+        return (len(value) + 31) // 32
+
+    def estimate_gas(self, w3: Web3, sender: str, value: bytes, report_count: int) -> int:
+        """Gas limit for submitting a value, estimated once per value size"""
+        words = self.value_words(value)
+        gas_limit = self.gas_limits.get(words)
+        if gas_limit is None:
+            estimate = w3.eth.estimate_gas(
+                {"from": sender, "to": self.address, "data": self.calldata(value, report_count)}  # type: ignore
+            )
+            gas_limit = int(estimate * SUBMIT_GAS_MARGIN)
+            self.gas_limits[words] = gas_limit
+            logger.debug(f"submitValue gas estimate for {words} word values: {estimate}, limit: {gas_limit}")
+        return gas_limit
+
+    def forget_gas_limits(self) -> None:
+        """Estimate gas again on the next submission, e.g. after a reverted transaction"""
+        self.gas_limits.clear()
+
+    def build(
+        self, value: bytes, report_count: int, nonce: int, gas: int, chain_id: int, fee_params: Dict[str, Any]
+    ) -> TxParams:
+        """Transaction ready to sign
+
+        Args:
+            value: encoded value
+            report_count: value count of the query id, the submitValue `_nonce`
+            nonce: account nonce
+            gas: gas limit
+            chain_id: chain id
+            fee_params: gasPrice, or maxFeePerGas and maxPriorityFeePerGas, in wei
+        """
+        tx: Dict[str, Any] = {
+            "to": self.address,
+            "value": 0,
+            "data": self.calldata(value, report_count),
+            "nonce": nonce,
+            "gas": gas,
+            "chainId": chain_id,
+            **fee_params,
+        }
+        return tx  # type: ignore
+
+
+def get_submit_template(
+    templates: Dict[bytes, SubmitValueTemplate], contract: Contract, query_id: bytes, query_data: bytes
+) -> Optional[SubmitValueTemplate]:
+    """Return the template for a query from `templates`, creating it if needed
+
+    Returns None if the contract's submitValue can't be templated."""
+    template = templates.get(query_id)
+    if template is None or template.address != to_checksum_address(contract.address):
+        try:
+            template = SubmitValueTemplate(contract, query_id, query_data)
+        except ValueError as e:
+            logger.warning(f"Unable to create submitValue template: {e}")
+            return None
+        templates[query_id] = template
+    return template
@@ -2,11 +2,12 @@ from typing import Any
 from typing import Optional
 
 from multicall import Call
-from multicall import Multicall
 from telliot_core.fetch.fetchflex.autopay import FetchFlexAutopayContract
 from telliot_core.utils.response import error_status
 from telliot_core.utils.response import ResponseStatus
 
+from telliot_feeds.utils.multicall_executor import get_multicall_executor
+
 
 class AssembleCall:
     """
@@ -29,9 +30,9 @@ class AssembleCall:
         - dictionary of of Any type key, could be tuple, string, or number
         """
         status = ResponseStatus()
-        multi_call = Multicall(calls=calls, _w3=self.autopay.node._web3, require_success=success)
+        executor = get_multicall_executor(self.autopay.node._web3)
         try:
-            data: dict[Any, Any] = await multi_call.coroutine()
+            data: dict[Any, Any] = await executor.execute(calls, require_success=success)
             return data, status
         except Exception as e:
             msg = "multicall failed to fetch data"
@@ -0,0 +1,252 @@
+"""Local mirror of autopay funded feeds and one time tips, indexed from event logs
+
+Instead of rebuilding the funded feeds picture through view calls every loop,
+the mirror is bootstrapped once from `getFundedFeedDetails` and
+`getFundedSingleTipsInfo` at a block, then kept in sync by applying the
+autopay (NewDataFeed, DataFeedFunded, TipAdded, TipClaimed) and oracle
+(NewReport) logs of every new block.
+
+A checkpoint of the state is kept for each synced block hash. If a synced block
+is no longer part of the chain, the mirror rolls back to the latest checkpoint
+still on it and re-indexes from there.
+"""
+import asyncio
+import copy
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Optional
+
+from eth_utils import event_abi_to_log_topic
+from telliot_core.contract.contract import Contract
+from telliot_core.fetch.fetchflex.autopay import FetchFlexAutopayContract
+from web3 import Web3
+
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+AUTOPAY_EVENTS = ("NewDataFeed", "DataFeedFunded", "TipAdded", "TipClaimed")
+ORACLE_EVENTS = ("NewReport",)
+
+
+@dataclass
+class MirroredFeed:
+    """Autopay data feed with its query data"""
+
+    query_id: bytes
+    query_data: Optional[bytes]
+    params: FeedDetails
+
+
+@dataclass
+class AutopayState:
+    """
+    Autopay and oracle state kept by the mirror
+    - feeds: data feeds by feed id
+    - query_data: query data by query id
+    - tips: current one time tip by query id
+    - last_report: latest report by query id
+    """
+
+    feeds: dict[bytes, MirroredFeed] = field(default_factory=dict)
+    query_data: dict[bytes, bytes] = field(default_factory=dict)
+    tips: dict[bytes, int] = field(default_factory=dict)
+    last_report: dict[bytes, Values] = field(default_factory=dict)
+
+
+class AutopayMirror:
+    """Autopay funded feeds and tips kept in memory from event logs"""
+
+    def __init__(
+        self,
+        autopay: FetchFlexAutopayContract,
+        oracle: Optional[Contract] = None,
+        max_checkpoints: int = 64,
+        max_block_range: int = 2000,
+    ) -> None:
+        self.autopay = autopay
+        self.oracle = oracle
+        self.max_checkpoints = max_checkpoints
+        self.max_block_range = max_block_range
+
+        self.state = AutopayState()
+        #: (block number, block hash, state after that block), oldest first
+        self.checkpoints: list[tuple[int, bytes, AutopayState]] = []
+        self._lock = asyncio.Lock()
+
+        self.topics: dict[bytes, tuple[Any, str]] = {}
+        for contract, names in ((autopay, AUTOPAY_EVENTS), (oracle, ORACLE_EVENTS)):
+            if contract is None:
+                continue
+            for abi in contract.contract.abi:
+                if abi.get("type") == "event" and abi["name"] in names:
+                    self.topics[bytes(event_abi_to_log_topic(abi))] = (contract.contract, abi["name"])
+
+    @property
+    def w3(self) -> Web3:
+        return self.autopay.node._web3
+
+    @property
+    def block_number(self) -> Optional[int]:
+        """Latest block applied to the mirror"""
+        return self.checkpoints[-1][0] if self.checkpoints else None
+
+    async def sync(self) -> bool:
+        """Apply the logs of the blocks mined since the last sync
+
+        Return: False if the mirror couldn't be synced
+        """
+        async with self._lock:
+            try:
+                head = await asyncio.to_thread(self.w3.eth.get_block, "latest")
+                if not self.checkpoints:
+                    await self._bootstrap(head)
+                    return True
+                if head.hash == self.checkpoints[-1][1]:
+                    return True
+
+                if not await self._rollback_to_canonical():
+                    logger.warning("Autopay mirror checkpoints reorged out, bootstrapping again")
+                    self.checkpoints.clear()
+                    await self._bootstrap(head)
+                    return True
+
+                from_block = self.block_number + 1  # type: ignore
+                for start in range(from_block, head.number + 1, self.max_block_range):
+                    end = min(start + self.max_block_range - 1, head.number)
+                    for log in await self._get_logs(start, end):
+                        self._apply(log)
+                await self._resolve_query_data(head.number)
+                self._checkpoint(head.number, head.hash)
+                logger.debug(f"Autopay mirror synced blocks {from_block} to {head.number}")
+                return True
+            except Exception as e:
+                logger.warning(f"Unable to sync autopay mirror: {e}")
+                return False
+
+    async def _rollback_to_canonical(self) -> bool:
+        """Drop checkpoints of blocks no longer part of the chain
+
+        Return: False if none of the checkpoints is left
+        """
+        while self.checkpoints:
+            number, block_hash, state = self.checkpoints[-1]
+            block = await asyncio.to_thread(self.w3.eth.get_block, number)
+            if block.hash == block_hash:
+                self.state = copy.deepcopy(state)
+                return True
+            logger.info(f"Autopay mirror: block {number} reorged out, rolling back")
+            self.checkpoints.pop()
+        return False
+
+    def _checkpoint(self, number: int, block_hash: bytes) -> None:
+        self.checkpoints.append((number, block_hash, copy.deepcopy(self.state)))
+        del self.checkpoints[: -self.max_checkpoints]
+
+    async def _bootstrap(self, head: Any) -> None:
+        """Initialize the state from view calls at the head block"""
+        functions = self.autopay.contract.functions
+        funded_feeds = await asyncio.to_thread(functions.getFundedFeedDetails().call, block_identifier=head.number)
+        single_tips = await asyncio.to_thread(functions.getFundedSingleTipsInfo().call, block_identifier=head.number)
+
+        self.state = AutopayState()
+        id_generator = FundedFeedFilter()
+        for feed_details, query_data in funded_feeds:
+            feed = QueryIdandFeedDetails(params=FeedDetails(*feed_details), query_data=query_data)
+            feed_id, query_id = id_generator.generate_ids(feed)
+            self.state.feeds[feed_id] = MirroredFeed(query_id, query_data, feed.params)
+            self.state.query_data[query_id] = query_data
+        for query_data, tip in single_tips:
+            if query_data == b"":
+                continue
+            query_id = bytes(Web3.keccak(query_data))
+            self.state.query_data[query_id] = query_data
+            self.state.tips[query_id] = tip
+
+        self._checkpoint(head.number, head.hash)
+        logger.info(f"Autopay mirror bootstrapped at block {head.number}: {len(self.state.feeds)} funded feeds")
+
+    async def _get_logs(self, from_block: int, to_block: int) -> list[Any]:
+        addresses = [self.autopay.address] + ([self.oracle.address] if self.oracle is not None else [])
+        logs = await asyncio.to_thread(
+            self.w3.eth.get_logs,
+            {
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "address": addresses,
+                "topics": [[Web3.toHex(topic) for topic in self.topics]],
+            },
+        )
+        return sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
+
+    async def _resolve_query_data(self, to_block: int) -> None:
+        """Look up the query data of feeds set up before the bootstrap block and funded since"""
+        missing = {feed.query_id for feed in self.state.feeds.values() if feed.query_data is None}
+        if not missing:
+            return
+        new_data_feed = next(topic for topic, (_, name) in self.topics.items() if name == "NewDataFeed")
+        logs = await asyncio.to_thread(
+            self.w3.eth.get_logs,
+            {
+                "fromBlock": "earliest",
+                "toBlock": to_block,
+                "address": self.autopay.address,
+                "topics": [Web3.toHex(new_data_feed), [Web3.toHex(query_id) for query_id in missing]],
+            },
+        )
+        contract, _ = self.topics[new_data_feed]
+        for log in logs:
+            if bytes(log["topics"][0]) == new_data_feed:
+                args = contract.events.NewDataFeed().processLog(log)["args"]
+                self.state.query_data[bytes(args["_queryId"])] = args["_queryData"]
+        for feed in self.state.feeds.values():
+            if feed.query_data is None:
+                feed.query_data = self.state.query_data.get(feed.query_id)
+
+    def _apply(self, log: Any) -> None:
+        """Update the state with an autopay or oracle event"""
+        topic = bytes(log["topics"][0])
+        if topic not in self.topics:
+            return
+        contract, name = self.topics[topic]
+        args = getattr(contract.events, name)().processLog(log)["args"]
+        query_id = bytes(args["_queryId"])
+        state = self.state
+
+        if name == "NewDataFeed":
+            state.query_data[query_id] = args["_queryData"]
+        elif name == "DataFeedFunded":
+            # the event carries the feed details after funding
+            state.feeds[bytes(args["_feedId"])] = MirroredFeed(
+                query_id, state.query_data.get(query_id), FeedDetails(*args["_feedDetails"])
+            )
+        elif name == "TipClaimed":
+            feed = state.feeds.get(bytes(args["_feedId"]))
+            if feed is not None:
+                feed.params.balance = max(feed.params.balance - args["_amount"], 0)
+        elif name == "TipAdded":
+            state.query_data[query_id] = args["_queryData"]
+            state.tips[query_id] = state.tips.get(query_id, 0) + args["_amount"]
+        elif name == "NewReport":
+            state.query_data.setdefault(query_id, args["_queryData"])
+            # tips added before a report can only be claimed by its reporter
+            state.tips.pop(query_id, None)
+            state.last_report[query_id] = Values(args["_value"], args["_time"])
+
+    def funded_feed_details(self) -> list[tuple[FeedDetails, bytes]]:
+        """Funded feeds in the format of autopay getFundedFeedDetails"""
+        return [
+            (copy.copy(feed.params), feed.query_data)
+            for feed in self.state.feeds.values()
+            if feed.params.balance > 0 and feed.query_data is not None
+        ]
+
+    def funded_single_tips(self) -> list[tuple[bytes, int]]:
+        """Query data and current one time tip, in the format of autopay getFundedSingleTipsInfo"""
+        return [(self.state.query_data[query_id], tip) for query_id, tip in self.state.tips.items() if tip > 0]
@@ -9,9 +9,12 @@ from telliot_core.utils.response import error_status
 from telliot_core.utils.response import ResponseStatus
 from telliot_core.utils.timestamp import TimeStamp
 
+from telliot_feeds.reporters.tips.listener.autopay_mirror import AutopayMirror
 from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
 from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
 from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
+from telliot_feeds.reporters.tips.listener.history_cache import AutopayHistoryCache
+from telliot_feeds.reporters.tips.listener.history_cache import get_history_cache
 from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
 from telliot_feeds.utils.log import get_logger
 
@@ -23,11 +26,20 @@ class FundedFeeds(FundedFeedFilter):
     """Fetch Feeds from autopay and filter"""
 
     def __init__(
-        self, autopay: FetchFlexAutopayContract, multi_call: MulticallAutopay, listener_filter: Callable[[bytes], bool]
+        self,
+        autopay: FetchFlexAutopayContract,
+        multi_call: MulticallAutopay,
+        listener_filter: Callable[[bytes], bool],
+        history: Optional[AutopayHistoryCache] = None,
+        mirror: Optional[AutopayMirror] = None,
     ) -> None:
         self.multi_call = multi_call
         self.listener_filter = listener_filter
         self.autopay = self.multi_call.autopay = autopay
+        # reports and claimed timestamps fetched in previous loops
+        self.history = history if history is not None else get_history_cache(autopay)
+        # synced autopay state indexed from event logs, replaces the getFundedFeedDetails call
+        self.mirror = mirror
 
     async def get_funded_feed_queries(self) -> tuple[Optional[list[QueryIdandFeedDetails]], ResponseStatus]:
         """Call getFundedFeedDetails autopay function filter response data
@@ -36,7 +48,10 @@ class FundedFeeds(FundedFeedFilter):
         that exist in telliot registry
         """
         funded_feeds: list[tuple[FeedDetails, bytes]]
-        funded_feeds, status = await self.autopay.read("getFundedFeedDetails")
+        if self.mirror is not None:
+            funded_feeds, status = self.mirror.funded_feed_details(), ResponseStatus()
+        else:
+            funded_feeds, status = await self.autopay.read("getFundedFeedDetails")
 
         if not status.ok or not funded_feeds:
             return None, error_status(note="No funded feeds returned by autopay function call")
@@ -81,8 +96,13 @@ class FundedFeeds(FundedFeedFilter):
             )
             return None, error_status(note=note)
         # make the first multicall and values and timestamps for the past month
-        feeds_timestsamps_and_values_lis, status = await self.multi_call.month_of_timestamps_and_values(
-            feeds=catalog_supported_feeds, now_timestamp=now_timestamp, max_age=month_old_timestamp, max_count=40_000
+        # (only the ones newer than the cached history)
+        feeds_timestsamps_and_values_lis, status = await self.multi_call.new_timestamps_and_values(
+            feeds=catalog_supported_feeds,
+            now_timestamp=now_timestamp,
+            window_start=month_old_timestamp,
+            history=self.history,
+            max_count=40_000,
         )
 
         if not status.ok:
@@ -102,9 +122,9 @@ class FundedFeeds(FundedFeedFilter):
             feeds=feeds_timestsamps_and_values_filtered
         )
 
-        # get claim status count for every query ids eligible timestamp
-        reward_claimed_status, status = await self.multi_call.rewards_claimed_status_call(
-            feeds=historical_timestamps_list_filtered
+        # get claim status count for every query ids eligible timestamp not known to be claimed
+        reward_claimed_status, status = await self.multi_call.unclaimed_count_call(
+            feeds=historical_timestamps_list_filtered, history=self.history
         )
 
         if reward_claimed_status is None:
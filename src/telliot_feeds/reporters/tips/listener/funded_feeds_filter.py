@@ -1,3 +1,4 @@
+import asyncio
 import math
 from typing import Optional
 
@@ -66,15 +67,20 @@ class FundedFeedFilter:
         eligible = [time_diff < feed_window, timestamp_before < current_window_start]
         return all(eligible), time_diff
 
-    async def price_change(self, query_id: bytes, value_before: float) -> Optional[float]:
-        """Check if priceThreshold is met for submitting now
+    async def fetch_price(self, query_id: bytes) -> Optional[float]:
+        """Fetch the current price of a query id from its telliot catalog feed
+
+        The result, including a failure, is cached until the next tip evaluation cycle.
 
         Args:
         - query_id: used to get api source
-        - value_before: the value used to compare current value
 
         Returns: float
         """
+        if query_id in self.prices:
+            return self.prices[query_id]
+        self.prices[query_id] = None
+
         if query_id not in CATALOG_QUERY_IDS:
             return None
 
@@ -85,17 +91,30 @@ class FundedFeedFilter:
         else:
             logger.info(f"No Api source found for {query_tag} to check priceThreshold")
             return None
-        if query_id not in self.prices:
-            value_now = await datafeed.source.fetch_new_datapoint()  # type: ignore
 
-            if not value_now:
-                note = f"Unable to fetch {datafeed} price for tip calculation"
-                _ = error_status(note=note, log=logger.warning)
-                return None
+        value_now = await datafeed.source.fetch_new_datapoint()  # type: ignore
+        if not value_now or value_now[0] is None:
+            note = f"Unable to fetch {datafeed} price for tip calculation"
+            _ = error_status(note=note, log=logger.warning)
+            return None
+
+        self.prices[query_id] = value_now[0]
+        return self.prices[query_id]
+
+    async def price_change(self, query_id: bytes, value_before: float) -> Optional[float]:
+        """Check if priceThreshold is met for submitting now
 
-            self.prices[query_id] = value_now[0]
+        Args:
+        - query_id: used to get api source
+        - value_before: the value used to compare current value
 
-        return _get_price_change(previous_val=value_before, current_val=self.prices[query_id])
+        Returns: float
+        """
+        value_now = await self.fetch_price(query_id)
+        if value_now is None:
+            return None
+
+        return _get_price_change(previous_val=value_before, current_val=value_now)
 
     def api_support_check(self, feeds: list[QueryIdandFeedDetails]) -> list[QueryIdandFeedDetails]:
         """Filter funded feeds where threshold is gt zero and no telliot catalog feeds support"""
@@ -112,43 +131,48 @@ class FundedFeedFilter:
         """Check list of values for older submission would've been eligible for a tip
         if so the timestamps will be checked later to see if a tip for them has been claimed
 
+        Every submission is compared with the one before it in a single pass.
+
         Args:
         - feeds
 
         Returns: filtered feeds list
         """
         for feed in feeds:
+            submissions = feed.queryid_timestamps_values_list
             # in case a query id has has none or too few to compare
-            if len(feed.queryid_timestamps_values_list) < 2:
+            if len(submissions) < 2:
                 continue
-            for current, previous in zip(
-                feed.queryid_timestamps_values_list[::-1], feed.queryid_timestamps_values_list[-2::-1]
-            ):
+            params = feed.params
+            # values are only compared for feeds with a price threshold, decode each of them once
+            values = [_decode_value(v.value) for v in submissions] if params.priceThreshold else []
+            # the oldest submission has nothing to compare with and is kept
+            eligible = [submissions[0]]
+            for i in range(1, len(submissions)):
+                previous, current = submissions[i - 1], submissions[i]
                 # if current timestamp is before feed start then no need to check
-                if feed.params.startTime > current.timestamp:
-                    feed.queryid_timestamps_values_list.remove(current)
+                if params.startTime > current.timestamp:
                     continue
-                in_eligibile_window = self.is_timestamp_first_in_window(
+                in_eligibile_window, _ = self.is_timestamp_first_in_window(
                     timestamp_before=previous.timestamp,
                     timestamp_to_check=current.timestamp,
-                    feed_start_timestamp=feed.params.startTime,
-                    feed_window=feed.params.window,
-                    feed_interval=feed.params.interval,
+                    feed_start_timestamp=params.startTime,
+                    feed_window=params.window,
+                    feed_interval=params.interval,
                 )
                 if not in_eligibile_window:
-                    if feed.params.priceThreshold == 0:
-                        feed.queryid_timestamps_values_list.remove(current)
-                    else:
-                        try:
-                            previous_value = int(int(previous.value.hex(), 16) / 1e18)
-                        except ValueError:
-                            _ = error_status("Error decoding current query id value")
-                            continue
-
-                        price_change = _get_price_change(previous_val=previous_value, current_val=current.value)
-
-                        if price_change < feed.params.priceThreshold:
-                            feed.queryid_timestamps_values_list.remove(current)
+                    if params.priceThreshold == 0:
+                        continue
+                    previous_value, current_value = values[i - 1], values[i]
+                    if previous_value is None or current_value is None:
+                        _ = error_status("Error decoding current query id value")
+                    elif (
+                        _get_price_change(previous_val=previous_value, current_val=current_value)
+                        < params.priceThreshold
+                    ):
+                        continue
+                eligible.append(current)
+            feed.queryid_timestamps_values_list = eligible
 
         return feeds
 
@@ -163,15 +187,16 @@ class FundedFeedFilter:
 
         Returns: list of feeds
         """
-        for feed in list(feeds):
+        funded = []
+        for feed in feeds:
             key = (feed.feed_id, feed.query_id)
-            if key not in unclaimed_timestamps_count:
-                continue
-            unclaimed_count = unclaimed_timestamps_count[key]
-            feed.params.balance -= feed.params.reward * unclaimed_count
-            # if remaining balance is zero filter out the feed from the list
-            if feed.params.balance <= 0:
-                feeds.remove(feed)
+            if key in unclaimed_timestamps_count:
+                feed.params.balance -= feed.params.reward * unclaimed_timestamps_count[key]
+                # if remaining balance is zero filter out the feed from the list
+                if feed.params.balance <= 0:
+                    continue
+            funded.append(feed)
+        feeds[:] = funded
         return feeds
 
     async def window_and_priceThreshold_unmet_filter(
@@ -187,8 +212,11 @@ class FundedFeedFilter:
 
         Returns: list of feeds that could possibly reward a tip
         """
-        self.prices: dict[bytes, float] = {}
-        for feed in list(feeds):
+        # prices fetched during this tip evaluation cycle, by query id
+        self.prices: dict[bytes, Optional[float]] = {}
+        # feeds kept in order, with the value to compare for the ones pending a price threshold check
+        kept: list[tuple[QueryIdandFeedDetails, Optional[float]]] = []
+        for feed in feeds:
             # check if your timestamp will be first in window for
             # this feed if not discard feed_details
             # lesser node calls to make
@@ -200,42 +228,47 @@ class FundedFeedFilter:
                 timestamp_to_check=now_timestamp,
             )
 
-            balance = feed.params.balance
-            price_threshold = feed.params.priceThreshold
-
             if in_eligible_window:
-                sloped_reward = feed.params.rewardIncreasePerSecond * time_diff
-                feed.params.reward += sloped_reward
-                if balance < feed.params.reward:
-                    feeds.remove(feed)
+                feed.params.reward += feed.params.rewardIncreasePerSecond * time_diff
+                if feed.params.balance >= feed.params.reward:
+                    kept.append((feed, None))
                 continue
-            elif price_threshold == 0 and not in_eligible_window:
-                # if now_timestamp is not in eligible window, discard funded feed
-                # remove feedId from feedId to queryId mapping
-                # discard funded feed
-                feeds.remove(feed)
+
+            # if now_timestamp is not in eligible window, discard funded feed
+            # unless its price threshold is met
+            if feed.params.priceThreshold == 0:
                 continue
 
-            if price_threshold != 0 and not in_eligible_window:
-                try:
-                    value_before = int(feed.current_queryid_value.hex(), 16) / 10**18
-                except ValueError:
-                    _ = error_status("Error decoding current query id value")
-                    continue
-                price_change = await self.price_change(
-                    query_id=feed.query_id,
-                    value_before=value_before,
-                )
-                if price_change is None:
-                    # unable to fetch price data
-                    continue
-                if price_change < price_threshold:
-                    feeds.remove(feed)
+            value_before = _decode_value(feed.current_queryid_value)
+            if value_before is None:
+                _ = error_status("Error decoding current query id value")
+            kept.append((feed, value_before))
+
+        # fetch the price of every query id pending a threshold check at once
+        pending_query_ids = {feed.query_id for feed, value_before in kept if value_before is not None}
+        await asyncio.gather(*(self.fetch_price(query_id) for query_id in pending_query_ids))
+
+        eligible = []
+        for feed, value_before in kept:
+            if value_before is not None:
+                price_change = await self.price_change(query_id=feed.query_id, value_before=value_before)
+                # keep the feed if unable to fetch price data
+                if price_change is not None and price_change < feed.params.priceThreshold:
                     continue
+            eligible.append(feed)
 
+        feeds[:] = eligible
         return feeds
 
 
+def _decode_value(value: bytes) -> Optional[float]:
+    """Decode a reported 18 decimals value, or return None if it isn't a number"""
+    try:
+        return int(value.hex(), 16) / 10**18
+    except ValueError:
+        return None
+
+
 def _get_price_change(previous_val: float, current_val: float) -> int:
     """Get percentage change
 
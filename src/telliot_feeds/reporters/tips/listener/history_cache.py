@@ -0,0 +1,109 @@
+"""Cache of autopay reports by query id, kept between reporting loops
+
+Instead of fetching a month of values for every funded query id each loop, only
+reports newer than the last seen timestamp are fetched and reports older than
+the window are evicted. Timestamps whose reward was already claimed are
+remembered per feed id, so their claim status is never checked again.
+"""
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
+
+from telliot_core.fetch.fetchflex.autopay import FetchFlexAutopayContract
+
+from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class QueryIdHistory:
+    """
+    Cached reports of a query id
+    - values: reports within the window, oldest first
+    - latest: latest report, kept even after it leaves the window
+    - claimed: timestamps with a claimed reward, by feed id
+    """
+
+    values: list[Values] = field(default_factory=list)
+    latest: Optional[Values] = None
+    claimed: dict[bytes, set[int]] = field(default_factory=dict)
+
+
+class AutopayHistoryCache:
+    """Reports and claimed reward timestamps of every query id of an autopay contract"""
+
+    def __init__(self) -> None:
+        self.histories: dict[bytes, QueryIdHistory] = {}
+
+    def fetch_start(self, query_id: bytes, window_start: int) -> int:
+        """Timestamp after which reports of a query id still need to be fetched"""
+        history = self.histories.get(query_id)
+        if history is None or history.latest is None:
+            return window_start
+        return max(window_start, history.latest.timestamp)
+
+    def update(self, query_id: bytes, values: list[bytes], timestamps: list[int], window_start: int) -> QueryIdHistory:
+        """Append newly fetched reports of a query id and evict the ones older than `window_start`
+
+        Args:
+        - query_id
+        - values: reported values, oldest first
+        - timestamps: timestamps of the reported values
+        - window_start: timestamp before which reports are evicted
+
+        Return: the query id history
+        """
+        history = self.histories.setdefault(query_id, QueryIdHistory())
+        last_timestamp = history.latest.timestamp if history.latest is not None else 0
+        new_values = [
+            Values(value, timestamp) for value, timestamp in zip(values, timestamps) if timestamp > last_timestamp
+        ]
+        history.values.extend(new_values)
+        if new_values:
+            history.latest = new_values[-1]
+
+        evicted = 0
+        while evicted < len(history.values) and history.values[evicted].timestamp <= window_start:
+            evicted += 1
+        del history.values[:evicted]
+        for feed_id in history.claimed:
+            history.claimed[feed_id] = {t for t in history.claimed[feed_id] if t > window_start}
+
+        logger.debug(f"0x{query_id.hex()}: {len(new_values)} new reports, {evicted} evicted")
+        return history
+
+    def unchecked_timestamps(self, feed_id: bytes, query_id: bytes, timestamps: list[int]) -> list[int]:
+        """Timestamps not yet known to have their reward claimed for a feed"""
+        history = self.histories.get(query_id)
+        claimed = history.claimed.get(feed_id, set()) if history is not None else set()
+        return [timestamp for timestamp in timestamps if timestamp not in claimed]
+
+    def record_claimed_status(self, feed_id: bytes, query_id: bytes, timestamps: list[int], status: list[bool]) -> int:
+        """Remember the claimed timestamps of a feed
+
+        Args:
+        - feed_id
+        - query_id
+        - timestamps: checked timestamps
+        - status: getRewardClaimStatusList response for the timestamps
+
+        Return: count of unclaimed timestamps
+        """
+        history = self.histories.setdefault(query_id, QueryIdHistory())
+        claimed = history.claimed.setdefault(feed_id, set())
+        claimed.update(timestamp for timestamp, is_claimed in zip(timestamps, status) if is_claimed)
+        return len(timestamps) - sum(1 for is_claimed in status if is_claimed)
+
+
+_caches: dict[tuple[Optional[int], str], AutopayHistoryCache] = {}
+
+
+def get_history_cache(autopay: FetchFlexAutopayContract) -> AutopayHistoryCache:
+    """History cache shared by all reporting loops of an autopay contract"""
+    key = (autopay.node.chain_id, autopay.address)
+    if key not in _caches:
+        _caches[key] = AutopayHistoryCache()
+    return _caches[key]
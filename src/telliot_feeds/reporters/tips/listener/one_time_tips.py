@@ -4,23 +4,33 @@ from typing import Optional
 
 from telliot_core.fetch.fetchflex.autopay import FetchFlexAutopayContract
 
+from telliot_feeds.reporters.tips.listener.autopay_mirror import AutopayMirror
 from telliot_feeds.utils.log import get_logger
 
 logger = get_logger(__name__)
 
 
 async def get_funded_one_time_tips(
-    autopay: FetchFlexAutopayContract, listener_filter: Callable[[bytes], bool]
+    autopay: FetchFlexAutopayContract,
+    listener_filter: Callable[[bytes], bool],
+    mirror: Optional[AutopayMirror] = None,
 ) -> Optional[dict[bytes, int]]:
     """Trigger autopay call and filter response data
 
+    If a synced autopay mirror is given, the tips are read from it instead.
+
     Return: list of tuples of only query data and tips
     that exist in telliot registry
     """
     onetime_tips: Optional[list[tuple[bytes, int]]]
-    onetime_tips, status = await autopay.read("getFundedSingleTipsInfo")
-
-    if not status.ok or not onetime_tips:
+    if mirror is not None:
+        onetime_tips = mirror.funded_single_tips()
+    else:
+        onetime_tips, status = await autopay.read("getFundedSingleTipsInfo")
+        if not status.ok:
+            onetime_tips = None
+
+    if not onetime_tips:
         logger.info("No one time tip funded queries available")
         return None
 
@@ -48,6 +48,25 @@ class CallFunctions(AssembleCall):
             param3=timestamps,
         )
 
+    def get_current_tip(self, query_id: bytes, handler_function: Optional[Callable[..., Any]] = None) -> Call:
+        """getCurrentTip autopay Call object for a query id's one time tip
+
+        Args:
+        - query_id
+        - handler_function: function to interpret contract reponse (optional)
+
+        Return: Call object
+        example return from this call:
+        >>> {('current_tip', b'query_id'): tip_amount}
+        """
+        return self.assemble_call_object(
+            func_sig="getCurrentTip(bytes32)(uint256)",
+            returns=[
+                [("current_tip", query_id), handler_function],
+            ],
+            query_id=query_id,
+        )
+
     def get_current_feeds(self, query_id: bytes, handler_function: Optional[Callable[..., Any]] = None) -> Call:
         """getCurrentFeeds autopay Call object for a query id
 
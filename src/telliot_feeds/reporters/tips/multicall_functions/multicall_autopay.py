@@ -6,8 +6,13 @@ from telliot_core.utils.response import ResponseStatus
 from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
 from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
 from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.reporters.tips.listener.history_cache import AutopayHistoryCache
 from telliot_feeds.reporters.tips.listener.utils import handler_func
 from telliot_feeds.reporters.tips.multicall_functions.call_functions import CallFunctions
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
 
 
 class MulticallAutopay(CallFunctions):
@@ -66,6 +71,64 @@ class MulticallAutopay(CallFunctions):
 
         return feeds, status
 
+    async def new_timestamps_and_values(
+        self,
+        feeds: list[QueryIdandFeedDetails],
+        now_timestamp: int,
+        window_start: int,
+        history: AutopayHistoryCache,
+        max_count: int = 40_000,
+    ) -> tuple[Optional[list[QueryIdandFeedDetails]], ResponseStatus]:
+        """Incremental month_of_timestamps_and_values: only fetch reports newer than the
+        cached ones for every query id
+
+        Args:
+        - now_timestamp: current time in unix timestamps
+        - window_start: now_timestamp - 2_592_000, older reports are evicted from the cache
+        - history: cache of previously fetched reports
+
+        Return: a list of QueryIdandFeedDetails
+        """
+        unique_ids = {feed.query_id for feed in feeds}
+
+        calls = [
+            self.get_multiple_values_before(
+                query_id=qid,
+                now_timestamp=now_timestamp,
+                max_age=now_timestamp - history.fetch_start(qid, window_start),
+                max_count=max_count,
+            )
+            for qid in unique_ids
+        ]
+        if not len(calls):
+            return None, error_status("Unable to assemble getMultipleValues Call object")
+
+        multiple_values_response, status = await self.multi_call(calls)
+
+        if not status.ok:
+            return None, status
+
+        if not multiple_values_response:
+            return None, error_status("No response returned from getMultipleValuesBefore batch multicall")
+
+        for qid in unique_ids:
+            values = multiple_values_response.get(("values_array", qid))
+            timestamps = multiple_values_response.get(("timestamps_array", qid))
+            # short circuit since None means failed response and can't calculate tip accurately
+            if values is None or timestamps is None:
+                note = f"getMultipleValuesBefore call failed for 0x{qid.hex()}"
+                return None, error_status(note)
+            history.update(qid, values, timestamps, window_start)
+
+        for feed in feeds:
+            queryid_history = history.histories[feed.query_id]
+            feed.current_value_timestamp = queryid_history.latest.timestamp if queryid_history.latest else 0
+            feed.current_queryid_value = queryid_history.latest.value if queryid_history.latest else b""
+            # copied since the list is filtered per feed
+            feed.queryid_timestamps_values_list = list(queryid_history.values)
+
+        return feeds, status
+
     async def rewards_claimed_status_call(
         self, feeds: list[QueryIdandFeedDetails]
     ) -> tuple[Optional[dict[tuple[bytes, bytes], int]], ResponseStatus]:
@@ -95,6 +158,48 @@ class MulticallAutopay(CallFunctions):
 
         return reward_claimed_status_resp, status
 
+    async def unclaimed_count_call(
+        self, feeds: list[QueryIdandFeedDetails], history: AutopayHistoryCache
+    ) -> tuple[Optional[dict[tuple[bytes, bytes], int]], ResponseStatus]:
+        """Batch call getRewardClaimStatusList, skipping timestamps already known to be claimed
+
+        Args:
+        - feeds: list QueryIdandFeedDetails
+        - history: cache the claimed timestamps are remembered in
+
+        Return: dict with count of unclaimed timestamps
+        """
+        checked = {}
+        calls = []
+        for feed in feeds:
+            if feed.queryid_timestamps_values_list:
+                timestamps_lis = history.unchecked_timestamps(
+                    feed.feed_id, feed.query_id, [values.timestamp for values in feed.queryid_timestamps_values_list]
+                )
+                if timestamps_lis:
+                    checked[(feed.feed_id, feed.query_id)] = timestamps_lis
+                    calls.append(self.get_reward_claimed_status(feed.feed_id, feed.query_id, timestamps_lis))
+
+        if not len(calls):
+            # every reported timestamp is known to be claimed
+            return {}, ResponseStatus()
+
+        reward_claimed_status_resp, status = await self.multi_call(calls, success=True)
+
+        if not status.ok:
+            return None, status
+
+        if not reward_claimed_status_resp:
+            return None, error_status("No response returned from getRewardClaimStatusList batch multicall")
+
+        unclaimed_count = {
+            (feed_id, query_id): history.record_claimed_status(
+                feed_id, query_id, timestamps_lis, reward_claimed_status_resp[(feed_id, query_id)]
+            )
+            for (feed_id, query_id), timestamps_lis in checked.items()
+        }
+        return unclaimed_count, status
+
     async def currentfeeds_multiple_values_before(
         self, query_id: bytes, month_old_timestamp: int, now_timestamp: int
     ) -> tuple[Optional[list[QueryIdandFeedDetails]], ResponseStatus]:
@@ -161,6 +266,65 @@ class MulticallAutopay(CallFunctions):
 
         return feeds, status
 
+    async def current_tips_and_feeds(
+        self, query_ids: list[bytes], month_old_timestamp: int, now_timestamp: int
+    ) -> tuple[Optional[tuple[dict[bytes, int], list[QueryIdandFeedDetails]]], ResponseStatus]:
+        """Batch call getCurrentTip, getCurrentFeeds and getMultipleValuesBefore for many query ids
+
+        Same as currentfeeds_multiple_values_before, plus the one time tip, for every query id
+        in a single batch. A query id whose values call failed is left without feeds.
+
+        Args:
+        - query_ids: list of query ids
+        - now_timestamp: current time in unix timestamps
+        - month_old_timestamp: now_timestamp - 2_592_000
+
+        Return: dict of one time tip by query id, and a list of QueryIdandFeedDetails
+        """
+        calls = []
+        for query_id in query_ids:
+            calls += [
+                self.get_current_tip(query_id=query_id),
+                self.get_current_feeds(query_id=query_id),
+                self.get_multiple_values_before(
+                    query_id=query_id, now_timestamp=now_timestamp, max_age=month_old_timestamp
+                ),
+            ]
+
+        resp, status = await self.multi_call(calls)
+
+        if not status.ok:
+            return None, status
+
+        if not resp:
+            msg = "Empty response from multicall getCurrentTip, getCurrentFeeds..."
+            return None, error_status(msg)
+
+        # autopay reverts getCurrentTip if there is no tip
+        tips = {query_id: resp.get(("current_tip", query_id)) or 0 for query_id in query_ids}
+
+        feeds = []
+        for query_id in query_ids:
+            values = resp.get(("values_array", query_id))
+            timestamps = resp.get(("timestamps_array", query_id))
+            # can't calculate tip accurately without the values
+            if values is None or timestamps is None:
+                logger.warning(f"getMultipleValuesBefore call failed for 0x{query_id.hex()}")
+                continue
+
+            for feed_id in resp.get(query_id) or ():
+                feeds.append(
+                    QueryIdandFeedDetails(
+                        feed_id=feed_id,
+                        query_id=query_id,
+                        current_queryid_value=values[-1] if values else b"",
+                        current_value_timestamp=timestamps[-1] if timestamps else 0,
+                        queryid_timestamps_values_list=list(map(Values, values[:-1], timestamps[:-1])),
+                    )
+                )
+
+        return (tips, feeds), status
+
     async def timestamp_datafeed(
         self, feeds: list[QueryIdandFeedDetails]
     ) -> tuple[Optional[list[QueryIdandFeedDetails]], ResponseStatus]:
@@ -6,6 +6,7 @@ from telliot_core.fetch.fetchflex.autopay import FetchFlexAutopayContract
 from telliot_core.utils.timestamp import TimeStamp
 
 from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.reporters.tips.listener.autopay_mirror import AutopayMirror
 from telliot_feeds.reporters.tips.listener.funded_feeds import FundedFeeds
 from telliot_feeds.reporters.tips.listener.one_time_tips import get_funded_one_time_tips
 from telliot_feeds.reporters.tips.listener.tip_listener_filter import TipListenerFilter
@@ -20,13 +21,16 @@ logger = get_logger(__name__)
 # suggest a feed here not a query tag, because build feed portion
 # or check both mappings for type
 async def get_feed_and_tip(
-    autopay: FetchFlexAutopayContract, current_timestamp: Optional[TimeStamp] = None
+    autopay: FetchFlexAutopayContract,
+    current_timestamp: Optional[TimeStamp] = None,
+    mirror: Optional[AutopayMirror] = None,
 ) -> Optional[Tuple[Optional[DataFeed[Any]], Optional[int]]]:
     """Fetch feeds with their tip and filter to get a feed suggestion with the max tip
 
     Args:
     - autopay contract object
     - current_timestamp
+    - mirror: autopay state indexed from event logs, used instead of view calls if it can be synced
 
     Returns:
     - tuple of feed and tip amount
@@ -35,15 +39,17 @@ async def get_feed_and_tip(
         current_timestamp = TimeStamp.now().ts
 
     multi_call = MulticallAutopay()
+    if mirror is not None and not await mirror.sync():
+        mirror = None
     listener_filter = TipListenerFilter()
 
     funded_feeds = FundedFeeds(
-        autopay=autopay, multi_call=multi_call, listener_filter=listener_filter.qtype_name_in_registry
+        autopay=autopay, multi_call=multi_call, listener_filter=listener_filter.qtype_name_in_registry, mirror=mirror
     )
 
     feed_tips = await funded_feeds.querydata_and_tip(current_time=current_timestamp)
     onetime_tips = await get_funded_one_time_tips(
-        autopay=autopay, listener_filter=listener_filter.qtype_name_in_registry
+        autopay=autopay, listener_filter=listener_filter.qtype_name_in_registry, mirror=mirror
     )
 
     if not feed_tips and not onetime_tips:
@@ -1,3 +1,4 @@
+from typing import Dict
 from typing import List
 from typing import Optional
 
@@ -23,56 +24,69 @@ async def fetch_feed_tip(
     - query_id
 
     Returns: tip amount"""
+    tips = await fetch_feed_tips(autopay, [query_id], timestamp)
+    return tips[query_id]
+
+
+async def fetch_feed_tips(
+    autopay: FetchFlexAutopayContract, query_ids: List[bytes], timestamp: Optional[TimeStamp] = None
+) -> Dict[bytes, int]:
+    """Fetch tip amounts for many query ids, sharing the multicall batches between them
+
+    Args:
+    - query_ids
+
+    Returns: tip amount by query id"""
     if timestamp is None:
         timestamp = TimeStamp.now().ts
     call.autopay = autopay
     month_old = int(timestamp - 2_592_000)
-    tip_amount: int = 0
+    query_ids = list(dict.fromkeys(query_ids))
+    tip_amounts: Dict[bytes, int] = {query_id: 0 for query_id in query_ids}
 
-    # get tip amount for one time tip if available
-    one_time_tip, status = await autopay.get_current_tip(query_id=query_id)
+    # make the first batch call of getCurrentTip, getCurrentFeeds, getMultipleValuesBefore
+    response, status = await call.current_tips_and_feeds(
+        query_ids=query_ids, now_timestamp=timestamp, month_old_timestamp=month_old
+    )
 
-    if status.ok:
-        tip_amount += one_time_tip
+    if not status.ok or not response:
+        return tip_amounts
 
-    # make the first batch call of getCurrentFeeds, getDataBefore, getTimestampbyQueryIdandIndex
-    results, status = await call.currentfeeds_multiple_values_before(
-        query_id=query_id, now_timestamp=timestamp, month_old_timestamp=month_old
-    )
+    # get tip amount for one time tips if available
+    one_time_tips, results = response
+    for query_id, one_time_tip in one_time_tips.items():
+        tip_amounts[query_id] += one_time_tip
 
-    if not status.ok or not results:
-        return tip_amount
+    if not results:
+        return tip_amounts
 
     # get query id timestamps list and feed ids datafeed
     timestamps_list_and_datafeed, status = await call.timestamp_datafeed(results)
 
     if not status.ok or not timestamps_list_and_datafeed:
-        return tip_amount
+        return tip_amounts
 
     # filter out uneligible feeds
     eligible_feeds = await filtr.window_and_priceThreshold_unmet_filter(timestamps_list_and_datafeed, timestamp)
 
     if not eligible_feeds:
         logger.info("All feeds filtered out current timestamp not eligible for feed tip")
-        return tip_amount
+        return tip_amounts
 
     # filter out query id timestamps not eligible for tip
     feeds_with_timestamps_filtered = filtr.filter_historical_submissions(eligible_feeds)
 
     unclaimed_count, status = await call.rewards_claimed_status_call(feeds_with_timestamps_filtered)
 
-    if not unclaimed_count:
-        tip_amount += tip_sum(feeds_with_timestamps_filtered)
-        return tip_amount
-
-    feeds_with_tips = filtr.calculate_true_feed_balance(feeds_with_timestamps_filtered, unclaimed_count)
-
-    if not feeds_with_tips:
-        return tip_amount
+    if unclaimed_count:
+        feeds_with_tips = filtr.calculate_true_feed_balance(feeds_with_timestamps_filtered, unclaimed_count)
+    else:
+        feeds_with_tips = feeds_with_timestamps_filtered
 
-    tip_amount += tip_sum(feeds_with_tips)
+    for feed in feeds_with_tips:
+        tip_amounts[feed.query_id] += tip_sum([feed])
 
-    return tip_amount
+    return tip_amounts
 
 
 def tip_sum(feeds: List[QueryIdandFeedDetails]) -> int:
@@ -5,8 +5,6 @@ from typing import Optional
 from typing import Tuple
 from urllib.parse import urlencode
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
@@ -36,33 +34,6 @@ class CryptowatchHistoricalPriceService(WebPriceService):
         self.ts = ts
         self.timeout = timeout
 
-    def get_url(self, url: str = "") -> dict[str, Any]:
-        """Helper function to get URL JSON response while handling exceptions
-
-        Args:
-            url: URL to fetch
-
-        Returns:
-            A dictionary with the following (optional) keys:
-                json (dict or list): Result, if no error occurred
-                error (str): A description of the error, if one occurred
-                exception (Exception): The exception, if one occurred
-        """
-
-        request_url = self.url + url
-
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
-
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
-
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
-
     async def get_candles(
         self,
         asset: str,
@@ -100,7 +71,7 @@ class CryptowatchHistoricalPriceService(WebPriceService):
 
         request_url = f"markets/coinbase-pro/{pair}/ohlc?{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url_async(request_url)
         candles = None
 
         if "error" in d:
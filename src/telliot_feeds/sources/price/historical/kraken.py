@@ -5,8 +5,6 @@ from typing import Optional
 from typing import Tuple
 from urllib.parse import urlencode
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
@@ -39,33 +37,6 @@ class KrakenHistoricalPriceService(WebPriceService):
         self.ts = ts
         self.timeout = timeout
 
-    def get_url(self, url: str = "") -> dict[str, Any]:
-        """Helper function to get URL JSON response while handling exceptions
-
-        Args:
-            url: URL to fetch
-
-        Returns:
-            A dictionary with the following (optional) keys:
-                json (dict or list): Result, if no error occurred
-                error (str): A description of the error, if one occurred
-                exception (Exception): The exception, if one occurred
-        """
-
-        request_url = self.url + url
-
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
-
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
-
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
-
     def get_request_url(self, asset: str, currency: str, period_start: int) -> str:
         """Assemble Kraken historical trades request url."""
         asset = asset.upper()
@@ -163,7 +134,7 @@ class KrakenHistoricalPriceService(WebPriceService):
 
         req_url = self.get_request_url(asset, currency, period_start)
 
-        d = self.get_url(req_url)
+        d = await self.get_url_async(req_url)
 
         if "error" in d:
             logger.error(d)
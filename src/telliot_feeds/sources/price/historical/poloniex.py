@@ -5,11 +5,10 @@ from typing import Optional
 from typing import Tuple
 from urllib.parse import urlencode
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.http_client import get_json
 from telliot_feeds.utils.log import get_logger
 
 
@@ -36,33 +35,6 @@ class PoloniexHistoricalPriceService:
         self.ts = ts
         self.timeout = timeout
 
-    def get_url(self, url: str = "") -> dict[str, Any]:
-        """Helper function to get URL JSON response while handling exceptions
-
-        Args:
-            url: URL to fetch
-
-        Returns:
-            A dictionary with the following (optional) keys:
-                json (dict or list): Result, if no error occurred
-                error (str): A description of the error, if one occurred
-                exception (Exception): The exception, if one occurred
-        """
-
-        request_url = self.url + url
-
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
-
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
-
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
-
     async def get_trades(
         self,
         asset: str,
@@ -93,7 +65,7 @@ class PoloniexHistoricalPriceService:
         # Source: https://docs.poloniex.com/#returntradehistory-public
         request_url = f"public?command=returnTradeHistory&{url_params}"
 
-        d = self.get_url(request_url)
+        d = await get_json(self.url + request_url, timeout=self.timeout)
         trades = []
 
         if "error" in str(d):
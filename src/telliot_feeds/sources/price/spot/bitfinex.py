@@ -40,7 +40,7 @@ class BitfinexSpotPriceService(WebPriceService):
 
         request_url = f"/v2/ticker/t{asset}{currency}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url_async(request_url)
 
         if "error" in d:
             logger.error(d)
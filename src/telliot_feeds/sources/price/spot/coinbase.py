@@ -36,7 +36,7 @@ class CoinbaseSpotPriceService(WebPriceService):
 
         request_url = "/products/{}-{}/ticker".format(asset.lower(), currency.lower())
 
-        d = self.get_url(request_url)
+        d = await self.get_url_async(request_url)
         if "error" in d:
             logger.error(d)
             return None, None
@@ -85,7 +85,7 @@ class CoinGeckoSpotPriceService(WebPriceService):
         url_params = urlencode({"ids": coin_id, "vs_currencies": currency})
         request_url = "/simple/price?{}".format(url_params)
 
-        d = self.get_url(request_url)
+        d = await self.get_url_async(request_url)
 
         if "error" in d:
             if "api.coingecko.com used Cloudflare to restrict access" in str(d["exception"]):
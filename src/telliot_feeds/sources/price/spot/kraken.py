@@ -44,7 +44,7 @@ class KrakenSpotPriceService(WebPriceService):
 
         request_url = f"/0/public/Ticker?{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url_async(request_url)
 
         if "error" in d:
             logger.error(d)
@@ -42,7 +42,7 @@ class PancakeswapPriceService(WebPriceService):
 
         request_url = f"/api/v2/tokens/{token_addr}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url_async(request_url)
 
         if "error" in d:
             logger.error(d)
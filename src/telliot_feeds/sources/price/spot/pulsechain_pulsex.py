@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Tuple
 
 from dotenv import load_dotenv
 
@@ -8,12 +9,13 @@ from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.http_client import get_json
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.feeds.managed_feeds.ManagedFeeds import managed_feeds
 
 from web3 import Web3
+import asyncio
 import os
-import requests
 import math
 from decimal import Decimal
 
@@ -86,6 +88,35 @@ def get_amount_out(amount_in, reserve_in, reserve_out):
     denominator = reserve_in*1000 + amount_in_with_fee
     return float(numerator/denominator)
 
+def get_price_and_tvl(currency: str, reserve0: int, reserve1: int) -> Tuple[Decimal, float]:
+    """
+    Given the reserves of a PLS LP, returns the PLS price in the LP currency
+    and the total value locked of the pool.
+
+    :param currency: LP currency (a key of PLS_CURRENCY_SOURCES).
+    :param reserve0: Reserve of token0 in the pair contract.
+    :param reserve1: Reserve of token1 in the pair contract.
+    :return: PLS price and total value locked of the pool.
+    """
+    token0, _ = pls_lps_order[currency].split('/')
+    if "pls" not in token0.strip():
+        reserve0, reserve1 = reserve1, reserve0
+
+    val = get_amount_out(1e18, reserve0, reserve1)
+
+    if currency == 'usdc' or currency == 'usdt':
+        reserve1 = reserve1 * 1e12
+
+    vl0 = ((1e18 * reserve1) / (reserve0 + 1e18)) * reserve0 #value locked token0 without fees
+    vl1 = ((1e18 * reserve0) / (reserve1 + 1e18)) * reserve1 #value locked token0 without fees
+    tvl = vl0 + vl1 #total value locked of the pool
+
+    price = Web3.fromWei(val, 'ether')
+    if currency == 'usdc' or currency == 'usdt':
+        price = price * Decimal(1e12) #scale usdc
+
+    return price, tvl
+
 class PulsechainPulseXService(WebPriceService):
     """Pulsechain PulseX Price Service for PLS/USD feed"""
 
@@ -101,11 +132,13 @@ class PulsechainPulseXService(WebPriceService):
         token0, token1 = pls_lps_order[currency].split('/')
         return token0.strip().upper(), token1.strip().upper()
     
-    def _debug_lp_price(self, token0: str, token1: str, contract_addr: str, price: Decimal):
+    async def _debug_lp_price(self, token0: str, token1: str, contract_addr: str, price: Decimal):
         price_service_base_url = os.getenv("PRICE_SERVICE_BASE_URL", "http://127.0.0.1:3333")
         request_url = f"{price_service_base_url}/dexscreener/{token0}/{token1}/{contract_addr}"
-        r = requests.get(request_url)
-        data = r.json()
+        d = await get_json(request_url, timeout=self.timeout)
+        if "error" in d:
+            raise Exception(f"{d['error']}: {d['exception']}")
+        data = d["response"]
         
         pair = data['pair']
         priceUsd = Decimal(data['price'])
@@ -159,19 +192,19 @@ class PulsechainPulseXService(WebPriceService):
                 {bcolors.endc}
             """)
     
-    def _is_price_valid(self, currency: str, telliot_price: Decimal):
+    async def _is_price_valid(self, currency: str, telliot_price: Decimal):
         token0, token1 = self._get_token_names(currency)
         price_service_base_url = os.getenv("PRICE_SERVICE_BASE_URL", "http://127.0.0.1:3333")
         contract_addr = addrs[currency]
 
         request_url = f"{price_service_base_url}/dexscreener/{token0}/{token1}/{contract_addr}"
-        r = requests.get(request_url)
+        d = await get_json(request_url, timeout=self.timeout)
 
-        if not r.ok:
-            logger.error(f"Error fetching data from {request_url}: {r.text}. Returning price as valid")
+        if "error" in d:
+            logger.error(f"Error fetching data from {request_url}: {d['error']}. Returning price as valid")
             return True
 
-        data = r.json()
+        data = d["response"]
         price = Decimal(data['price'])
 
         price_validation_method = os.getenv("PRICE_VALIDATION_METHOD", "percentage_change")
@@ -231,10 +264,8 @@ class PulsechainPulseXService(WebPriceService):
         w3 = Web3(Web3.HTTPProvider(self.url, request_kwargs={'timeout': self.timeout}))
         try:
             contract = w3.eth.contract(address=contract_addr, abi=getReservesAbi)
-            [reserve0, reserve1, timestamp] = contract.functions.getReserves().call()
-            token0, _ = pls_lps_order[currency].split('/')
-            if "pls" not in token0.strip():
-                reserve0, reserve1 = reserve1, reserve0
+            # run the blocking RPC call off the event loop so sibling sources keep going
+            [reserve0, reserve1, timestamp] = await asyncio.to_thread(contract.functions.getReserves().call)
 
             logger.info(f"""
                 Debugging reservers for {asset}-{currency}:
@@ -242,24 +273,13 @@ class PulsechainPulseXService(WebPriceService):
                 reserve1: {reserve1}
             """)
 
-            val = get_amount_out(1e18, reserve0, reserve1)
-
-            if currency == 'usdc' or currency == 'usdt':
-                reserve1 = reserve1 * 1e12
-
-            vl0 = ((1e18 * reserve1) / (reserve0 + 1e18)) * reserve0 #value locked token0 without fees
-            vl1 = ((1e18 * reserve0) / (reserve1 + 1e18)) * reserve1 #value locked token0 without fees
-            tvl = vl0 + vl1 #total value locked of the pool
+            price, tvl = get_price_and_tvl(currency, reserve0, reserve1)
 
         except Exception as e:
             logger.warning(f"No prices retrieved from Pulsechain Sec Oracle with Exception {e}")
             return None, None
 
         try:
-            price = w3.fromWei(val, 'ether')
-            if currency == 'usdc' or currency == 'usdt':
-                price = price * Decimal(1e12) #scale usdc 
-
             logger.info(f"""
                 LP price for {asset}-{currency}: {price}
                 LP contract address: {contract_addr}
@@ -267,7 +287,7 @@ class PulsechainPulseXService(WebPriceService):
             
             if asset in managed_feeds.assets:
                 try:
-                    if not self._is_price_valid(currency, price):
+                    if not await self._is_price_valid(currency, price):
                         logger.warning(f"Price from dexscreener API is different from LP price")
                         return None, None
                 except Exception as e:
@@ -275,7 +295,7 @@ class PulsechainPulseXService(WebPriceService):
 
             if self.debugging_price:
                 try:
-                    self._debug_lp_price(asset, currency, addrs[currency], price)
+                    await self._debug_lp_price(asset, currency, addrs[currency], price)
                 except Exception as e:
                     logger.warning(f"Error debugging price: {e}")
             
@@ -3,8 +3,6 @@ from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-import requests
-
 from dotenv import load_dotenv
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
@@ -60,24 +58,12 @@ class PulsechainSupgraphService(WebPriceService):
             "operationName": None,
         }
 
-        request_url = self.url + "/subgraphs/name/liquidloans/liquidloans"
-
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
-
-            except requests.exceptions.ConnectTimeout:
-                logger.warning("Timeout Error, No prices retrieved from Pulsechain Supgraph")
-                return None, None
-
-            except Exception as e:
-                logger.warning(f"No prices retrieved from Pulsechain Supgraph with Exception {e}")
-                return None, None
+        data = await self.post_url_async(
+            "/subgraphs/name/liquidloans/liquidloans", json_data=json_data, headers=headers
+        )
 
         if "error" in data:
-            logger.error(data)
+            logger.warning(f"No prices retrieved from Pulsechain Supgraph: {data['error']} {data['exception']}")
             return None, None
 
         elif "response" in data:
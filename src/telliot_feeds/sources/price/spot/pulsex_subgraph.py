@@ -4,8 +4,6 @@ from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
@@ -61,24 +59,10 @@ class PulseXSupgraphService(WebPriceService):
             "operationName": None,
         }
 
-        request_url = self.url + "/subgraphs/name/pulsechain/pulsex"
-
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
-
-            except requests.exceptions.ConnectTimeout:
-                logger.warning("Timeout Error, No prices retrieved from PulseX Supgraph")
-                return None, None
-
-            except Exception as e:
-                logger.warning(f"No prices retrieved from PulseX Supgraph with Exception {e}")
-                return None, None
+        data = await self.post_url_async("/subgraphs/name/pulsechain/pulsex", json_data=json_data, headers=headers)
 
         if "error" in data:
-            logger.error(data)
+            logger.warning(f"No prices retrieved from PulseX Supgraph: {data['error']} {data['exception']}")
             return None, None
 
         elif "response" in data:
@@ -9,8 +9,6 @@ from typing import Any
 from eth_utils.conversions import to_bytes
 from eth_abi import decode_abi
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
@@ -43,7 +41,7 @@ class TWAPSpotPriceService(WebPriceService):
         now = datetime.now()
         return int(now.timestamp())
     
-    def _get_last_reports_gte_timestamp(self, timestamp: int) -> list[dict]:
+    async def _get_last_reports_gte_timestamp(self, timestamp: int) -> list[dict]:
         query_body = f"""
             query newReportEntities {{
                 newReportEntities(where: {{_time_gte: {timestamp} }}) {{
@@ -58,22 +56,22 @@ class TWAPSpotPriceService(WebPriceService):
                 }}
             }}
         """
-        response = requests.post(url=self.url, json={"query": query_body})
+        data = await self.post_url_async(json_data={"query": query_body})
 
-        if response.status_code != 200 or response.json().get('errors'):
+        if "error" in data or data["response"].get('errors'):
             err_msg = f"""
-            Failed to query subgraph {self.url}, status code: {response.status_code}
+            Failed to query subgraph {self.url}
             Error:
-            {response.json()}
+            {data.get('exception', data.get('response'))}
             """
             logger.error(err_msg)
             raise Exception(err_msg)
-        
-        return response.json()['data']['newReportEntities']
-    
-    def _get_TWAP_from_reports(self) -> dict[str, float]:
+
+        return data["response"]['data']['newReportEntities']
+
+    async def _get_TWAP_from_reports(self) -> dict[str, float]:
         timestamp = self._get_current_timestamp() - self.timespan
-        reports = self._get_last_reports_gte_timestamp(timestamp)
+        reports = await self._get_last_reports_gte_timestamp(timestamp)
         for report in reports:
             asset, currency = self._decode_query_data(self._bytes_from_string(string=report['_queryData']))
             decoded_value, = decode_abi(['uint256',], self._bytes_from_string(report['_value']))
@@ -97,7 +95,7 @@ class TWAPSpotPriceService(WebPriceService):
         currency = currency.lower()
 
         try:
-            twap_from_reports = self._get_TWAP_from_reports()
+            twap_from_reports = await self._get_TWAP_from_reports()
             price = twap_from_reports[f'{asset}-{currency}']
             logger.info(f"""
             TWAP price found for {asset}-{currency} in the last {self.timespan} seconds: {price}
@@ -1,4 +1,5 @@
 import os
+import time
 from decimal import *
 from pathlib import Path
 import asyncio
@@ -6,6 +7,7 @@ import asyncio
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Optional
 from web3 import Web3
 from multicall import Call
 from multicall import Multicall
@@ -18,6 +20,8 @@ from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.utils.cumulative_prices_store import CumulativePricesPoint
+from telliot_feeds.utils.cumulative_prices_store import CumulativePricesStore
 from telliot_feeds.utils.log import get_logger
 
 
@@ -74,82 +78,128 @@ class TWAPLPSpotPriceService(WebPriceService):
         'wpls/dai'
     ]
 
+    #: Web3 instances by RPC url, shared by the services of every pair
+    _w3s: dict[str, Web3] = {}
+
+    #: Latest snapshot of all pairs (and when it was taken), shared by the services of every pair
+    _snapshot: Optional[dict[str, Any]] = None
+    _snapshot_time: float = 0.0
+    _snapshot_task: Optional[asyncio.Task] = None
+
+    #: Cumulative prices stores by file path, shared by the services of every pair
+    _stores: dict[str, CumulativePricesStore] = {}
+
+    #: Background sampler of all pairs and initial history backfill
+    _sampler_task: Optional[asyncio.Task] = None
+    _backfill_task: Optional[asyncio.Task] = None
+
     def __init__(self, **kwargs: Any) -> None:
         kwargs["name"] = "TWAP LP Price Service"
         kwargs["url"] = os.getenv("LP_PULSE_NETWORK_URL", "https://rpc.pulsechain.com")
         kwargs["timeout"] = 10.0
 
-        self.prevPricesPath: Path = Path('./prevPricesCumulative.json') 
+        # legacy JSON store, only read to migrate its data points
+        self.prevPricesPath: Path = Path('./prevPricesCumulative.json')
+        self.prevPricesDir: Path = Path(os.getenv('PREV_PRICES_CUMULATIVE_DIR', './prevPricesCumulative'))
         self.max_retries = int(os.getenv('MAX_RETRIES', 5))
         self.TWAP_TIMESPAN = int(os.getenv('TWAP_TIMESPAN', 1800))
         self.FETCH_LP_INTERVAL = int(os.getenv('FETCH_LP_INTERVAL', 60))
 
         self.isSourceInitialized = False
 
-        self.isTwapServiceActive = False
-
         self.DATA_POINTS_LIMIT = int(os.getenv('DATA_POINTS_LIMIT', 10000))
+        self.SNAPSHOT_MAX_AGE = float(os.getenv('LP_SNAPSHOT_MAX_AGE', 2))
+        self.BACKFILL_POINTS = int(os.getenv('TWAP_BACKFILL_POINTS', 10))
 
         super().__init__(**kwargs)
 
+    @property
+    def w3(self) -> Web3:
+        """Persistent provider of the LP network"""
+        if self.url not in self._w3s:
+            self._w3s[self.url] = Web3(Web3.HTTPProvider(self.url, request_kwargs={'timeout': self.timeout}))
+        return self._w3s[self.url]
+
     async def handleInitializeSource(self, currency: str):
         if self.isSourceInitialized: return
         self.isSourceInitialized = True
         self.contract_addresses: dict[str, str] = self._get_contract_address()
         self.lps_order: dict[str, str] = self._get_lps_order()
-        logger.info(f"Reporter: initial startup waiting TWAP period ({self.TWAP_TIMESPAN} seconds)")
-        price0CumulativeLast, price1CumulativeLast, reserve0, reserve1, blockTimestampLast = await self._callPricesCumulativeLast(
-            self.contract_addresses[currency]
-        )
-        key = self._get_pair_json_key(currency)
-        self._update_cumulative_prices_json(
-            price0CumulativeLast,
-            price1CumulativeLast,
-            reserve0,
-            reserve1,
-            blockTimestampLast,
-            key
-        )
-        await self.handleActivateTwapService(currency)
-        await asyncio.sleep(self.TWAP_TIMESPAN)
-        logger.info(f"REPORTER: JSON {key} initialized")
-
-    async def handleActivateTwapService(self, currency: str):
-        if self.isTwapServiceActive: return
-        self.isTwapServiceActive = True
-        asyncio.create_task(self.initializeTwapService(currency))
+        # build the in-memory cumulative prices index of every pair up front
+        for lp_currency in self.lps_order:
+            self._get_store(self._get_pair_json_key(lp_currency))
+
+        cls = TWAPLPSpotPriceService
+        if cls._backfill_task is None or cls._backfill_task.get_loop() is not asyncio.get_running_loop():
+            cls._backfill_task = asyncio.ensure_future(self._backfill())
+        await asyncio.shield(cls._backfill_task)
+        await self.handleActivateTwapService()
+        logger.info(f"REPORTER: cumulative prices of {list(self.lps_order)} initialized")
+
+    async def handleActivateTwapService(self):
+        cls = TWAPLPSpotPriceService
+        if cls._sampler_task is not None and not cls._sampler_task.done(): return
+        cls._sampler_task = asyncio.create_task(self.initializeTwapService())
         await asyncio.sleep(0)
 
-    async def _update_cumulative_prices_json_after_time(self, wait_time: int, contract_address: str, key: str):
-        logger.info(f"TWAP Service: waiting {wait_time:.2f} seconds to update cumulative prices data")
-        await asyncio.sleep(wait_time)
-        price0CumulativeLast, price1CumulativeLast, reserve0, reserve1, blockTimestampLast = await self._callPricesCumulativeLast(
-            contract_address
-        )
-        self._update_cumulative_prices_json(
-            price0CumulativeLast,
-            price1CumulativeLast,
-            reserve0,
-            reserve1,
-            blockTimestampLast,
-            key
-        )
-        logger.info(f"TWAP Service: updated cumulative prices {key} data in {self.prevPricesPath.resolve()}")
+    def _record_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Append the observation of every pair in a snapshot to its store"""
+        for currency, pair in snapshot["pairs"].items():
+            self._update_cumulative_prices(*pair, self._get_pair_json_key(currency))
 
-    async def initializeTwapService(self, currency: str):
+    async def initializeTwapService(self):
         logger.info(
             f"""
-            TWAP Service: initializing TWAP service for {currency}
+            TWAP Service: initializing TWAP sampler for {list(self.contract_addresses)}
             TWAP fetch interval: {self.FETCH_LP_INTERVAL} seconds
             """
         )
 
-        key = self._get_pair_json_key(currency)
-        contract_address = self.contract_addresses[currency]
-
         while True:
-            await self._update_cumulative_prices_json_after_time(self.FETCH_LP_INTERVAL, contract_address, key)
-            await asyncio.sleep(0)
+            try:
+                self._record_snapshot(await self._take_snapshot())
+                logger.info(f"TWAP Service: updated cumulative prices data in {self.prevPricesDir.resolve()}")
+            except Exception as e:
+                logger.error(f"TWAP Service: error sampling LP pairs: {e}")
+            await asyncio.sleep(self.FETCH_LP_INTERVAL)
+
+    async def _backfill(self) -> None:
+        """Sample the pairs at past blocks so that every store has a point at least TWAP_TIMESPAN old
+
+        Requires historical `eth_call` support (an archive node); without it the
+        stores fill up from the background sampler instead.
+        """
+        try:
+            snapshot = await self._take_snapshot()
+            self._record_snapshot(snapshot)
+            now = snapshot["blockTimestamp"]
+            keys = [self._get_pair_json_key(currency) for currency in snapshot["pairs"]]
+            if all(self._get_store(key).find_before(now - self.TWAP_TIMESPAN) is not None for key in keys):
+                return
+
+            latest_block = snapshot["blockNumber"]
+            sample_block = await asyncio.to_thread(self.w3.eth.get_block, max(latest_block - 1000, 0))
+            block_time = (now - sample_block.timestamp % 2**32) / max(latest_block - sample_block.number, 1)
+            if block_time <= 0:
+                raise Exception(f"Unable to estimate block time ({block_time})")
+
+            # evenly spaced ages, the oldest one slightly past the TWAP window
+            oldest_age = self.TWAP_TIMESPAN + self.FETCH_LP_INTERVAL
+            ages = [oldest_age * (i + 1) / self.BACKFILL_POINTS for i in range(self.BACKFILL_POINTS)]
+            backfilled: dict[str, list[CumulativePricesPoint]] = {key: [] for key in keys}
+            for age in sorted(ages, reverse=True):
+                block_number = latest_block - int(age / block_time) - 1
+                past = await self.multicall_lps(block_id=block_number)
+                if past is None:
+                    raise Exception(f"No data returned for block {block_number}")
+                for currency, pair in past["pairs"].items():
+                    backfilled[self._get_pair_json_key(currency)].append(CumulativePricesPoint(*pair))
+
+            for key, points in backfilled.items():
+                self._get_store(key).merge(points)
+            logger.info(f"TWAP Service: backfilled {self.BACKFILL_POINTS} data points for {keys}")
+        except Exception as e:
+            logger.warning(f"TWAP Service: unable to backfill TWAP window from past blocks: {e}")
 
     def _get_contract_address(self) -> dict[str, str]:
         address_sources = os.getenv("PLS_ADDR_SOURCES")
@@ -184,34 +234,58 @@ class TWAPLPSpotPriceService(WebPriceService):
             lps_order[s] = order_list[i].lower()
         return lps_order
     
-    async def multicall_lp(self, contract_address, require_success: bool = False):
-        w3 = Web3(Web3.HTTPProvider(self.url, request_kwargs={'timeout': self.timeout}))
+    async def multicall_lps(self, block_id: Optional[int] = None, require_success: bool = False) -> Optional[dict[str, Any]]:
+        """Fetch the cumulative prices and reserves of every pair in a single multicall
+
+        All values, including the block number and timestamp, come from the
+        same block (`block_id`, or the latest one).
+
+        Returns:
+            Dictionary with the block number, block timestamp and, by currency,
+            (price0CumulativeLast, price1CumulativeLast, reserve0, reserve1, blockTimestampLast)
+        """
+        mc = Multicall(calls=[], _w3=self.w3, block_id=block_id, require_success=require_success)
         calls = [
-            Call(
-                contract_address,
-                ["price0CumulativeLast()(uint256)"],
-                [["price0CumulativeLast", None]]
-            ),
-            Call(
-                contract_address,
-                ["price1CumulativeLast()(uint256)"],
-                [["price1CumulativeLast", None]]
-            ),
-            Call(
-                contract_address,
-                ["getReserves()((uint112,uint112,uint32))"],
-                [["getReserves", None]]
-            )
+            Call(mc.multicall_address, ["getBlockNumber()(uint256)"], [["blockNumber", None]]),
+            Call(mc.multicall_address, ["getCurrentBlockTimestamp()(uint256)"], [["blockTimestamp", None]]),
         ]
-
-        mc = Multicall(calls=calls, _w3=w3, require_success=require_success)
+        for contract_address in self.contract_addresses.values():
+            calls += [
+                Call(
+                    contract_address,
+                    ["price0CumulativeLast()(uint256)"],
+                    [[f"{contract_address}.price0CumulativeLast", None]]
+                ),
+                Call(
+                    contract_address,
+                    ["price1CumulativeLast()(uint256)"],
+                    [[f"{contract_address}.price1CumulativeLast", None]]
+                ),
+                Call(
+                    contract_address,
+                    ["getReserves()((uint112,uint112,uint32))"],
+                    [[f"{contract_address}.getReserves", None]]
+                )
+            ]
+        mc.calls = calls
 
         try:
             data = await mc.coroutine()
-            price0CumulativeLast = data['price0CumulativeLast']
-            price1CumulativeLast = data['price1CumulativeLast']
-            reserve0, reserve1, blockTimestampLast = data['getReserves']
-            return price0CumulativeLast, price1CumulativeLast, reserve0, reserve1, blockTimestampLast
+            pairs = {}
+            for currency, contract_address in self.contract_addresses.items():
+                reserve0, reserve1, blockTimestampLast = data[f"{contract_address}.getReserves"]
+                pairs[currency] = (
+                    data[f"{contract_address}.price0CumulativeLast"],
+                    data[f"{contract_address}.price1CumulativeLast"],
+                    reserve0,
+                    reserve1,
+                    blockTimestampLast
+                )
+            return {
+                "blockNumber": data["blockNumber"],
+                "blockTimestamp": data["blockTimestamp"] % 2**32,
+                "pairs": pairs,
+            }
         except ContractLogicError as e:
             msg = f"Contract reversion in multicall request, ContractLogicError: {e}"
             print(msg)
@@ -225,31 +299,49 @@ class TWAPLPSpotPriceService(WebPriceService):
                 msg = f"Error in multicall request, ValueError: {e}"
                 return None
 
-    async def _callPricesCumulativeLast(self, contract_address: str) -> tuple[int]:
+    async def _get_snapshot(self) -> dict[str, Any]:
+        """Latest snapshot of all pairs, shared by concurrent callers and reused for SNAPSHOT_MAX_AGE seconds"""
+        cls = TWAPLPSpotPriceService
+        if cls._snapshot_task is not None and not cls._snapshot_task.done():
+            return await asyncio.shield(cls._snapshot_task)
+        if cls._snapshot is not None and time.time() - cls._snapshot_time < self.SNAPSHOT_MAX_AGE:
+            return cls._snapshot
+
+        cls._snapshot_task = asyncio.ensure_future(self._take_snapshot())
+        return await asyncio.shield(cls._snapshot_task)
+
+    async def _take_snapshot(self) -> dict[str, Any]:
         retry_count = 0
         while retry_count < self.max_retries:
             try:
-                price0CumulativeLast, price1CumulativeLast, reserve0, reserve1, _blockTimestampLast = await self.multicall_lp(contract_address)
-                logger.debug(f"""   
-                _callPricesCumulativeLast({contract_address}) returned:
-                                price0CumulativeLast: {price0CumulativeLast}
-                                price1CumulativeLast: {price1CumulativeLast}
-                                reserve0: {reserve0}
-                                reserve1: {reserve1}
-                                _blockTimestampLast: {_blockTimestampLast}
+                snapshot = await self.multicall_lps()
+                if snapshot is None:
+                    raise Exception("Multicall of LP pairs returned no data")
+                logger.debug(f"""
+                _take_snapshot() returned:
+                                blockNumber: {snapshot['blockNumber']}
+                                blockTimestamp: {snapshot['blockTimestamp']}
+                                pairs: {snapshot['pairs']}
                           """)
-                return price0CumulativeLast, price1CumulativeLast, reserve0, reserve1, _blockTimestampLast
+                TWAPLPSpotPriceService._snapshot = snapshot
+                TWAPLPSpotPriceService._snapshot_time = time.time()
+                return snapshot
             except Exception as e:
                 retry_count += 1
                 logger.error(
                     f"""
-                    Error calling RPC in '_callPricesCumulativeLast' method
+                    Error calling RPC in '_take_snapshot' method
                     {'' if retry_count == self.max_retries else 'Trying again...'}
                     """
                 )
                 logger.error(e)
-        raise Exception(f"Failed to call RPC in '_callPricesCumulativeLast' method, address {contract_address}")
-    
+        raise Exception("Failed to call RPC in '_take_snapshot' method")
+
+    async def _callPricesCumulativeLast(self, contract_address: str) -> tuple[int]:
+        snapshot = await self._get_snapshot()
+        currency = next(c for c, address in self.contract_addresses.items() if address == contract_address)
+        return snapshot["pairs"][currency]
+
     def _get_pair_json_key(self, currency: str) -> str:
         token0, token1 = self.lps_order[currency].split('/')
         return f"{token0.upper()}/{token1.upper()}"
@@ -257,12 +349,37 @@ class TWAPLPSpotPriceService(WebPriceService):
     def _read_cumulative_prices_json(self) -> dict:
         if self.prevPricesPath.exists():
             if os.stat(self.prevPricesPath.resolve()).st_size == 0:
-                logger.info(f'Empty Cumulative prices JSON file found ({self.prevPricesPath.resolve()}), initializing...')
                 return {}
             return json.loads(self.prevPricesPath.read_text())
         return {}
 
-    def _update_cumulative_prices_json(
+    def _get_store(self, key: str) -> CumulativePricesStore:
+        """Cumulative prices ring buffer of a pair, migrating the legacy JSON data points on first use"""
+        path = (self.prevPricesDir / f"{key.replace('/', '_')}.bin").resolve()
+        if str(path) in self._stores:
+            return self._stores[str(path)]
+
+        store = CumulativePricesStore(path, self.DATA_POINTS_LIMIT)
+        if len(store) == 0:
+            try:
+                data_points = self._read_cumulative_prices_json().get(key)
+                if isinstance(data_points, list) and data_points:
+                    for data_point in data_points[-self.DATA_POINTS_LIMIT:]:
+                        store.append(CumulativePricesPoint(
+                            int(data_point['price0CumulativeLast']),
+                            int(data_point['price1CumulativeLast']),
+                            int(data_point['reserve0']),
+                            int(data_point['reserve1']),
+                            int(data_point['blockTimestampLast']),
+                        ))
+                    logger.info(f"Migrated {len(store)} {key} data points from {self.prevPricesPath.resolve()}")
+            except (json.decoder.JSONDecodeError, KeyError, ValueError) as e:
+                logger.warning(f"Unable to migrate {key} data points from {self.prevPricesPath.resolve()}: {e}")
+
+        self._stores[str(path)] = store
+        return store
+
+    def _update_cumulative_prices(
         self,
         price0CumulativeLast: int,
         price1CumulativeLast: int,
@@ -271,36 +388,22 @@ class TWAPLPSpotPriceService(WebPriceService):
         blockTimestampLast: int,
         key: str
     ) -> None:
-        json_data = self._read_cumulative_prices_json()
-
-        if key not in json_data.keys():
-            json_data[key] = []
-
-        if type(json_data[key]) != list:
-            logger.info(f"Found old invalid JSON format, initializing {key} to a list of data points")
-            json_data[key] = []
+        store = self._get_store(key)
 
-        if len(json_data[key]) > 0:
-            last_data_point = json_data[key][-1]
+        last_data_point = store.last()
+        if last_data_point is not None:
             if (
-                last_data_point['price0CumulativeLast'] == str(price0CumulativeLast) or
-                last_data_point['price1CumulativeLast'] == str(price1CumulativeLast) or
-                last_data_point['reserve0'] == str(reserve0) or
-                last_data_point['reserve1'] == str(reserve1) or
-                last_data_point['blockTimestampLast'] == str(blockTimestampLast)
+                last_data_point.price0CumulativeLast == price0CumulativeLast or
+                last_data_point.price1CumulativeLast == price1CumulativeLast or
+                last_data_point.reserve0 == reserve0 or
+                last_data_point.reserve1 == reserve1 or
+                last_data_point.blockTimestampLast == blockTimestampLast
             ):
-                logger.info(f"Last data point in {key} JSON is the same as the current one, skipping update")
+                logger.info(f"Last data point in {key} store is the same as the current one, skipping update")
                 return
 
-        new_data = {
-            'price0CumulativeLast': str(price0CumulativeLast),
-            'price1CumulativeLast': str(price1CumulativeLast),
-            'reserve0': str(reserve0),
-            'reserve1': str(reserve1),
-            'blockTimestampLast': str(blockTimestampLast)
-        }
         logger.debug(f"""
-            *****Appending {key} JSON data point*****:
+            *****Appending {key} data point*****:
             key: {key}
             price0CumulativeLast: {price0CumulativeLast}
             price1CumulativeLast: {price1CumulativeLast}
@@ -309,25 +412,26 @@ class TWAPLPSpotPriceService(WebPriceService):
             blockTimestampLast: {blockTimestampLast}
         """)
 
-        json_data[key].append(new_data)
-
-        if len(json_data[key]) > self.DATA_POINTS_LIMIT:
-            logger.info(f'JSON {key} data points limit reached ({self.DATA_POINTS_LIMIT}), removing oldest data point')
-            threshold = len(json_data[key]) - self.DATA_POINTS_LIMIT
-            json_data[key] = json_data[key][threshold:]
+        store.append(CumulativePricesPoint(
+            price0CumulativeLast, price1CumulativeLast, reserve0, reserve1, blockTimestampLast
+        ))
+        logger.info(f'Entry {key} updated in cumulative prices store')
 
-        self.prevPricesPath.write_text(json.dumps(json_data))
-        logger.info(f'Entry {key} updated in Cumulative prices JSON')
+    def get_twap_anchors(
+        self, currency: str, currentBlockTimestampLast: int, windows: list[int]
+    ) -> dict[int, Optional[CumulativePricesPoint]]:
+        """Anchor data point of several TWAP windows (in seconds) at once, from the in-memory index"""
+        return self._get_store(self._get_pair_json_key(currency)).find_anchors(currentBlockTimestampLast, windows)
 
     async def get_prev_prices_cumulative(self, currency: str, currentBlockTimestampLast) -> tuple[int]:
         key = self._get_pair_json_key(currency)
 
-        json_data = self._read_cumulative_prices_json()
+        store = self._get_store(key)
 
-        if key not in json_data.keys():
+        if len(store) == 0:
             address = self.contract_addresses[currency]
             price0CumulativeLast, price1CumulativeLast, reserve0, reserve1, _blockTimestampLast = await self._callPricesCumulativeLast(address)
-            self._update_cumulative_prices_json(
+            self._update_cumulative_prices(
                 price0CumulativeLast,
                 price1CumulativeLast,
                 reserve0,
@@ -335,7 +439,7 @@ class TWAPLPSpotPriceService(WebPriceService):
                 _blockTimestampLast,
                 key
             )
-            logger.info(f'Cumulative prices JSON {key} data initialized in get_prev_prices_cumulative')
+            logger.info(f'Cumulative prices {key} data initialized in get_prev_prices_cumulative')
             logger.debug(f"""   
                         call get_prev_prices_cumulative({currency}) returned:
                                 price0CumulativeLast: {price0CumulativeLast}
@@ -346,50 +450,41 @@ class TWAPLPSpotPriceService(WebPriceService):
                           """)
             return price0CumulativeLast, price1CumulativeLast, _blockTimestampLast
 
-        logger.info(f'Cumulative prices JSON {key} data found, list with {len(json_data[key])} data points)')
+        logger.info(f'Cumulative prices {key} data found, store with {len(store)} data points)')
         try:
-            data_points = json_data[key]
-            
-            twap_data_point = None
-            _blockTimestampLast = None
-            for data_point in reversed(data_points):
-                _blockTimestampLast = int(data_point['blockTimestampLast'])
-                time_diff = currentBlockTimestampLast - _blockTimestampLast
-                if time_diff >= self.TWAP_TIMESPAN:
-                    twap_data_point = data_point
-                    break
-            
+            twap_data_point = store.find_before(currentBlockTimestampLast - self.TWAP_TIMESPAN)
+
             if twap_data_point is None:
-                twap_data_point = data_points[0]
+                twap_data_point = store[0]
                 logger.error(f"""
-                    No TWAP data point found where in Cumulative prices JSON file where:
-                    time_diff = {currentBlockTimestampLast} - {_blockTimestampLast}
+                    No TWAP data point found in cumulative prices store where:
+                    time_diff = {currentBlockTimestampLast} - blockTimestampLast >= {self.TWAP_TIMESPAN}
                     using oldest data point:
-                    prevPrice0CumulativeLast = {twap_data_point['price0CumulativeLast']}
-                    prevPrice1CumulativeLast = {twap_data_point['price1CumulativeLast']}
-                    reserve0 = {twap_data_point['reserve0']}
-                    reserve1 = {twap_data_point['reserve1']}
-                    prevBlockTimestampLast = {twap_data_point['blockTimestampLast']}
+                    prevPrice0CumulativeLast = {twap_data_point.price0CumulativeLast}
+                    prevPrice1CumulativeLast = {twap_data_point.price1CumulativeLast}
+                    reserve0 = {twap_data_point.reserve0}
+                    reserve1 = {twap_data_point.reserve1}
+                    prevBlockTimestampLast = {twap_data_point.blockTimestampLast}
 
                     currentBlockTimestampLast = {currentBlockTimestampLast}
 
-                    Time difference: {currentBlockTimestampLast - int(twap_data_point['blockTimestampLast'])}
+                    Time difference: {currentBlockTimestampLast - twap_data_point.blockTimestampLast}
                 """)
                 
             logger.debug(f"""
                 TWAP data point:
-                prevPrice0CumulativeLast = {twap_data_point['price0CumulativeLast']}
-                prevPrice1CumulativeLast = {twap_data_point['price1CumulativeLast']}
-                reserve0 = {twap_data_point['reserve0']}
-                reserve1 = {twap_data_point['reserve1']}
-                prevBlockTimestampLast = {twap_data_point['blockTimestampLast']}
+                prevPrice0CumulativeLast = {twap_data_point.price0CumulativeLast}
+                prevPrice1CumulativeLast = {twap_data_point.price1CumulativeLast}
+                reserve0 = {twap_data_point.reserve0}
+                reserve1 = {twap_data_point.reserve1}
+                prevBlockTimestampLast = {twap_data_point.blockTimestampLast}
             """)
             
-            prevPrice0CumulativeLast = int(twap_data_point['price0CumulativeLast'])
-            prevPrice1CumulativeLast = int(twap_data_point['price1CumulativeLast'])
-            reserve0 = int(twap_data_point['reserve0'])
-            reserve1 = int(twap_data_point['reserve1'])
-            prevBlockTimestampLast = int(twap_data_point['blockTimestampLast'])
+            prevPrice0CumulativeLast = twap_data_point.price0CumulativeLast
+            prevPrice1CumulativeLast = twap_data_point.price1CumulativeLast
+            reserve0 = twap_data_point.reserve0
+            reserve1 = twap_data_point.reserve1
+            prevBlockTimestampLast = twap_data_point.blockTimestampLast
 
             time_elapsed = currentBlockTimestampLast - prevBlockTimestampLast
             logger.debug(f"time elapsed since last TWAP data point: {time_elapsed}")
@@ -422,37 +517,14 @@ class TWAPLPSpotPriceService(WebPriceService):
                                 prevBlockTimestampLast:  {prevBlockTimestampLast}
                           """)
             return prevPrice0CumulativeLast, prevPrice1CumulativeLast, prevBlockTimestampLast
-        except (json.decoder.JSONDecodeError, ValueError) as e: 
+        except ValueError as e:
             logger.error(f"""
-            Error while reading Cumulative Prices JSON file:
-            {self.prevPricesPath.resolve()}
+            Error while reading cumulative prices store:
+            {store.path.resolve()}
             You can manually delete the file and restart the service to automatically initialize it
-
-            The expected JSON format is:
-            {{
-                "WPLS/DAI": [{{
-                    "price0CumulativeLast": "123456789",
-                    "price1CumulativeLast": "123456789",
-                    "blockTimestampLast": "123456789"
-                }}],
-                ...
-            }}
             """)
             logger.error(e)
 
-    def _get_current_block_timestamp(self):
-        logger.debug(f"""   
-                        call _get_current_block_timestamp():
-                     """)
-        w3 = Web3(Web3.HTTPProvider(self.url))
-        block = w3.eth.getBlock("latest")
-        timestamp = block.timestamp
-        timestamp = timestamp % 2**32
-        logger.debug(f"""   
-                        returned timestamp {timestamp}
-                     """)
-        return timestamp
-    
     def _calculate_cumulative_price(
         self, address: str,
         price0Cumulative: int,
@@ -502,7 +574,8 @@ class TWAPLPSpotPriceService(WebPriceService):
     ) -> tuple[int]:
         address = self.contract_addresses[currency]
 
-        price0CumulativeLast, price1CumulativeLast, reserve0, reserve1, blockTimestampLast = await self._callPricesCumulativeLast(address)
+        snapshot = await self._get_snapshot()
+        price0CumulativeLast, price1CumulativeLast, reserve0, reserve1, blockTimestampLast = snapshot["pairs"][currency]
 
         logger.debug(f"""
             get_currentPrices({currency}) called, values returned:
@@ -513,8 +586,8 @@ class TWAPLPSpotPriceService(WebPriceService):
             blockTimestampLast: {blockTimestampLast}
         """)
 
-        blockTimestamp = self._get_current_block_timestamp()
-        logger.debug(f"Blockchain blockTimestamp: {blockTimestamp}")
+        blockTimestamp = snapshot["blockTimestamp"]
+        logger.debug(f"Blockchain blockTimestamp: {blockTimestamp} (block {snapshot['blockNumber']})")
         if blockTimestamp != blockTimestampLast:
             logger.info(
                 f"""
@@ -2,8 +2,6 @@ from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
@@ -52,24 +50,10 @@ class UniswapV3PriceService(WebPriceService):
 
         json_data = {"query": query}
 
-        request_url = self.url + "/subgraphs/name/uniswap/uniswap-v3"
-
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
-
-            except requests.exceptions.ConnectTimeout:
-                logger.warning("Timeout Error, No prices retrieved from Uniswap")
-                return None, None
-
-            except Exception:
-                logger.warning("No prices retrieved from Uniswap")
-                return None, None
+        data = await self.post_url_async("/subgraphs/name/uniswap/uniswap-v3", json_data=json_data, headers=headers)
 
         if "error" in data:
-            logger.error(data)
+            logger.warning(f"No prices retrieved from Uniswap: {data['error']}")
             return None, None
 
         elif "response" in data:
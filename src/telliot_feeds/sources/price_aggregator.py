@@ -3,8 +3,10 @@ import statistics
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Literal
+from typing import Optional
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
@@ -37,6 +39,17 @@ class PriceAggregator(DataSource[float]):
     #: Data feed sources
     sources: List[PriceSource] = field(default_factory=list)
 
+    #: Seconds to wait for sources before aggregating the prices received so far
+    #: (None waits for every source)
+    deadline: Optional[float] = None
+
+    #: Number of valid prices after which the remaining sources are cancelled
+    #: (None waits for every source)
+    quorum: Optional[int] = None
+
+    #: Sources whose prices were used in the last aggregate
+    contributing_sources: List[PriceSource] = field(default_factory=list, init=False, repr=False)
+
     def __post_init__(self) -> None:
         if self.algorithm == "median":
             self._algorithm = statistics.median
@@ -55,19 +68,48 @@ class PriceAggregator(DataSource[float]):
     async def update_sources(self) -> List[OptionalWeightedDataPoint[float]]:
         """Update data feed sources
 
+        If a `deadline` or `quorum` is set, sources still pending when the
+        deadline passes or the quorum of valid prices is reached are cancelled
+        and reported as `(None, None)`.
+
         Returns:
-            Dictionary of updated source values, mapping data source UID
-            to the time-stamped answer for that data source
+            List of the time-stamped answers of the data sources,
+            in the same order as `self.sources`
         """
-
-        async def gather_inputs() -> List[OptionalWeightedDataPoint[float]]:
-            sources = self.sources
-            datapoints = await asyncio.gather(*[source.fetch_new_datapoint() for source in sources])
-            return datapoints
-
-        inputs = await gather_inputs()
-
-        return inputs
+        if self.deadline is None and self.quorum is None:
+            return list(await asyncio.gather(*[source.fetch_new_datapoint() for source in self.sources]))
+
+        tasks: Dict[asyncio.Task, int] = {  # type: ignore
+            asyncio.ensure_future(source.fetch_new_datapoint()): i for i, source in enumerate(self.sources)
+        }
+        datapoints: List[OptionalWeightedDataPoint[float]] = [(None, None)] * len(self.sources)
+        pending = set(tasks)
+        valid = 0
+        loop = asyncio.get_running_loop()
+        end = loop.time() + self.deadline if self.deadline is not None else None
+
+        try:
+            while pending:
+                timeout = max(end - loop.time(), 0) if end is not None else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.warning(f"{self}: deadline of {self.deadline}s reached with {len(pending)} sources pending")
+                    break
+                for task in done:
+                    if task.exception() is not None:
+                        logger.warning(f"{self}: source {self.sources[tasks[task]]} failed: {task.exception()}")
+                        continue
+                    datapoints[tasks[task]] = task.result()
+                    if isinstance(task.result()[0], float):
+                        valid += 1
+                if self.quorum is not None and valid >= self.quorum:
+                    logger.info(f"{self}: quorum of {self.quorum} prices reached")
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return datapoints
 
     async def fetch_new_datapoint(self) -> OptionalWeightedDataPoint[float]:
         """Update current value with time-stamped value fetched from source
@@ -83,13 +125,15 @@ class PriceAggregator(DataSource[float]):
 
         prices = []
         weights = []
-        for datapoint in datapoints:
+        self.contributing_sources = []
+        for source, datapoint in zip(self.sources, datapoints):
             # Ignore input timestamps
             v = datapoint[0]
             w = datapoint[2] if len(datapoint) == 3 else None
             # Check for valid answers
             if v is not None and isinstance(v, float):
                 prices.append(v)
+                self.contributing_sources.append(source)
             # Check for valid answers
             if w is not None and isinstance(w, float):
                 weights.append(w)
@@ -111,6 +155,7 @@ class PriceAggregator(DataSource[float]):
 
         logger.info("Feed Price: {} reported at time {}".format(datapoint[0], datapoint[1]))
         logger.info("Number of sources used in aggregate: {}".format(len(prices)))
+        logger.debug(f"Sources used in aggregate: {[type(s).__name__ for s in self.contributing_sources]}")
 
         return datapoint
 
@@ -123,17 +168,23 @@ class PriceAggregatorApiLP(PriceAggregator):
 
         only_prices: list[float] = []
         prices_and_weights: list[tuple[float]] = []
-        for entity_name, datapoint in zip(self.source_entities, datapoints):
+        api_sources: List[PriceSource] = []
+        lp_sources: List[PriceSource] = []
+        for entity_name, source, datapoint in zip(self.source_entities, self.sources, datapoints):
             if entity_name == "LP":
                 v = datapoint[0]
                 w = datapoint[2] if len(datapoint) == 3 else None
                 if v is not None and isinstance(v, float) and w is not None and isinstance(w, float):
                     prices_and_weights.append((v, w))
+                    lp_sources.append(source)
 
             if entity_name == "API":
                 v = datapoint[0]
                 if v is not None and isinstance(v, float):
                     only_prices.append(v)
+                    api_sources.append(source)
+
+        self.contributing_sources = api_sources if only_prices else lp_sources
 
         if only_prices:
 
@@ -0,0 +1,262 @@
+"""Fixed-record ring buffer of LP cumulative price observations.
+
+Each LP pair gets its own memory-mapped file holding a header followed by
+`capacity` fixed-size records. Appending overwrites the oldest record once the
+buffer is full, so writes cost the same regardless of history length, and
+records stay ordered by `blockTimestampLast`, so lookups are a binary search.
+
+A record is written (with a CRC32 checksum) and flushed before the header
+record count is bumped. An append interrupted before the count is bumped has
+either written a partial record, which fails its checksum, or a complete
+record into the slot of the oldest observation once the buffer is full, which
+is then newer than the observations after it. Both are dropped when the store
+is opened again, so an interrupted append loses at most the observation it
+was overwriting.
+
+The held observations are also indexed in memory when the store is opened and
+kept in sync on append, so reads never touch the file.
+"""
+import bisect
+import itertools
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+MAGIC = b"TWAPRING"
+VERSION = 1
+
+#: magic, version, capacity, number of records ever appended
+HEADER = struct.Struct("<8sIIQ")
+HEADER_SIZE = 32
+
+#: price0CumulativeLast, price1CumulativeLast, reserve0, reserve1 (big-endian uint256/uint112 bytes),
+#: blockTimestampLast, crc32 of the preceding fields
+RECORD = struct.Struct("<32s32s16s16sQI")
+RECORD_SIZE = 112
+
+
+@dataclass(frozen=True)
+class CumulativePricesPoint:
+    """LP cumulative prices and reserves observed at `blockTimestampLast`"""
+
+    price0CumulativeLast: int
+    price1CumulativeLast: int
+    reserve0: int
+    reserve1: int
+    blockTimestampLast: int
+
+
+def _pack(point: CumulativePricesPoint) -> bytes:
+    fields = (
+        point.price0CumulativeLast.to_bytes(32, "big"),
+        point.price1CumulativeLast.to_bytes(32, "big"),
+        point.reserve0.to_bytes(16, "big"),
+        point.reserve1.to_bytes(16, "big"),
+        point.blockTimestampLast,
+    )
+    crc = zlib.crc32(RECORD.pack(*fields, 0)[:-4])
+    return RECORD.pack(*fields, crc).ljust(RECORD_SIZE, b"\0")
+
+
+def _unpack(data: bytes) -> Optional[CumulativePricesPoint]:
+    """Decode a record, or return None if its checksum does not match"""
+    price0, price1, reserve0, reserve1, timestamp, crc = RECORD.unpack_from(data)
+    if zlib.crc32(data[: RECORD.size - 4]) != crc:
+        return None
+    return CumulativePricesPoint(
+        int.from_bytes(price0, "big"),
+        int.from_bytes(price1, "big"),
+        int.from_bytes(reserve0, "big"),
+        int.from_bytes(reserve1, "big"),
+        timestamp,
+    )
+
+
+class CumulativePricesStore:
+    """Memory-mapped ring buffer of the latest `capacity` observations of one LP pair"""
+
+    def __init__(self, path: Path, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("Cumulative prices store capacity must be positive")
+        self.path = path
+        self.capacity = capacity
+        self.count = 0
+
+        #: in-memory index of the held observations, oldest first from `_start`
+        self._points: List[CumulativePricesPoint] = []
+        self._timestamps: List[int] = []
+        # evicted observations before it are dropped once there are `capacity` of them
+        self._start = 0
+
+        if self._header_capacity() == capacity:
+            self._map()
+        else:
+            existing = self._read_existing()
+            self._create(existing[-capacity:])
+        self._load_index()
+
+    def _header_capacity(self) -> Optional[int]:
+        """Capacity of an existing store file, or None if there is no valid one"""
+        if not self.path.exists() or self.path.stat().st_size < HEADER_SIZE:
+            return None
+        with open(self.path, "rb") as f:
+            magic, version, capacity, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            logger.warning(f"Unrecognized cumulative prices store {self.path.resolve()}, reinitializing it")
+            return None
+        if self.path.stat().st_size != HEADER_SIZE + capacity * RECORD_SIZE:
+            return None
+        return capacity
+
+    def _read_existing(self) -> list[CumulativePricesPoint]:
+        """Valid records of an existing store file (of any capacity), or [] if there is none"""
+        if self._header_capacity() is None:
+            return []
+
+        data = self.path.read_bytes()
+        _, _, capacity, count = HEADER.unpack_from(data)
+        points = []
+        for i in range(count - min(count, capacity), count):
+            offset = HEADER_SIZE + (i % capacity) * RECORD_SIZE
+            point = _unpack(data[offset : offset + RECORD_SIZE])
+            if point is None:
+                logger.warning(f"Dropping corrupted record {i} of cumulative prices store {self.path.resolve()}")
+                continue
+            points.append(point)
+        return points
+
+    def _create(self, points: list[CumulativePricesPoint]) -> None:
+        """Atomically replace the file with a store of the configured capacity holding `points`"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.capacity, len(points)).ljust(HEADER_SIZE, b"\0"))
+            for point in points:
+                f.write(_pack(point))
+            f.truncate(HEADER_SIZE + self.capacity * RECORD_SIZE)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._map()
+
+    def _map(self) -> None:
+        self._file = open(self.path, "r+b")
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self.count = HEADER.unpack_from(self._mmap)[3]
+
+    def _load_index(self) -> None:
+        """Index the held observations, rebuilding the store if some records are corrupted or out of order"""
+        points = [_unpack(self._mmap[offset : offset + RECORD_SIZE]) for offset in map(self._offset, range(len(self)))]
+        # newest first, keeping records not newer than the ones after them
+        valid_points: List[CumulativePricesPoint] = []
+        for point in reversed(points):
+            if point is not None and (
+                not valid_points or point.blockTimestampLast <= valid_points[-1].blockTimestampLast
+            ):
+                valid_points.append(point)
+        valid_points.reverse()
+        if len(valid_points) != len(points):
+            logger.warning(
+                f"Dropping {len(points) - len(valid_points)} corrupted or out of order records "
+                f"of cumulative prices store {self.path.resolve()}"
+            )
+            self.close()
+            self._create(valid_points)
+
+        self._points = valid_points
+        self._timestamps = [point.blockTimestampLast for point in valid_points]
+        self._start = 0
+
+    def close(self) -> None:
+        """Unmap and close the store file"""
+        self._mmap.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def _offset(self, index: int) -> int:
+        """File offset of the `index`-th oldest record held in the buffer"""
+        return HEADER_SIZE + ((self.count - len(self) + index) % self.capacity) * RECORD_SIZE
+
+    def __getitem__(self, index: int) -> CumulativePricesPoint:
+        held = len(self._points) - self._start
+        if index < 0:
+            index += held
+        if not 0 <= index < held:
+            raise IndexError("cumulative prices store index out of range")
+        return self._points[self._start + index]
+
+    def __iter__(self) -> Iterator[CumulativePricesPoint]:
+        return itertools.islice(self._points, self._start, None)
+
+    def last(self) -> Optional[CumulativePricesPoint]:
+        return self._points[-1] if len(self._points) > self._start else None
+
+    def append(self, point: CumulativePricesPoint) -> bool:
+        """Append an observation, overwriting the oldest one when full
+
+        Returns:
+            False if the observation is older than the latest stored one
+        """
+        if self._timestamps and point.blockTimestampLast < self._timestamps[-1]:
+            logger.warning(f"Ignoring out of order observation at {point.blockTimestampLast} in {self.path.name}")
+            return False
+
+        offset = HEADER_SIZE + (self.count % self.capacity) * RECORD_SIZE
+        self._mmap[offset : offset + RECORD_SIZE] = _pack(point)
+        self._mmap.flush()
+
+        self.count += 1
+        struct.pack_into("<Q", self._mmap, 16, self.count)
+        self._mmap.flush()
+
+        self._points.append(point)
+        self._timestamps.append(point.blockTimestampLast)
+        if len(self._points) - self._start > self.capacity:
+            self._start += 1
+            if self._start == self.capacity:
+                # amortized over the last `capacity` appends
+                del self._points[: self._start]
+                del self._timestamps[: self._start]
+                self._start = 0
+        return True
+
+    def merge(self, points: Iterable[CumulativePricesPoint]) -> None:
+        """Insert observations older than the latest stored one (e.g. backfilled history)
+
+        Rewrites the whole file, so it is meant for occasional use; `append`
+        is the constant-cost path for new observations.
+        """
+        merged = {point.blockTimestampLast: point for point in points}
+        merged.update({point.blockTimestampLast: point for point in self})
+        self.close()
+        self._create([merged[timestamp] for timestamp in sorted(merged)][-self.capacity :])
+        self._load_index()
+
+    def find_before(self, timestamp: int) -> Optional[CumulativePricesPoint]:
+        """Latest observation with `blockTimestampLast <= timestamp`, in O(log n)"""
+        i = bisect.bisect_right(self._timestamps, timestamp, lo=self._start)
+        return self._points[i - 1] if i > self._start else None
+
+    def find_anchors(self, timestamp: int, windows: Iterable[int]) -> Dict[int, Optional[CumulativePricesPoint]]:
+        """TWAP anchor of each window ending at `timestamp`
+
+        Returns:
+            Mapping of each window (in seconds) to the latest observation at
+            least that old, or None if there is none
+        """
+        return {window: self.find_before(timestamp - window) for window in windows}
@@ -0,0 +1,185 @@
+"""Rolling window of recent block fees.
+
+Fee estimates used to call `fee_history`, `get_block("latest")` or `gas_price`
+on every submission. The fee oracle polls the node in the background instead,
+fetching the fee history of new blocks only, and keeps the base fees and
+priority fee percentiles of the last `FEE_ORACLE_WINDOW` blocks. Rewards of
+each percentile are kept sorted as blocks enter and leave the window, so fee
+estimates read from the oracle without any RPC call or sorting.
+
+Estimates fall back to RPC calls while the oracle isn't fresh (not started,
+or no update for `FEE_ORACLE_MAX_AGE` seconds).
+"""
+import asyncio
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from web3 import Web3
+from web3._utils.fee_utils import PRIORITY_FEE_MAX
+from web3._utils.fee_utils import PRIORITY_FEE_MIN
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Number of blocks kept in the window
+FEE_ORACLE_WINDOW = int(os.getenv("FEE_ORACLE_WINDOW", 10))
+#: Seconds between checks for new blocks
+FEE_ORACLE_POLL_INTERVAL = float(os.getenv("FEE_ORACLE_POLL_INTERVAL", 3))
+#: Seconds after the last update before the oracle is considered stale
+FEE_ORACLE_MAX_AGE = float(os.getenv("FEE_ORACLE_MAX_AGE", 60))
+#: Priority fee percentiles recorded per block
+FEE_ORACLE_PERCENTILES = (5, 25, 50, 75)
+
+
+@dataclass
+class BlockFees:
+    """Fees of one block"""
+
+    number: int
+    base_fee: int
+    #: priority fees paid at each of FEE_ORACLE_PERCENTILES, in wei
+    rewards: Tuple[int, ...]
+
+
+class FeeOracle:
+    """Base fees and priority fee percentiles of the latest blocks"""
+
+    def __init__(
+        self,
+        w3: Web3,
+        window: int = FEE_ORACLE_WINDOW,
+        poll_interval: float = FEE_ORACLE_POLL_INTERVAL,
+        max_age: float = FEE_ORACLE_MAX_AGE,
+    ) -> None:
+        self.w3 = w3
+        self.window = window
+        self.poll_interval = poll_interval
+        self.max_age = max_age
+        self.blocks: Deque[BlockFees] = deque()
+        #: base fee of the block after the latest one
+        self.next_base_fee: Optional[int] = None
+        self.updated_at = 0.0
+        # non-zero rewards of the window, sorted, by percentile index
+        self._sorted_rewards: List[List[int]] = [[] for _ in FEE_ORACLE_PERCENTILES]
+        self._lock = threading.Lock()
+        self.task: "Optional[asyncio.Task[None]]" = None
+
+    def update(self) -> int:
+        """Fetch the fees of blocks mined since the last update
+
+        Returns:
+            number of new blocks
+
+        Raises:
+            Errors of the block number and fee history requests
+        """
+        latest: int = self.w3.eth.block_number
+        last = self.blocks[-1].number if self.blocks else None
+        if last is not None and latest <= last:
+            self.updated_at = time.monotonic()
+            return 0
+
+        count = self.window if last is None else min(latest - last, self.window)
+        history = self.w3.eth.fee_history(count, latest, list(FEE_ORACLE_PERCENTILES))  # type: ignore
+        oldest = int(history["oldestBlock"])
+        base_fees = history["baseFeePerGas"]
+        new_blocks = [
+            BlockFees(number=oldest + i, base_fee=int(base_fees[i]), rewards=tuple(int(r) for r in rewards))
+            for i, rewards in enumerate(history["reward"])
+        ]
+
+        with self._lock:
+            for block in new_blocks:
+                if self.blocks and block.number <= self.blocks[-1].number:
+                    continue
+                self._add(block)
+            while len(self.blocks) > self.window:
+                self._evict()
+            self.next_base_fee = int(base_fees[-1])
+            self.updated_at = time.monotonic()
+        return len(new_blocks)
+
+    def _add(self, block: BlockFees) -> None:
+        self.blocks.append(block)
+        for rewards, reward in zip(self._sorted_rewards, block.rewards):
+            if reward > 0:
+                bisect.insort(rewards, reward)
+
+    def _evict(self) -> None:
+        block = self.blocks.popleft()
+        for rewards, reward in zip(self._sorted_rewards, block.rewards):
+            if reward > 0:
+                del rewards[bisect.bisect_left(rewards, reward)]
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the oracle has been updated recently"""
+        return self.next_base_fee is not None and time.monotonic() - self.updated_at < self.max_age
+
+    @property
+    def base_fee(self) -> Optional[int]:
+        """Base fee of the latest block"""
+        return self.blocks[-1].base_fee if self.blocks else None
+
+    def sorted_rewards(self, percentile: int) -> List[int]:
+        """Non-zero priority fees paid at a percentile over the window, sorted"""
+        with self._lock:
+            return list(self._sorted_rewards[FEE_ORACLE_PERCENTILES.index(percentile)])
+
+    def percentile(self, percentile: int) -> Optional[int]:
+        """Median over the window of the priority fees paid at a percentile"""
+        with self._lock:
+            rewards = self._sorted_rewards[FEE_ORACLE_PERCENTILES.index(percentile)]
+            return rewards[len(rewards) // 2] if rewards else None
+
+    def percentiles(self) -> Dict[int, Optional[int]]:
+        """Median priority fee of each recorded percentile, in wei"""
+        return {p: self.percentile(p) for p in FEE_ORACLE_PERCENTILES}
+
+    def priority_fee_estimate(self, blocks: int = 5, percentile: int = 25) -> int:
+        """Priority fee like web3's fee history estimate, over the latest blocks of the window
+
+        Average of the non-zero rewards at a percentile, kept between 1 and 1.5 gwei."""
+        index = FEE_ORACLE_PERCENTILES.index(percentile)
+        with self._lock:
+            recent = [self.blocks[-i].rewards[index] for i in range(1, min(blocks, len(self.blocks)) + 1)]
+        fees = [fee for fee in recent if fee != 0]
+        average = round(sum(fees) / (len(fees) or 1))
+        return max(min(average, PRIORITY_FEE_MAX), PRIORITY_FEE_MIN)
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                new_blocks = await asyncio.to_thread(self.update)
+                if new_blocks:
+                    logger.debug(f"Fee oracle: {new_blocks} new blocks, next base fee {self.next_base_fee}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Unable to update fee history: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> "asyncio.Task[None]":
+        """Start polling for new blocks as a task on the running event loop"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._poll_loop())
+            logger.info(f"Started fee oracle over the last {self.window} blocks")
+        return self.task
+
+    async def stop(self) -> None:
+        """Cancel the polling task"""
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
@@ -0,0 +1,139 @@
+"""Type 2 transaction fee sources with failover.
+
+A fee lookup goes through a chain of sources, e.g. the PulseChain beacon gasnow
+API, the local fee history estimate and the node's gas price. Each source has a
+timeout and caches its fees for `FEE_SOURCE_TTL` seconds. A source that fails
+or times out is skipped for the next one in the chain, so a fee lookup can
+neither hang nor fail because of one unreachable source.
+
+Fees are returned in gwei as `(priority_fee, max_fee)`.
+"""
+import asyncio
+import os
+import time
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from web3 import Web3
+
+from telliot_feeds.utils.http_client import get_json
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Seconds before a fee source times out
+FEE_SOURCE_TIMEOUT = float(os.getenv("FEE_SOURCE_TIMEOUT", 3))
+#: Seconds fees of a source are reused
+FEE_SOURCE_TTL = float(os.getenv("FEE_SOURCE_TTL", 5))
+
+GASNOW_API_URLS = {
+    369: "https://beacon.pulsechain.com/api/v1/execution/gasnow",
+    943: "https://beacon.v4.testnet.pulsechain.com/api/v1/execution/gasnow",
+}
+
+Fees = Tuple[float, float]
+
+
+class FeeSource:
+    """Base class of fee sources, subclasses implement `fetch`"""
+
+    name = "fee source"
+
+    def __init__(self, timeout: float = FEE_SOURCE_TIMEOUT, ttl: float = FEE_SOURCE_TTL) -> None:
+        self.timeout = timeout
+        self.ttl = ttl
+        self._fees: Optional[Fees] = None
+        self._fetched_at = 0.0
+
+    async def fetch(self) -> Fees:
+        """Fetch fees, raising an exception if unavailable"""
+        raise NotImplementedError
+
+    async def get_fees(self) -> Optional[Fees]:
+        """Fees of the source, cached for `ttl` seconds
+
+        Returns None if the source failed or timed out."""
+        if self._fees is not None and time.monotonic() - self._fetched_at < self.ttl:
+            return self._fees
+        try:
+            priority_fee, max_fee = await asyncio.wait_for(self.fetch(), self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Fee source {self.name} timed out after {self.timeout}s")
+            return None
+        except Exception as e:
+            logger.warning(f"Fee source {self.name} failed: {e}")
+            return None
+        self._fees = (float(priority_fee), float(max_fee))
+        self._fetched_at = time.monotonic()
+        return self._fees
+
+
+class GasNowFeeSource(FeeSource):
+    """Rapid gas price of the PulseChain beacon gasnow API, used as priority and max fee"""
+
+    name = "gas_api"
+
+    def __init__(self, chain_id: int, **kwargs: float) -> None:
+        super().__init__(**kwargs)
+        self.url = GASNOW_API_URLS.get(chain_id, GASNOW_API_URLS[369])
+
+    async def fetch(self) -> Fees:
+        result = await get_json(self.url, timeout=self.timeout, headers={"Accept": "application/json"})
+        if "error" in result:
+            raise Exception(f"{result['error']}: {result.get('exception')}")
+        gas_price_gwei = float(Web3.fromWei(int(result["response"]["data"]["rapid"]), "gwei"))
+        return gas_price_gwei, gas_price_gwei
+
+
+class EstimatorFeeSource(FeeSource):
+    """Fees of a blocking estimator, e.g. from fee history, run in a worker thread"""
+
+    def __init__(self, name: str, estimate: Callable[[], Tuple[Optional[float], Optional[float]]], **kwargs: float):
+        super().__init__(**kwargs)
+        self.name = name
+        self.estimate = estimate
+
+    async def fetch(self) -> Fees:
+        priority_fee, max_fee = await asyncio.to_thread(self.estimate)
+        if priority_fee is None or max_fee is None:
+            raise Exception("no estimate")
+        return priority_fee, max_fee
+
+
+class NodeGasPriceFeeSource(FeeSource):
+    """Node's gas price, used as priority and max fee"""
+
+    name = "gas_price"
+
+    def __init__(self, w3: Web3, **kwargs: float) -> None:
+        super().__init__(**kwargs)
+        self.w3 = w3
+
+    async def fetch(self) -> Fees:
+        gas_price = await asyncio.to_thread(lambda: self.w3.eth.gas_price)
+        gas_price_gwei = float(Web3.fromWei(gas_price, "gwei"))
+        return gas_price_gwei, gas_price_gwei
+
+
+class FeeSourceChain:
+    """Fee sources tried in order until one answers"""
+
+    def __init__(self, sources: List[FeeSource]) -> None:
+        self.sources = sources
+
+    async def get_fees(self) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+        """Fees of the first source answering
+
+        Returns:
+            priority fee and max fee in gwei, and the name of the source used.
+            All None if no source answered.
+        """
+        for source in self.sources:
+            fees = await source.get_fees()
+            if fees is not None:
+                return fees[0], fees[1], source.name
+        logger.error(f"No fee source available: {', '.join(source.name for source in self.sources)}")
+        return None, None, None
@@ -0,0 +1,101 @@
+"""Shared async HTTP client for web requests.
+
+A single `aiohttp.ClientSession` is kept per event loop so that every web price
+service reuses the same keep-alive, per-host connection pool instead of opening
+a new connection (and TLS handshake) for each request.
+"""
+import asyncio
+import json
+import os
+import weakref
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+import aiohttp
+
+#: Maximum simultaneous connections kept open to a single host
+LIMIT_PER_HOST = int(os.getenv("HTTP_LIMIT_PER_HOST", 10))
+
+#: Seconds an idle connection is kept alive for reuse
+KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30.0))
+
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+def get_client_session() -> aiohttp.ClientSession:
+    """Return the client session shared by all requests on the running event loop
+
+    Must be called from a coroutine. A new session is created the first time
+    it is requested on a loop, or if the previous one was closed.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit_per_host=LIMIT_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300,
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        _sessions[loop] = session
+    return session
+
+
+async def close_client_session() -> None:
+    """Close the client session of the running event loop, if any"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def request_json(
+    method: str,
+    url: str,
+    timeout: float,
+    headers: Optional[Dict[str, str]] = None,
+    json_data: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """Send a request through the shared client session and parse its JSON body
+
+    Args:
+        method: HTTP method, i.e. "GET" or "POST"
+        url: URL to fetch
+        timeout: total request timeout in seconds
+        headers: optional request headers
+        json_data: optional JSON request body
+
+    Returns:
+        A dictionary with the following (optional) keys:
+            response (dict or list): Result, if no error occurred
+            error (str): A description of the error, if one occurred
+            exception (Exception): The exception, if one occurred
+    """
+    session = get_client_session()
+    try:
+        async with session.request(
+            method, url, headers=headers, json=json_data, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as r:
+            text = await r.text()
+            return {"response": json.loads(text)}
+
+    except asyncio.TimeoutError as e:
+        return {"error": "Timeout Error", "exception": e}
+
+    except json.JSONDecodeError as e:
+        return {"error": "JSON Decode Error", "exception": e}
+
+    except Exception as e:
+        return {"error": str(type(e)), "exception": e}
+
+
+async def get_json(url: str, timeout: float, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """GET a URL through the shared client session, see `request_json`"""
+    return await request_json("GET", url, timeout=timeout, headers=headers)
+
+
+async def post_json(
+    url: str, json_data: Any, timeout: float, headers: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """POST a JSON body through the shared client session, see `request_json`"""
+    return await request_json("POST", url, timeout=timeout, headers=headers, json_data=json_data)
@@ -0,0 +1,141 @@
+"""Chunked, concurrent execution of multicall batches.
+
+Sending thousands of `Call`s through a single `Multicall` runs into RPC gas and
+response size limits and fails as a whole. The executor splits the calls into
+chunks sized by a calldata budget, runs the chunks concurrently with bounded
+parallelism and merges their results. A chunk that fails is retried by
+bisection, and the budget adapts: it halves when a chunk fails, then grows
+back after successful chunks, but stays below the size of the last failed chunk
+(a ceiling which itself only creeps up slowly).
+
+One executor is kept per web3 connection, so that all tip and autopay calls
+share the learned budget.
+"""
+import asyncio
+import os
+import weakref
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from multicall import Call
+from multicall import Multicall
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Maximum chunks of a batch in flight at once
+MAX_CONCURRENCY = int(os.getenv("MULTICALL_MAX_CONCURRENCY", 4))
+
+#: Initial and maximum calldata bytes per chunk
+CHUNK_BUDGET = int(os.getenv("MULTICALL_CHUNK_BUDGET", 64_000))
+MAX_CHUNK_BUDGET = int(os.getenv("MULTICALL_MAX_CHUNK_BUDGET", 512_000))
+
+#: Bytes counted for each call on top of its calldata (target address and offsets in the aggregate call)
+CALL_OVERHEAD = 96
+
+_executors: "weakref.WeakKeyDictionary[Web3, MulticallExecutor]" = weakref.WeakKeyDictionary()
+
+
+class MulticallExecutor:
+    """Run calls in concurrent chunks sized by an adaptive calldata budget"""
+
+    def __init__(
+        self,
+        w3: Web3,
+        max_concurrency: int = MAX_CONCURRENCY,
+        budget: int = CHUNK_BUDGET,
+        max_budget: int = MAX_CHUNK_BUDGET,
+    ) -> None:
+        self.w3 = w3
+        self.max_concurrency = max_concurrency
+        self.budget = budget
+        self.min_budget = CALL_OVERHEAD
+        self.max_budget = max(max_budget, budget)
+        #: size below the smallest recently failed chunk
+        self.ceiling = self.max_budget
+
+    @staticmethod
+    def weight(call: Call) -> int:
+        """Estimated size of a call in the aggregate calldata"""
+        return len(call.data) + CALL_OVERHEAD
+
+    def chunk(self, calls: List[Call]) -> List[List[Call]]:
+        """Split calls into chunks within the current budget, keeping their order"""
+        chunks: List[List[Call]] = []
+        size = 0
+        for call in calls:
+            weight = self.weight(call)
+            if not chunks or (size + weight > self.budget and chunks[-1]):
+                chunks.append([])
+                size = 0
+            chunks[-1].append(call)
+            size += weight
+        return chunks
+
+    async def execute(
+        self, calls: List[Call], require_success: bool = False, block_id: Optional[int] = None
+    ) -> Dict[Any, Any]:
+        """Run all calls and merge their results
+
+        Args:
+            calls: list of Call objects
+            require_success: throws error if True and contract logic reverts
+            block_id: block to run the calls at, latest by default
+
+        Returns:
+            results of all calls, as returned by `Multicall`
+
+        Raises:
+            The error of a chunk that failed down to a single call, or a contract reversion
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(chunk: List[Call]) -> Dict[Any, Any]:
+            async with semaphore:
+                return await self._run_chunk(chunk, require_success, block_id)
+
+        results = await asyncio.gather(*(run(chunk) for chunk in self.chunk(calls)))
+        data: Dict[Any, Any] = {}
+        for result in results:
+            data.update(result)
+        return data
+
+    async def _run_chunk(self, calls: List[Call], require_success: bool, block_id: Optional[int]) -> Dict[Any, Any]:
+        """Run a chunk, bisecting it on failure"""
+        mc = Multicall(calls=calls, _w3=self.w3, block_id=block_id, require_success=require_success)
+        try:
+            data: Dict[Any, Any] = await mc.coroutine()
+        except ContractLogicError:
+            # reverts with require_success aren't fixed by smaller chunks
+            raise
+        except Exception as e:
+            if len(calls) == 1:
+                raise
+            size = sum(self.weight(call) for call in calls)
+            self.ceiling = max(self.min_budget, min(self.ceiling, size - 1))
+            self.budget = max(self.min_budget, min(self.budget, size // 2))
+            logger.warning(f"Multicall chunk of {len(calls)} calls failed, bisecting (budget {self.budget}): {e}")
+            middle = len(calls) // 2
+            # halves run one after the other, within the concurrency slot of the chunk
+            data = await self._run_chunk(calls[:middle], require_success, block_id)
+            data.update(await self._run_chunk(calls[middle:], require_success, block_id))
+            return data
+
+        self.ceiling = min(self.max_budget, self.ceiling + self.ceiling // 64)
+        self.budget = min(self.ceiling, self.budget + self.budget // 4)
+        return data
+
+
+def get_multicall_executor(w3: Web3) -> MulticallExecutor:
+    """Return the executor shared by all calls through a web3 connection"""
+    executor = _executors.get(w3)
+    if executor is None:
+        executor = MulticallExecutor(w3)
+        _executors[w3] = executor
+    return executor
@@ -0,0 +1,98 @@
+"""Account nonces tracked locally.
+
+Asking the node for the transaction count before every transaction costs an RPC
+call, and lags behind transactions that were just sent, which is why reporters
+used to sleep between back-to-back transactions. The nonce manager asks the node
+once, then hands out nonces itself. Reservation is atomic, so concurrent sends
+(from the event loop or worker threads) never share a nonce.
+
+It reconciles with the node's pending transaction count (mined plus mempool
+transactions) on first use and after errors, and keeps the transactions sent
+but not confirmed yet.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict
+from typing import Optional
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PendingTransaction:
+    """A transaction sent but not confirmed yet"""
+
+    nonce: int
+    tx_hash: HexBytes
+    sent_at: float
+
+
+class NonceManager:
+    """Hand out the nonces of an account"""
+
+    def __init__(self, w3: Web3, address: str) -> None:
+        self.w3 = w3
+        self.address = address
+        self._next_nonce: Optional[int] = None
+        self._lock = threading.Lock()
+        #: transactions sent but not confirmed, by nonce
+        self.pending: Dict[int, PendingTransaction] = {}
+
+    def sync(self, force: bool = False) -> int:
+        """Next nonce, asking the node if not known yet or if forced
+
+        Raises:
+            Errors of the transaction count request
+        """
+        with self._lock:
+            return self._sync(force)
+
+    def _sync(self, force: bool = False) -> int:
+        if self._next_nonce is None or force:
+            count: int = self.w3.eth.get_transaction_count(self.address, "pending")  # type: ignore
+            if self._next_nonce is not None and count != self._next_nonce:
+                logger.info(f"Account nonce reconciled with node: {self._next_nonce} -> {count}")
+            self._next_nonce = count
+        return self._next_nonce
+
+    def reserve(self) -> int:
+        """Take the next nonce for a transaction
+
+        Raises:
+            Errors of the transaction count request, if the nonce isn't known yet
+        """
+        with self._lock:
+            nonce = self._sync()
+            self._next_nonce = nonce + 1
+            return nonce
+
+    def release(self, nonce: int) -> None:
+        """Give back a reserved nonce that no transaction was sent with"""
+        with self._lock:
+            if self._next_nonce == nonce + 1:
+                self._next_nonce = nonce
+            else:
+                # later nonces are out, a gap can only be filled by the node's count
+                self._next_nonce = None
+
+    def reset(self) -> None:
+        """Ask the node for the nonce again on next use, e.g. after a nonce error"""
+        with self._lock:
+            self._next_nonce = None
+
+    def track(self, nonce: int, tx_hash: HexBytes) -> None:
+        """Keep a sent transaction until it's confirmed"""
+        with self._lock:
+            self.pending[nonce] = PendingTransaction(nonce=nonce, tx_hash=tx_hash, sent_at=time.time())
+
+    def confirm(self, nonce: int) -> None:
+        """Forget a transaction once mined"""
+        with self._lock:
+            self.pending.pop(nonce, None)
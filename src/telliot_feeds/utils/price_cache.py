@@ -0,0 +1,59 @@
+"""Token prices shared by the profitability checks of a reporter.
+
+Profitability checks fetch the native token and FETCH/USD prices from their
+median feeds. When several datafeeds are checked at once, each check would query
+the same price sources again. The price cache fetches a price feed at most once
+every `PRICE_CACHE_TTL` seconds, and concurrent callers share the fetch in
+flight. Failed fetches are not cached.
+"""
+import asyncio
+import os
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Seconds a fetched price is reused
+PRICE_CACHE_TTL = float(os.getenv("PRICE_CACHE_TTL", 15))
+
+
+class PriceCache:
+    """Latest values of price feeds, fetched at most once per `ttl` seconds"""
+
+    def __init__(self, ttl: float = PRICE_CACHE_TTL) -> None:
+        self.ttl = ttl
+        # price and fetch time by feed id, the feed is kept so its id isn't reused
+        self._prices: Dict[int, Tuple[DataFeed[Any], Any, float]] = {}
+        self._pending: "Dict[int, asyncio.Task[Any]]" = {}
+
+    async def fetch(self, feed: DataFeed[Any]) -> Any:
+        """Latest value of a price feed, None if it couldn't be fetched"""
+        key = id(feed)
+        cached = self._prices.get(key)
+        if cached is not None and time.monotonic() - cached[2] < self.ttl:
+            return cached[1]
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(feed))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, feed: DataFeed[Any]) -> Any:
+        await feed.source.fetch_new_datapoint()
+        price = feed.source.latest[0]
+        if price is not None:
+            self._prices[id(feed)] = (feed, price, time.monotonic())
+        return price
+
+    async def fetch_all(self, feeds: List[DataFeed[Any]]) -> List[Any]:
+        """Latest values of price feeds, fetched concurrently"""
+        return list(await asyncio.gather(*[self.fetch(feed) for feed in feeds]))
@@ -0,0 +1,236 @@
+"""Block-keyed read-through cache for contract view calls.
+
+A reporting cycle reads the same oracle, autopay and token views (stake amount,
+staker info, report counts...) several times, though none of them can change
+within a block. Reads through the cache are keyed by contract, function,
+arguments and block number, and the cached values are dropped as soon as a new
+block is seen. The current block number is looked up at most once every
+`READ_CACHE_BLOCK_TTL` seconds.
+
+Reads that miss the cache and are awaited together (e.g. with `asyncio.gather`)
+are coalesced into a single multicall at the current block, a lone miss is a
+plain `Contract.read`. If the multicall fails, or a call in it reverts, the read
+falls back to `Contract.read` for the usual error status.
+"""
+import asyncio
+import os
+import time
+import weakref
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from hexbytes import HexBytes
+from multicall.constants import MULTICALL2_ADDRESSES
+from multicall.constants import MULTICALL3_ADDRESSES
+from multicall.utils import chain_id
+from telliot_core.contract.contract import Contract
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+from web3._utils.abi import get_abi_output_types
+from web3._utils.abi import map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.contract import ContractFunction
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Seconds a looked up block number is trusted before checking for a new block
+READ_CACHE_BLOCK_TTL = float(os.getenv("READ_CACHE_BLOCK_TTL", 1.0))
+
+#: tryBlockAndAggregate of Multicall2 and Multicall3
+AGGREGATE_ABI = [
+    {
+        "name": "tryBlockAndAggregate",
+        "type": "function",
+        "stateMutability": "nonpayable",
+        "inputs": [
+            {"name": "requireSuccess", "type": "bool"},
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [{"name": "target", "type": "address"}, {"name": "callData", "type": "bytes"}],
+            },
+        ],
+        "outputs": [
+            {"name": "blockNumber", "type": "uint256"},
+            {"name": "blockHash", "type": "bytes32"},
+            {
+                "name": "returnData",
+                "type": "tuple[]",
+                "components": [{"name": "success", "type": "bool"}, {"name": "returnData", "type": "bytes"}],
+            },
+        ],
+    }
+]
+
+_caches: "weakref.WeakKeyDictionary[Web3, ContractReadCache]" = weakref.WeakKeyDictionary()
+
+
+class _PendingRead:
+    """A cache miss waiting for the next multicall"""
+
+    def __init__(self, contract: Contract, func_name: str, function: ContractFunction, kwargs: Dict[str, Any]):
+        self.contract = contract
+        self.func_name = func_name
+        self.function = function
+        self.kwargs = kwargs
+        self.future: "asyncio.Future[Tuple[Any, ResponseStatus]]" = asyncio.get_running_loop().create_future()
+
+
+class ContractReadCache:
+    """Cache view call results of one web3 connection for the current block"""
+
+    def __init__(self, w3: Web3, block_ttl: float = READ_CACHE_BLOCK_TTL) -> None:
+        # only a weak reference, so the connection isn't kept alive by its cache in the registry
+        self._w3 = weakref.ref(w3)
+        self.block_ttl = block_ttl
+        self.block: Optional[int] = None
+        self._checked_at = 0.0
+        self._block_lookup: "Optional[asyncio.Future[int]]" = None
+        self.values: Dict[Hashable, Any] = {}
+        self._pending: Dict[Hashable, _PendingRead] = {}
+        self._flush_task: "Optional[asyncio.Task[None]]" = None
+
+    @property
+    def w3(self) -> Web3:
+        w3 = self._w3()
+        if w3 is None:
+            raise ReferenceError("web3 connection of the cache was garbage collected")
+        return w3
+
+    def invalidate(self) -> None:
+        """Forget cached values and the block number, e.g. after sending a transaction"""
+        self.block = None
+        self._checked_at = 0.0
+        self.values.clear()
+
+    def refresh(self) -> None:
+        """Look the block number up again on the next read
+
+        Cached values are kept if the block didn't change, unlike `invalidate`,
+        so readers sharing the cache don't read the current block again."""
+        self._checked_at = 0.0
+
+    async def block_number(self) -> int:
+        """Current block number, dropping cached values when it changed"""
+        if self.block is not None and time.monotonic() - self._checked_at < self.block_ttl:
+            return self.block
+        # concurrent reads share one lookup
+        if self._block_lookup is None:
+            self._block_lookup = asyncio.ensure_future(asyncio.to_thread(lambda: self.w3.eth.block_number))
+        lookup = self._block_lookup
+        try:
+            block: int = await lookup
+        finally:
+            if self._block_lookup is lookup:
+                self._block_lookup = None
+        if block != self.block:
+            self.values.clear()
+            self.block = block
+        self._checked_at = time.monotonic()
+        return block
+
+    async def read(self, contract: Contract, func_name: str, **kwargs: Any) -> Tuple[Any, ResponseStatus]:
+        """Read a view function like `Contract.read`, through the cache
+
+        Args:
+            contract: contract to read from
+            func_name: name of contract function
+            kwargs: function arguments
+
+        Returns:
+            function output and ResponseStatus
+        """
+        try:
+            key: Hashable = (contract.address, func_name, tuple(sorted(kwargs.items())))
+            hash(key)
+            function = contract.contract.get_function_by_name(func_name)(**kwargs)
+            await self.block_number()
+        except Exception:
+            # unhashable arguments, unknown function or failed block lookup
+            return await contract.read(func_name, **kwargs)
+
+        if key in self.values:
+            return self.values[key], ResponseStatus()
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = _PendingRead(contract, func_name, function, kwargs)
+            self._pending[key] = pending
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush())
+        return await asyncio.shield(pending.future)
+
+    async def _flush(self) -> None:
+        """Run all pending reads in one multicall"""
+        # let the other reads awaited together join the batch
+        await asyncio.sleep(0)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        block = self.block
+
+        results: List[Tuple[bool, Any]] = [(False, None)] * len(pending)
+        if len(pending) > 1:
+            try:
+                results = await self._aggregate([read.function for read in pending.values()], block)
+            except Exception as e:
+                logger.debug(f"Multicall of {len(pending)} contract reads failed, reading one by one: {e}")
+
+        for (key, read), (success, value) in zip(pending.items(), results):
+            if not success:
+                try:
+                    value, status = await read.contract.read(read.func_name, **read.kwargs)
+                except Exception as e:
+                    read.future.set_exception(e)
+                    continue
+            else:
+                status = ResponseStatus()
+            # values read from a block that has since been replaced are not cached
+            if status.ok and self.block == block:
+                self.values[key] = value
+            read.future.set_result((value, status))
+
+    async def _aggregate(self, functions: List[ContractFunction], block: Optional[int]) -> List[Tuple[bool, Any]]:
+        """Call functions in a single tryBlockAndAggregate at `block` and decode their outputs"""
+        chain = chain_id(self.w3)
+        address = MULTICALL3_ADDRESSES.get(chain) or MULTICALL2_ADDRESSES[chain]
+        aggregate = self.w3.eth.contract(address=address, abi=AGGREGATE_ABI).functions.tryBlockAndAggregate(
+            False, [(function.address, HexBytes(function._encode_transaction_data())) for function in functions]
+        )
+        _, _, outputs = await asyncio.to_thread(aggregate.call, block_identifier=block)
+
+        results: List[Tuple[bool, Any]] = []
+        for function, (success, output) in zip(functions, outputs):
+            if not success:
+                results.append((False, None))
+                continue
+            output_types = get_abi_output_types(function.abi)
+            try:
+                decoded = self.w3.codec.decode_abi(output_types, output)
+            except Exception:
+                results.append((False, None))
+                continue
+            normalized = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, decoded)
+            # same shape as ContractFunction.call
+            results.append((True, normalized[0] if len(normalized) == 1 else normalized))
+        return results
+
+
+def get_read_cache(w3: Web3) -> ContractReadCache:
+    """Return the read cache shared by all contracts of a web3 connection"""
+    cache = _caches.get(w3)
+    if cache is None:
+        cache = ContractReadCache(w3)
+        _caches[w3] = cache
+    return cache
+
+
+async def cached_read(contract: Contract, func_name: str, **kwargs: Any) -> Tuple[Any, ResponseStatus]:
+    """Read a contract view function through the read cache of its connection"""
+    return await get_read_cache(contract.node._web3).read(contract, func_name, **kwargs)
@@ -0,0 +1,236 @@
+"""Receipts of in-flight transactions, looked up once per block.
+
+Instead of each sender blocking in `wait_for_transaction_receipt`, transaction
+hashes are handed to a tracker shared by all senders of a web3 connection. A
+single task checks for a new block every `RECEIPT_POLL_INTERVAL` seconds and,
+for each new block, fetches the receipts of all tracked transactions in one
+JSON-RPC batch request (one request per transaction if the provider isn't
+HTTP). Receipts are delivered through futures and callbacks, and counted in
+`ReceiptMetrics`.
+"""
+import asyncio
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TransactionNotFound
+
+from telliot_feeds.utils.http_client import post_json
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Seconds between checks for a new block
+RECEIPT_POLL_INTERVAL = float(os.getenv("RECEIPT_POLL_INTERVAL", 1))
+#: Seconds before a batch receipt request times out
+RECEIPT_REQUEST_TIMEOUT = float(os.getenv("RECEIPT_REQUEST_TIMEOUT", 10))
+
+ReceiptCallback = Callable[[AttributeDict[str, Any]], Any]
+
+_trackers: "weakref.WeakKeyDictionary[Web3, ReceiptTracker]" = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class ReceiptMetrics:
+    """Counters of a receipt tracker"""
+
+    #: transactions handed to the tracker
+    tracked: int = 0
+    #: transactions mined and successful
+    confirmed: int = 0
+    #: transactions mined and reverted
+    reverted: int = 0
+    #: blocks receipts were looked up for
+    blocks: int = 0
+    #: receipt lookups, batched or not
+    requests: int = 0
+    #: failed block or receipt lookups
+    errors: int = 0
+    #: seconds from tracking to receipt, summed over mined transactions
+    confirmation_seconds: float = 0.0
+
+    @property
+    def mean_confirmation_seconds(self) -> Optional[float]:
+        mined = self.confirmed + self.reverted
+        return self.confirmation_seconds / mined if mined else None
+
+
+class _Watch:
+    def __init__(self) -> None:
+        self.future: "asyncio.Future[AttributeDict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self.callbacks: List[ReceiptCallback] = []
+        self.since = time.monotonic()
+
+
+class ReceiptTracker:
+    """Look up receipts of all tracked transactions once per block"""
+
+    def __init__(self, w3: Web3, poll_interval: float = RECEIPT_POLL_INTERVAL) -> None:
+        # only a weak reference, so the connection isn't kept alive by its tracker in the registry
+        self._w3 = weakref.ref(w3)
+        self.poll_interval = poll_interval
+        self.block: Optional[int] = None
+        self.metrics = ReceiptMetrics()
+        self._watches: Dict[HexBytes, _Watch] = {}
+        self._block_waiters: "List[asyncio.Future[int]]" = []
+        self.task: "Optional[asyncio.Task[None]]" = None
+
+    @property
+    def w3(self) -> Web3:
+        w3 = self._w3()
+        if w3 is None:
+            raise ReferenceError("web3 connection of the tracker was garbage collected")
+        return w3
+
+    def watch(
+        self, tx_hash: HexBytes, callback: Optional[ReceiptCallback] = None
+    ) -> "asyncio.Future[AttributeDict[str, Any]]":
+        """Track a transaction until mined
+
+        Returns:
+            future resolved with the receipt, shared by all watchers of the hash
+        """
+        tx_hash = HexBytes(tx_hash)
+        watch = self._watches.get(tx_hash)
+        if watch is None:
+            watch = _Watch()
+            self._watches[tx_hash] = watch
+            self.metrics.tracked += 1
+        if callback is not None:
+            watch.callbacks.append(callback)
+        self._ensure_polling()
+        return watch.future
+
+    def forget(self, tx_hash: HexBytes) -> None:
+        """Stop tracking a transaction, e.g. replaced by another one at the same nonce"""
+        watch = self._watches.pop(HexBytes(tx_hash), None)
+        if watch is not None and not watch.future.done():
+            watch.future.cancel()
+
+    @property
+    def in_flight(self) -> List[HexBytes]:
+        """Hashes of tracked transactions not mined yet"""
+        return list(self._watches)
+
+    async def next_block(self) -> int:
+        """Wait for the next new block, once receipts were looked up for it"""
+        waiter: "asyncio.Future[int]" = asyncio.get_running_loop().create_future()
+        self._block_waiters.append(waiter)
+        self._ensure_polling()
+        return await waiter
+
+    def _ensure_polling(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self) -> None:
+        # stops once the connection is garbage collected, nothing is left to wait for then
+        while (self._watches or self._block_waiters) and self._w3() is not None:
+            try:
+                block: int = await asyncio.to_thread(lambda: self.w3.eth.block_number)
+            except Exception as e:
+                self.metrics.errors += 1
+                logger.warning(f"Unable to get block number: {e}")
+                block = self.block  # type: ignore
+            if block is not None and block != self.block:
+                self.block = block
+                self.metrics.blocks += 1
+                if self._watches:
+                    await self._check_receipts()
+                waiters, self._block_waiters = self._block_waiters, []
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(block)
+            await asyncio.sleep(self.poll_interval)
+
+    async def _check_receipts(self) -> None:
+        hashes = list(self._watches)
+        try:
+            receipts = await self.get_receipts(hashes)
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.warning(f"Unable to get receipts of {len(hashes)} transactions: {e}")
+            return
+        for tx_hash, receipt in receipts.items():
+            watch = self._watches.pop(tx_hash, None)
+            if watch is None:
+                continue
+            if receipt["status"] == 0:
+                self.metrics.reverted += 1
+            else:
+                self.metrics.confirmed += 1
+            self.metrics.confirmation_seconds += time.monotonic() - watch.since
+            if not watch.future.done():
+                watch.future.set_result(receipt)
+            for callback in watch.callbacks:
+                try:
+                    callback(receipt)
+                except Exception as e:
+                    logger.error(f"Receipt callback of {tx_hash.hex()} failed: {e}")
+
+    async def get_receipts(self, hashes: List[HexBytes]) -> Dict[HexBytes, AttributeDict[str, Any]]:
+        """Receipts of the mined transactions among `hashes`"""
+        uri = getattr(self.w3.provider, "endpoint_uri", None)
+        if isinstance(uri, str) and uri.startswith("http"):
+            return await self._batch_receipts(uri, hashes)
+
+        self.metrics.requests += len(hashes)
+        results = await asyncio.gather(
+            *[asyncio.to_thread(self._get_receipt, tx_hash) for tx_hash in hashes], return_exceptions=True
+        )
+        receipts = {}
+        for tx_hash, result in zip(hashes, results):
+            if isinstance(result, Exception):
+                raise result
+            if result is not None:
+                receipts[tx_hash] = result
+        return receipts
+
+    def _get_receipt(self, tx_hash: HexBytes) -> Optional[AttributeDict[str, Any]]:
+        try:
+            return self.w3.eth.get_transaction_receipt(tx_hash)  # type: ignore
+        except TransactionNotFound:
+            return None
+
+    async def _batch_receipts(self, uri: str, hashes: List[HexBytes]) -> Dict[HexBytes, AttributeDict[str, Any]]:
+        """Receipts fetched in one JSON-RPC batch request"""
+        batch = [
+            {"jsonrpc": "2.0", "id": i, "method": "eth_getTransactionReceipt", "params": [tx_hash.hex()]}
+            for i, tx_hash in enumerate(hashes)
+        ]
+        self.metrics.requests += 1
+        result = await post_json(uri, batch, timeout=RECEIPT_REQUEST_TIMEOUT)
+        if "error" in result:
+            raise Exception(f"{result['error']}: {result.get('exception')}")
+        responses = result["response"]
+        if not isinstance(responses, list):
+            raise Exception(f"Unexpected batch response: {responses}")
+
+        receipts = {}
+        for response in responses:
+            if "error" in response:
+                raise Exception(f"eth_getTransactionReceipt failed: {response['error']}")
+            raw = response.get("result")
+            if raw is not None:
+                receipts[hashes[int(response["id"])]] = AttributeDict.recursive(receipt_formatter(raw))
+        return receipts
+
+
+def get_receipt_tracker(w3: Web3) -> ReceiptTracker:
+    """Return the receipt tracker shared by all senders of a web3 connection"""
+    tracker = _trackers.get(w3)
+    if tracker is None:
+        tracker = ReceiptTracker(w3)
+        _trackers[w3] = tracker
+    return tracker
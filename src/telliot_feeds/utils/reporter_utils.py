@@ -1,9 +1,12 @@
+import asyncio
 import json
 import random
 from typing import Any
+from typing import Awaitable
 from typing import Callable
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import click
@@ -13,6 +16,7 @@ from eth_typing import ChecksumAddress
 from telliot_core.contract.contract import Contract
 from telliot_core.directory import ContractInfo
 from telliot_core.model.endpoints import RPCEndpoint
+from telliot_core.utils.response import ResponseStatus
 from telliot_core.fetch.fetchflex.oracle import FetchFlexOracleContract
 from telliot_core.fetch.fetchx.oracle import FetchxOracleContract
 from web3 import Web3
@@ -87,6 +91,23 @@ async def is_online() -> bool:
         return False
 
 
+async def gather_until_failure(*aws: Awaitable[Tuple[Any, ResponseStatus]]) -> Tuple[List[Any], ResponseStatus]:
+    """Run awaitables returning (result, ResponseStatus) concurrently
+
+    Returns the results in order, or the status of the first one to fail,
+    in which case the others are cancelled."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            _, status = await next_done
+            if not status.ok:
+                return [], status
+        return [task.result()[0] for task in tasks], ResponseStatus()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 def alert_placeholder(msg: str) -> None:
     """Dummy alert function"""
     pass
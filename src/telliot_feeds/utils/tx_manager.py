@@ -0,0 +1,262 @@
+"""Replace-by-fee for pending transactions.
+
+Sent transactions are watched block by block through the shared receipt
+tracker instead of blocking on `wait_for_transaction_receipt`. A transaction
+still pending `RBF_BUMP_AFTER_BLOCKS` blocks after it was sent is replaced by
+the same transaction at the same nonce with fees raised by `RBF_FEE_BUMP`
+(nodes only accept replacements paying at least 10% more), up to
+`RBF_MAX_REPLACEMENTS` times. Any of the hashes sent for the nonce may end up
+mined.
+
+A transaction that is no longer needed, e.g. a value for a query someone else
+reported meanwhile, is cancelled instead: a 0 value transfer to the account
+itself replaces it at the same nonce.
+"""
+import asyncio
+import math
+import os
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from chained_accounts import ChainedAccount
+from hexbytes import HexBytes
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+from web3.datastructures import AttributeDict
+
+from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.nonce_manager import NonceManager
+from telliot_feeds.utils.receipt_tracker import get_receipt_tracker
+from telliot_feeds.utils.receipt_tracker import ReceiptTracker
+
+
+logger = get_logger(__name__)
+
+#: Blocks a transaction may stay pending before it's replaced
+RBF_BUMP_AFTER_BLOCKS = int(os.getenv("RBF_BUMP_AFTER_BLOCKS", 3))
+#: Fee multiplier of a replacement
+RBF_FEE_BUMP = float(os.getenv("RBF_FEE_BUMP", 1.125))
+#: Replacements sent for one nonce at most
+RBF_MAX_REPLACEMENTS = int(os.getenv("RBF_MAX_REPLACEMENTS", 5))
+
+FEE_FIELDS = ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas")
+
+
+def bump_fees(tx: Dict[str, Any], factor: float) -> Dict[str, Any]:
+    """Copy of a transaction with fees multiplied by `factor`, and raised by 1 wei at least"""
+    bumped = dict(tx)
+    for key in FEE_FIELDS:
+        if key in tx:
+            bumped[key] = max(math.ceil(tx[key] * factor), tx[key] + 1)
+    return bumped
+
+
+@dataclass
+class Submission:
+    """Transactions sent for one nonce"""
+
+    #: latest transaction sent
+    tx: Dict[str, Any]
+    #: hashes of all transactions sent, latest last
+    hashes: List[HexBytes]
+    sent_block: int
+    replacements: int = 0
+    cancelled: bool = False
+    #: hashes of the cancellation, if any
+    cancel_hashes: List[HexBytes] = field(default_factory=list)
+
+    @property
+    def nonce(self) -> int:
+        return int(self.tx["nonce"])
+
+    @property
+    def tx_hash(self) -> HexBytes:
+        return self.hashes[-1]
+
+
+class TransactionManager:
+    """Send transactions and see them mined, replacing them with higher fees when stuck"""
+
+    def __init__(
+        self,
+        w3: Web3,
+        account: ChainedAccount,
+        nonce_manager: NonceManager,
+        bump_after_blocks: int = RBF_BUMP_AFTER_BLOCKS,
+        fee_bump: float = RBF_FEE_BUMP,
+        max_replacements: int = RBF_MAX_REPLACEMENTS,
+        receipt_tracker: Optional[ReceiptTracker] = None,
+    ) -> None:
+        self.w3 = w3
+        self.account = account
+        self.nonce_manager = nonce_manager
+        self.bump_after_blocks = bump_after_blocks
+        self.fee_bump = fee_bump
+        self.max_replacements = max_replacements
+        self.receipts = receipt_tracker or get_receipt_tracker(w3)
+
+    async def _block_number(self) -> int:
+        return await asyncio.to_thread(lambda: self.w3.eth.block_number)
+
+    async def _send_raw(self, tx: Dict[str, Any]) -> HexBytes:
+        """Sign and send a transaction, the account must be unlocked"""
+        signed = self.account.local_account.sign_transaction(tx)
+        tx_hash: HexBytes = await asyncio.to_thread(self.w3.eth.send_raw_transaction, signed.rawTransaction)
+        return tx_hash
+
+    async def send(self, tx: Dict[str, Any]) -> Tuple[Optional[Submission], ResponseStatus]:
+        """Sign and send a transaction, its nonce already set
+
+        The account must be unlocked. The nonce is not given back on failure."""
+        try:
+            tx_hash = await self._send_raw(tx)
+        except Exception as e:
+            return None, error_status("Send transaction failed", log=logger.error, e=e)
+        self.nonce_manager.track(int(tx["nonce"]), tx_hash)
+        try:
+            sent_block = await self._block_number()
+        except Exception as e:
+            logger.warning(f"Unable to get block number: {e}")
+            sent_block = 0
+        return Submission(tx=tx, hashes=[tx_hash], sent_block=sent_block), ResponseStatus()
+
+    async def replace(self, submission: Submission, block: int) -> None:
+        """Send the pending transaction again with bumped fees"""
+        tx = bump_fees(submission.tx, self.fee_bump)
+        try:
+            tx_hash = await self._send_raw(tx)
+        except Exception as e:
+            # e.g. mined meanwhile (nonce too low), or still underpriced: the next block decides
+            logger.warning(f"Replacement of transaction with nonce {submission.nonce} failed: {e}")
+            return
+        (submission.cancel_hashes if submission.cancelled else submission.hashes).append(tx_hash)
+        submission.tx = tx
+        submission.sent_block = block
+        submission.replacements += 1
+        self.nonce_manager.track(submission.nonce, tx_hash)
+        logger.info(
+            f"Replaced transaction with nonce {submission.nonce}: {tx_hash.hex()} "
+            f"({', '.join(f'{key}: {tx[key]}' for key in FEE_FIELDS if key in tx)})"
+        )
+
+    async def cancel(self, submission: Submission, block: int) -> None:
+        """Replace the pending transaction by a 0 value transfer to the account itself"""
+        tx = {
+            "to": submission.tx.get("from") or Web3.toChecksumAddress(self.account.address),
+            "value": 0,
+            "data": b"",
+            "gas": 21000,
+            "nonce": submission.nonce,
+            "chainId": submission.tx["chainId"],
+            **{key: submission.tx[key] for key in FEE_FIELDS if key in submission.tx},
+        }
+        submission.tx = tx
+        submission.cancelled = True
+        logger.info(f"Cancelling transaction with nonce {submission.nonce}, no longer needed")
+        await self.replace(submission, block)
+
+    async def wait(
+        self,
+        submission: Submission,
+        timeout: float,
+        still_needed: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> Tuple[Optional[AttributeDict[str, Any]], ResponseStatus]:
+        """Wait for a transaction sent for the nonce to be mined, replacing it when stuck
+
+        Args:
+            submission: transaction sent with `send`
+            timeout: seconds to wait for
+            still_needed: checked before replacing, the transaction is cancelled if False
+
+        Returns:
+            receipt of the mined transaction, and an error status if it
+            reverted, was cancelled or wasn't mined in time
+        """
+        deadline = time.monotonic() + timeout
+        watched: Dict[HexBytes, "asyncio.Future[AttributeDict[str, Any]]"] = {}
+        try:
+            while True:
+                for tx_hash in submission.hashes + submission.cancel_hashes:
+                    if tx_hash not in watched:
+                        watched[tx_hash] = self.receipts.watch(tx_hash)
+                receipt = self._mined_receipt(watched)
+                if receipt is not None:
+                    self.nonce_manager.confirm(submission.nonce)
+                    return receipt, self._receipt_status(submission, receipt)
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    block = await asyncio.wait_for(self.receipts.next_block(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                # receipts of the block were just looked up, replacing a mined transaction would reuse its nonce
+                if self._mined_receipt(watched) is None and block - submission.sent_block >= self.bump_after_blocks:
+                    await self._unstick(
+                        submission, block, still_needed, lambda: self._mined_receipt(watched) is not None
+                    )
+        finally:
+            for tx_hash, future in watched.items():
+                if not future.done():
+                    self.receipts.forget(tx_hash)
+
+        msg = f"Transaction with nonce {submission.nonce} not mined after {timeout}s ({submission.tx_hash.hex()})"
+        return None, error_status(msg, log=logger.error)
+
+    @staticmethod
+    def _mined_receipt(
+        watched: Dict[HexBytes, "asyncio.Future[AttributeDict[str, Any]]"]
+    ) -> Optional[AttributeDict[str, Any]]:
+        return next((f.result() for f in watched.values() if f.done() and not f.cancelled()), None)
+
+    async def _unstick(
+        self,
+        submission: Submission,
+        block: int,
+        still_needed: Optional[Callable[[], Awaitable[bool]]],
+        mined: Callable[[], bool],
+    ) -> None:
+        if not submission.cancelled and still_needed is not None:
+            try:
+                needed = await still_needed()
+            except Exception as e:
+                logger.warning(f"Unable to check if transaction is still needed: {e}")
+                needed = True
+            if mined():
+                # mined during the check
+                return
+            if not needed:
+                await self.cancel(submission, block)
+                return
+        if submission.replacements < self.max_replacements:
+            await self.replace(submission, block)
+
+    @staticmethod
+    def _receipt_status(submission: Submission, receipt: AttributeDict[str, Any]) -> ResponseStatus:
+        if HexBytes(receipt["transactionHash"]) in submission.cancel_hashes:
+            return error_status("Transaction cancelled, no longer needed", log=logger.info)
+        if receipt["status"] == 0:
+            return error_status(f"Transaction reverted ({HexBytes(receipt['transactionHash']).hex()})")
+        return ResponseStatus()
+
+    async def submit(
+        self,
+        tx: Dict[str, Any],
+        timeout: float,
+        still_needed: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> Tuple[Optional[AttributeDict[str, Any]], ResponseStatus]:
+        """Send a transaction and wait for it, see `send` and `wait`"""
+        submission, status = await self.send(tx)
+        if submission is None:
+            return None, status
+        return await self.wait(submission, timeout, still_needed)
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.reporters.feed_scheduler import FeedScheduler
+from telliot_feeds.reporters.feed_scheduler import ScheduledFeed
+from telliot_feeds.reporters.interval import IntervalReporter
+from telliot_feeds.reporters.interval import PreparedReport
+
+
+TIPS = {"a": 1, "b": 3, "c": 2, "d": None}
+
+
+def scheduled_reporter():
+    r = IntervalReporter(
+        endpoint=mock.Mock(),
+        account=mock.Mock(address="0x0000000000000000000000000000000000000001"),
+        chain_id=1,
+        master=mock.Mock(),
+        oracle=mock.Mock(),
+        legacy_gas_price=1,
+        gas_limit=100_000,
+    )
+    r.ensure_staked = mock.AsyncMock(return_value=(True, ResponseStatus()))
+    r.check_reporter_lock = mock.AsyncMock(
+        side_effect=[ResponseStatus(), error_status("Current address is in reporter lock.")]
+    )
+    feeds = [
+        ScheduledFeed(datafeed=SimpleNamespace(query=SimpleNamespace(descriptor=name)), interval=60) for name in TIPS
+    ]
+    return r, feeds
+
+
+def patch_reports(in_flight, submitted, prepare_delay=0.01, mined=None):
+    async def prepare_report(self):
+        name = self.datafeed.query.descriptor
+        in_flight.append(name)
+        await asyncio.sleep(prepare_delay)
+        in_flight.remove(name)
+        if TIPS[name] is None:
+            return None, error_status("not profitable")
+        self.gas_info["gas_limit"] = TIPS[name]
+        report = PreparedReport(
+            datafeed=self.datafeed, template=None, value=b"", report_count=0, gas_limit=0, fee_params={}, tip=TIPS[name]
+        )
+        return report, ResponseStatus()
+
+    async def send_report(self, report):
+        submitted.append(self.datafeed.query.descriptor)
+        return object(), ResponseStatus()
+
+    async def confirm_report(self, report, submission):
+        if mined is not None:
+            await mined.wait()
+        return None, ResponseStatus()
+
+    return (
+        mock.patch.object(IntervalReporter, "prepare_report", autospec=True, side_effect=prepare_report),
+        mock.patch.multiple(IntervalReporter, send_report=send_report, confirm_report=confirm_report),
+    )
+
+
+@pytest.mark.asyncio
+async def test_report_due_submits_by_tip():
+    r, feeds = scheduled_reporter()
+    scheduler = FeedScheduler(r, feeds)
+    in_flight, submitted, max_in_flight = [], [], []
+
+    async def watch():
+        while True:
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(0.001)
+
+    patch_prepare, patch_submit = patch_reports(in_flight, submitted)
+    for feed in feeds:
+        feed.reporter.last_submission_timestamp = 1
+    watcher = asyncio.create_task(watch())
+    with patch_prepare, patch_submit:
+        results = await scheduler.report_due()
+    watcher.cancel()
+
+    # prepared concurrently, submitted by expected tip, the lowest one was in reporter lock by then
+    assert max(max_in_flight) == 4
+    assert submitted == ["b", "c"]
+    assert r.check_reporter_lock.await_count == 2
+    # the staker info was read again along with the reporter lock
+    assert r.ensure_staked.await_count == 2
+    statuses = {feed.datafeed.query.descriptor: status for feed, status in results}
+    assert statuses["a"].error == "Current address is in reporter lock."
+    assert statuses["d"].error == "not profitable"
+    assert statuses["b"].ok and statuses["c"].ok
+
+    # feeds have their own gas info, and share the nonce and transaction managers
+    assert [feed.reporter.gas_info["gas_limit"] for feed in feeds[:3]] == [1, 3, 2]
+    assert not r.gas_info
+    assert all(feed.reporter.nonce_manager is r.nonce_manager for feed in feeds)
+    assert all(feed.reporter.tx_manager is r.tx_manager for feed in feeds)
+    # the reporter lock of every feed is read again after the submissions
+    assert all(feed.reporter.last_submission_timestamp == 0 for feed in feeds)
+
+    # next reports are scheduled
+    assert all(feed.next_report > time.monotonic() + 59 for feed in feeds)
+    assert await scheduler.report_due() == []
+
+
+@pytest.mark.asyncio
+async def test_feed_reported_once_at_a_time():
+    r, feeds = scheduled_reporter()
+    scheduler = FeedScheduler(r, feeds[:3])
+    in_flight, submitted = [], []
+
+    patch_prepare, patch_submit = patch_reports(in_flight, submitted, prepare_delay=0.05)
+    with patch_prepare, patch_submit:
+        first = asyncio.create_task(scheduler.report_due(feeds[:2]))
+        await asyncio.sleep(0.01)
+        # a and b are being reported
+        second = await scheduler.report_due()
+        await first
+
+    assert [feed for feed, _ in second] == [feeds[2]]
+    # two submissions, the third one was in reporter lock
+    assert len(submitted) == len(set(submitted)) == 2
+
+
+@pytest.mark.asyncio
+async def test_no_report_sent_while_one_is_pending():
+    r, feeds = scheduled_reporter()
+    scheduler = FeedScheduler(r, feeds[:3])
+    in_flight, submitted, mined = [], [], asyncio.Event()
+
+    patch_prepare, patch_submit = patch_reports(in_flight, submitted, mined=mined)
+    with patch_prepare, patch_submit:
+        task = asyncio.create_task(scheduler.report_due())
+        while not submitted:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        # the highest tip was sent, the submit lock isn't held while it's mined
+        assert submitted == ["b"]
+        assert scheduler.in_flight == 1
+        assert not scheduler._submit_lock.locked()
+        mined.set()
+        results = await task
+
+    statuses = {feed.datafeed.query.descriptor: status for feed, status in results}
+    assert statuses["b"].ok
+    assert statuses["a"].error == "Not submitting a, a submission is pending"
+    assert statuses["c"].error == "Not submitting c, a submission is pending"
+    assert scheduler.in_flight == 0
+    r.check_reporter_lock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_feeds_stake_one_at_a_time():
+    r, feeds = scheduled_reporter()
+    in_flight, max_in_flight = [], []
+
+    async def ensure_staked():
+        in_flight.append(1)
+        max_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        return True, ResponseStatus()
+
+    r.ensure_staked = ensure_staked
+    scheduler = FeedScheduler(r, feeds)
+
+    statuses = await asyncio.gather(*[feed.reporter.check_staked() for feed in scheduler.feeds])
+
+    assert all(status.ok for status in statuses)
+    assert max_in_flight == [1, 1, 1, 1]
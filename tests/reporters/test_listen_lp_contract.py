@@ -0,0 +1,171 @@
+"""
+Tests covering the asyncio LP Sync event listener used by managed feeds.
+"""
+import asyncio
+import itertools
+import json
+import time
+from unittest import mock
+
+import pytest
+import websockets
+from eth_abi import encode_abi
+
+from telliot_feeds.reporters.ListenLPContract import Contract
+from telliot_feeds.reporters.ListenLPContract import ListenLPContract
+from telliot_feeds.sources.price.spot.pulsechain_pulsex import get_price_and_tvl
+from telliot_feeds.sources.price_aggregator import weighted_average
+
+
+def sync_log(address, reserve0, reserve1):
+    return {"address": address, "data": "0x" + encode_abi(["uint112", "uint112"], [reserve0, reserve1]).hex()}
+
+
+def lp_contract(address, reserves):
+    contract = mock.Mock(address=address)
+    if address in reserves:
+        contract.functions.getReserves.return_value.call.return_value = (*reserves[address], 0)
+    else:
+        contract.functions.getReserves.return_value.call.side_effect = ValueError("execution reverted")
+    return contract
+
+
+def make_listener(prices, current_report_time, logs=None, reserves=None):
+    """Listener on a mocked RPC that serves the given price sequence and LP reserves"""
+    prices = iter(prices)
+
+    async def fetch_new_datapoint():
+        return next(prices), None
+
+    w3 = mock.Mock()
+    w3.eth.get_block_number.side_effect = itertools.count(100)
+    w3.eth.contract.side_effect = lambda address, abi: lp_contract(address, reserves or {})
+    w3.eth.get_logs.side_effect = lambda f: [log for log in (logs or []) if log["address"] in f["address"]]
+
+    def init_contract(self, endpoint_url):
+        self.w3 = w3
+
+    with mock.patch.object(Contract, "__init__", init_contract):
+        return ListenLPContract(
+            sync_event=asyncio.Event(),
+            time_limit_event=asyncio.Event(),
+            is_submitting_report=asyncio.Event(),
+            current_report_time=current_report_time,
+            fetch_new_datapoint=fetch_new_datapoint,
+        )
+
+
+@pytest.mark.asyncio
+async def test_sync_event_triggers_report():
+    """Sync events update the LP reserves and the price is recomputed from them"""
+    usdt_pair, usdc_pair, dai_pair = ListenLPContract.DEFAULT_LP_ADDRESSES
+    reserves = {
+        usdt_pair: (10**12, 10**26),
+        usdc_pair: (2 * 10**12, 2 * 10**26),
+        dai_pair: (10**26, 10**24),
+    }
+    logs = [
+        sync_log(usdt_pair, 10**12, 10**26),
+        sync_log(dai_pair, 10**26, 10**24),
+        sync_log(usdt_pair, 3 * 10**12, 10**26),
+    ]
+    listener = make_listener([], {"timestamp": time.time()}, logs, reserves)
+    listener.fetch_new_datapoint = mock.AsyncMock(side_effect=listener.fetch_new_datapoint)
+    await listener.initialize_price()
+    assert listener.previous_value == pytest.approx(0.01, rel=1e-2)
+
+    tasks = listener.listen_sync_events()
+    await asyncio.wait_for(listener.sync_event.wait(), 5)
+
+    # one getLogs call for all pairs and no price fetch from the datafeed sources
+    assert listener.w3.eth.get_logs.call_count == 1
+    assert listener.fetch_new_datapoint.await_count == 0
+    assert listener.reserves == {
+        usdt_pair: (3 * 10**12, 10**26),
+        usdc_pair: reserves[usdc_pair],
+        dai_pair: reserves[dai_pair],
+    }
+    assert not listener.time_limit_event.is_set()
+    assert listener.previous_value > 0.01
+    prices_and_tvls = [get_price_and_tvl(c, *listener.reserves[a]) for c, a in zip(["usdt", "usdc", "dai"], reserves)]
+    assert listener.previous_value == weighted_average(
+        [float(p) for p, _ in prices_and_tvls], [tvl for _, tvl in prices_and_tvls]
+    )
+    await listener.stop()
+    assert all(task.done() for task in tasks)
+
+
+def test_lp_currencies_follow_listened_pairs(monkeypatch):
+    """LP currencies come from the pair names of the listened LPs, whatever their order"""
+    usdt_pair, usdc_pair, dai_pair = ListenLPContract.DEFAULT_LP_ADDRESSES
+    unknown_pair = "0x" + "11" * 20
+    monkeypatch.setenv("PLS_ADDR_SOURCES", ",".join([dai_pair, unknown_pair, usdt_pair]))
+    monkeypatch.setenv("PLS_LPS_ORDER", "wpls/dai,wpls/hex,usdt/wpls")
+    with mock.patch("telliot_feeds.reporters.ListenLPContract.logger") as logger:
+        listener = make_listener([], {"timestamp": time.time()})
+
+    assert listener.lps_currency == {dai_pair: "dai", usdt_pair: "usdt"}
+    assert usdc_pair not in listener.lps_config
+    logger.warning.assert_called_once()
+    assert unknown_pair.lower() in logger.warning.call_args[0][0].lower()
+
+
+@pytest.mark.asyncio
+async def test_time_limit_triggers_report(monkeypatch):
+    monkeypatch.setenv("REPORT_TIME_LIMIT", "60")
+    listener = make_listener([1.0, 1.0], {"timestamp": time.time() - 120})
+    await listener.initialize_price()
+
+    listener.listen_sync_events()
+    await asyncio.wait_for(listener.sync_event.wait(), 5)
+
+    assert listener.time_limit_event.is_set()
+    await listener.stop()
+
+
+@pytest.mark.asyncio
+async def test_subscription_mode_with_polling_fallback(monkeypatch):
+    """Sync logs pushed over the websocket are handled right away; polling takes over on disconnect"""
+    pair0 = ListenLPContract.DEFAULT_LP_ADDRESSES[0]
+    requests = []
+    disconnect = asyncio.Event()
+
+    async def node(ws, path):
+        request = json.loads(await ws.recv())
+        requests.append(request)
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": "0xsub"}))
+        log = dict(sync_log(pair0.lower(), 10**12, 10**26), blockNumber="0x66", removed=False)
+        await ws.send(
+            json.dumps(
+                {"jsonrpc": "2.0", "method": "eth_subscription", "params": {"subscription": "0xsub", "result": log}}
+            )
+        )
+        await disconnect.wait()
+
+    server = await websockets.serve(node, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    monkeypatch.setenv("LP_PULSE_WS_URL", f"ws://127.0.0.1:{port}")
+    monkeypatch.setenv("LP_WS_RETRY_INTERVAL", "60")
+
+    listener = make_listener([1.0, 1.5, 1.5], {"timestamp": time.time()})
+    await listener.initialize_price()
+    listener.listen_sync_events()
+
+    await asyncio.wait_for(listener.sync_event.wait(), 5)
+    assert requests[0]["method"] == "eth_subscribe"
+    assert requests[0]["params"][1]["address"] == [lp.address for lp in listener.lps_contracts]
+    assert listener.reserves == {pair0: (10**12, 10**26)}
+    assert listener.from_block >= 0x66
+    # only the catch-up poll after subscribing
+    assert listener.w3.eth.get_logs.call_count == 1
+
+    disconnect.set()
+    server.close()
+    await server.wait_closed()
+    for _ in range(50):
+        if listener.w3.eth.get_logs.call_count > 1:
+            break
+        await asyncio.sleep(0.1)
+    assert listener.w3.eth.get_logs.call_count == 2
+
+    await listener.stop()
@@ -0,0 +1,208 @@
+import asyncio
+import itertools
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+import telliot_core
+from hexbytes import HexBytes
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+
+from telliot_feeds.reporters.custom_reporter import CustomXReporter
+from telliot_feeds.reporters.interval import IntervalReporter
+from telliot_feeds.reporters.submit_template import SubmitValueTemplate
+
+
+ORACLE_ADDRESS = "0x0000000000000000000000000000000000000002"
+with open(f"{telliot_core.__path__[0]}/data/abi/tellorflex-oracle-abi.json") as f:
+    ORACLE_ABI = json.load(f)
+
+
+def pipeline_reporter(staked_delay=0.05, staked=True, profitable=False):
+    """IntervalReporter with slow staking checks and price fetch, stopping at the profitability check"""
+    in_flight = []
+
+    async def slow(name, delay, result):
+        in_flight.append(name)
+        await asyncio.sleep(delay)
+        in_flight.remove(name)
+        return result
+
+    async def fetch_new_datapoint():
+        source.latest = await slow("price", 0.05, (1.0, None))
+
+    source = SimpleNamespace(latest=(None, None), fetch_new_datapoint=fetch_new_datapoint)
+    query = SimpleNamespace(
+        descriptor="q", query_id=b"q" * 32, query_data=b"d", value_type=mock.Mock(encode=lambda value: b"v")
+    )
+    r = IntervalReporter(
+        endpoint=mock.Mock(),
+        account=mock.Mock(address="0x0000000000000000000000000000000000000001"),
+        chain_id=1,
+        master=mock.Mock(),
+        oracle=SimpleNamespace(contract=Web3().eth.contract(address=ORACLE_ADDRESS, abi=ORACLE_ABI)),
+        datafeed=SimpleNamespace(query=query, source=source),
+        legacy_gas_price=1,
+        gas_limit=100_000,
+    )
+    staked_status = ResponseStatus() if staked else error_status("not staked")
+    r.ensure_staked = lambda: slow("staked", staked_delay, (staked, staked_status))
+    r.check_reporter_lock = lambda: slow("lock", 0.01, ResponseStatus())
+    r.get_num_reports_by_id = lambda query_id: slow("count", 0.01, (3, ResponseStatus()))
+    r.web3.eth.get_transaction_count.return_value = 7
+    profitability_checks = []
+
+    async def ensure_profitable(datafeed):
+        profitability_checks.append(datafeed)
+        return ResponseStatus() if profitable else error_status("not profitable")
+
+    r.ensure_profitable = ensure_profitable
+    return r, in_flight, profitability_checks
+
+
+@pytest.mark.asyncio
+async def test_report_once_pipelined():
+    r, in_flight, profitability_checks = pipeline_reporter()
+    seen = set()
+
+    async def watch():
+        while True:
+            seen.add(frozenset(in_flight))
+            await asyncio.sleep(0.005)
+
+    watcher = asyncio.create_task(watch())
+    with mock.patch.object(SubmitValueTemplate, "build", autospec=True) as build:
+        _, status = await r.report_once()
+    watcher.cancel()
+
+    assert status.error == "not profitable"
+    # staking ran first, on its own, then the reporter lock check and the price fetch ran at the same time
+    assert frozenset({"staked"}) in seen
+    assert not any("staked" in names and len(names) > 1 for names in seen)
+    assert any({"lock", "price"} <= names for names in seen)
+    assert profitability_checks
+    # the nonce was looked up during the checks, but not taken
+    build.assert_not_called()
+    assert r.nonce_manager.sync() == 7
+
+
+@pytest.mark.asyncio
+async def test_report_once_reserves_nonce():
+    r, _, _ = pipeline_reporter(profitable=True)
+    # a new block on each look up
+    type(r.web3.eth).block_number = mock.PropertyMock(side_effect=itertools.count(100))
+    r.web3.eth.send_raw_transaction.return_value = HexBytes(b"h")
+    r.web3.eth.get_transaction_receipt.return_value = {"transactionHash": HexBytes(b"h"), "status": 1}
+
+    def build_tx(template, value, report_count, nonce, *args):
+        return {"nonce": nonce}
+
+    with mock.patch.object(SubmitValueTemplate, "build", autospec=True, side_effect=build_tx) as build:
+        _, status = await r.report_once()
+        assert status.ok
+        template = r.submit_templates[b"q" * 32]
+        build.assert_called_once_with(template, b"v", 3, 7, 100_000, 1, {"gasPrice": r.web3.toWei.return_value})
+
+        # the next report takes the next nonce without asking the node
+        _, status = await r.report_once()
+        assert status.ok
+        assert build.call_args[0][3] == 8
+    r.web3.eth.get_transaction_count.assert_called_once()
+    assert not r.nonce_manager.pending
+
+    # a transaction that couldn't be sent gives its nonce back
+    r.web3.eth.send_raw_transaction.side_effect = ValueError("insufficient funds")
+    with mock.patch.object(SubmitValueTemplate, "build", autospec=True, side_effect=build_tx):
+        _, status = await r.report_once()
+    assert status.error.startswith("Send transaction failed")
+    assert r.nonce_manager.sync() == 9
+
+    # no longer needed once someone else reported
+    assert await r.is_report_needed(b"q" * 32, 3)
+    assert not await r.is_report_needed(b"q" * 32, 2)
+
+
+@pytest.mark.asyncio
+async def test_unmined_report_resyncs_nonce():
+    r, _, _ = pipeline_reporter(profitable=True)
+    r.tx_timeout = 0.1
+    type(r.web3.eth).block_number = mock.PropertyMock(side_effect=itertools.count(100))
+    r.web3.eth.send_raw_transaction.return_value = HexBytes(b"h")
+    r.web3.eth.get_transaction_receipt.return_value = None
+
+    with mock.patch.object(SubmitValueTemplate, "build", autospec=True, return_value={"nonce": 7}):
+        tx_receipt, status = await r.report_once()
+
+    assert tx_receipt is None
+    assert not status.ok
+    # the transaction may still be mined, the next nonce comes from the node
+    r.web3.eth.get_transaction_count.return_value = 8
+    assert r.nonce_manager.sync() == 8
+    assert r.web3.eth.get_transaction_count.call_count == 2
+
+
+def test_acct_nonce_read_from_node():
+    r, _, _ = pipeline_reporter()
+    r.web3.eth.get_transaction_count.side_effect = [7, 8]
+    # reporters signing transactions themselves don't go through the nonce manager
+    assert r.get_acct_nonce() == (7, mock.ANY)
+    assert r.get_acct_nonce() == (8, mock.ANY)
+
+
+@pytest.mark.asyncio
+async def test_report_once_stops_at_first_failure():
+    r, in_flight, profitability_checks = pipeline_reporter(staked_delay=0, staked=False)
+    r.datafeed.source.fetch_new_datapoint = mock.AsyncMock(side_effect=lambda: asyncio.sleep(60))
+
+    _, status = await asyncio.wait_for(r.report_once(), 1)
+
+    assert status.error == "not staked"
+    assert not profitability_checks
+
+
+def test_fee_estimates_from_fee_oracle():
+    r, _, _ = pipeline_reporter()
+    r.web3.toWei = Web3.toWei
+    gwei = 10**9
+    history = {
+        "oldestBlock": 91,
+        "baseFeePerGas": [150 * gwei + n for n in range(11)],
+        "reward": [[(n % 4) * gwei, 2 * gwei, 3 * gwei, 4 * gwei] for n in range(10)],
+    }
+    eth = r.web3.eth
+    eth.block_number = 100
+    eth.fee_history.return_value = history
+    eth.get_block.return_value = {"baseFeePerGas": history["baseFeePerGas"][-2]}
+
+    expected = r.estimate_fees()
+    r.fee_oracle.update()
+    eth.reset_mock()
+
+    # same estimates, without RPC calls
+    assert r.estimate_fees() == expected
+    assert r.get_fee_info() == (1.5, (150 * gwei + 10) / 1e9 + 1.5)
+    eth.get_block.assert_not_called()
+    eth.fee_history.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_custom_reporter_sets_up_transactions():
+    r = CustomXReporter(
+        custom_contract=mock.Mock(address="0x0000000000000000000000000000000000000003"),
+        endpoint=mock.Mock(),
+        account=mock.Mock(address="0x0000000000000000000000000000000000000001"),
+        chain_id=1,
+        master=mock.Mock(),
+        oracle=mock.Mock(),
+        transaction_type=2,
+    )
+    # nonces are the signing account's, not the custom contract's
+    assert r.nonce_manager.address == "0x0000000000000000000000000000000000000001"
+    assert r.tx_manager.nonce_manager is r.nonce_manager
+    assert not r.fee_oracle.fresh
+    r.web3.eth.fee_history.side_effect = ValueError("no fee history")
+    assert r.get_fee_info() == (None, None)
+    await r.fee_oracle.stop()
@@ -0,0 +1,68 @@
+import json
+from unittest import mock
+
+import pytest
+import telliot_core
+from web3 import Web3
+
+from telliot_feeds.reporters.submit_template import get_submit_template
+from telliot_feeds.reporters.submit_template import SUBMIT_GAS_MARGIN
+from telliot_feeds.reporters.submit_template import SubmitValueTemplate
+
+
+ORACLE_ADDRESS = "0x0000000000000000000000000000000000000002"
+REPORTER = "0x0000000000000000000000000000000000000003"
+with open(f"{telliot_core.__path__[0]}/data/abi/tellor360-oracle-abi.json") as f:
+    oracle = Web3().eth.contract(address=ORACLE_ADDRESS, abi=json.load(f))
+
+query_id = bytes(range(32))
+query_data = b"query data " * 7
+
+
+@pytest.mark.parametrize("value", [b"", b"\x01", b"\xff" * 32, b"\x02" * 33, bytes(range(200))])
+def test_calldata_matches_abi_encoding(value):
+    template = SubmitValueTemplate(oracle, query_id, query_data)
+    expected = oracle.get_function_by_name("submitValue")(
+        _queryId=query_id, _value=value, _nonce=12345, _queryData=query_data
+    )._encode_transaction_data()
+
+    assert "0x" + template.calldata(value, 12345).hex() == expected
+
+
+def test_gas_estimated_once_per_value_size():
+    template = SubmitValueTemplate(oracle, query_id, query_data)
+    w3 = mock.Mock()
+    w3.eth.estimate_gas.side_effect = [100_000, 120_000, 101_000]
+
+    assert template.estimate_gas(w3, REPORTER, b"\x01" * 32, 1) == int(100_000 * SUBMIT_GAS_MARGIN)
+    assert template.estimate_gas(w3, REPORTER, b"\x02" * 20, 2) == int(100_000 * SUBMIT_GAS_MARGIN)
+    assert template.estimate_gas(w3, REPORTER, b"\x03" * 64, 3) == int(120_000 * SUBMIT_GAS_MARGIN)
+    assert w3.eth.estimate_gas.call_count == 2
+    w3.eth.estimate_gas.assert_called_with(
+        {"from": REPORTER, "to": ORACLE_ADDRESS, "data": template.calldata(b"\x03" * 64, 3)}
+    )
+
+    # after a revert
+    template.forget_gas_limits()
+    assert template.estimate_gas(w3, REPORTER, b"\x01" * 32, 4) == int(101_000 * SUBMIT_GAS_MARGIN)
+
+    tx = template.build(b"\x01", 4, 7, 110_000, 1, {"gasPrice": 10})
+    assert tx == {
+        "to": ORACLE_ADDRESS,
+        "value": 0,
+        "data": template.calldata(b"\x01", 4),
+        "nonce": 7,
+        "gas": 110_000,
+        "chainId": 1,
+        "gasPrice": 10,
+    }
+
+
+def test_get_submit_template():
+    templates = {}
+    template = get_submit_template(templates, oracle, query_id, query_data)
+    assert templates == {query_id: template}
+    assert get_submit_template(templates, oracle, query_id, query_data) is template
+
+    other = Web3().eth.contract(address=ORACLE_ADDRESS, abi=[])
+    assert get_submit_template({}, other, query_id, query_data) is None
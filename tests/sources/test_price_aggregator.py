@@ -0,0 +1,94 @@
+import asyncio
+import dataclasses
+import time
+from unittest import mock
+
+import pytest
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.feeds.eth_usd_feed import eth_usd_median_feed
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.sources.price_aggregator import PriceAggregator
+
+
+class DelayedPriceService(WebPriceService):
+    """Price service answering a fixed price after a delay"""
+
+    def __init__(self, price, delay, **kwargs):
+        kwargs["name"] = "Delayed"
+        kwargs["url"] = ""
+        super().__init__(**kwargs)
+        self.price = price
+        self.delay = delay
+        self.cancelled = False
+
+    async def get_price(self, asset, currency):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.price, datetime_now_utc()
+
+
+def delayed_source(price, delay):
+    return PriceSource(asset="eth", currency="usd", service=DelayedPriceService(price, delay))
+
+
+@pytest.mark.asyncio
+async def test_aggregator_quorum_early_exit():
+    """Stragglers are cancelled once the quorum of valid prices is reached"""
+    sources = [delayed_source(1.0, 0), delayed_source(None, 0), delayed_source(3.0, 0.05), delayed_source(99.0, 30)]
+    agg = PriceAggregator(asset="eth", currency="usd", algorithm="median", sources=sources, quorum=2)
+
+    v, _ = await asyncio.wait_for(agg.fetch_new_datapoint(), 5)
+
+    assert v == 2.0
+    assert agg.contributing_sources == sources[0:1] + sources[2:3]
+    await asyncio.sleep(0)
+    assert sources[3].service.cancelled
+
+
+@pytest.mark.asyncio
+async def test_aggregator_deadline():
+    """Prices received before the deadline are aggregated"""
+    sources = [delayed_source(1.0, 0), delayed_source(2.0, 0.01), delayed_source(99.0, 30)]
+    agg = PriceAggregator(asset="eth", currency="usd", algorithm="mean", sources=sources, deadline=0.5)
+
+    v, _ = await asyncio.wait_for(agg.fetch_new_datapoint(), 5)
+
+    assert v == 1.5
+    assert agg.contributing_sources == sources[:2]
+
+    # nothing arrives in time
+    agg = PriceAggregator(asset="eth", currency="usd", sources=[delayed_source(1.0, 30)], deadline=0.05)
+    assert await agg.fetch_new_datapoint() == (None, None)
+    assert agg.contributing_sources == []
+
+
+@pytest.mark.asyncio
+async def test_eth_usd_deadline_with_blocked_source():
+    """A web source whose request hangs doesn't delay the ETH/USD median past the deadline"""
+    responses = {
+        "/simple/price": {"ethereum": {"usd": 1500.0}},
+        "/api/v1/klines": [[0, "1", "1", "1", "1501.0"]],
+        "/products/eth-usd/ticker": {"price": "1502.0"},
+        "/v1/pubticker/ethusd": {"bid": "1503", "ask": "1503", "last": "1503.0", "volume": {}},
+    }
+
+    async def get_json(url, timeout, headers=None):
+        for path, response in responses.items():
+            if path in url:
+                return {"response": response}
+        # kraken never answers
+        await asyncio.sleep(30)
+
+    agg = dataclasses.replace(eth_usd_median_feed.source, deadline=0.2, quorum=None)
+    start = time.monotonic()
+    with mock.patch("telliot_feeds.pricing.price_service.get_json", side_effect=get_json):
+        v, _ = await asyncio.wait_for(agg.fetch_new_datapoint(), 5)
+
+    assert time.monotonic() - start < 1
+    assert v == 1501.5
+    assert agg.contributing_sources == agg.sources[:4]
@@ -166,7 +166,7 @@ async def test_bittrex(caplog):
         return {"error": "blah", "exception": Exception("restrictions that prevent you from accessing the site")}
 
     with mock.patch(
-        "telliot_feeds.sources.price.spot.bittrex.BittrexSpotPriceService.get_url", side_effect=mock_get_url
+        "telliot_feeds.sources.price.spot.bittrex.BittrexSpotPriceService.get_url_async", side_effect=mock_get_url
     ):
         v, t = await get_price("btc", "usd", service["bittrex"])
         assert v is None
@@ -178,7 +178,7 @@ async def test_bittrex(caplog):
         return {"error": "bingo", "exception": Exception("bango")}
 
     with mock.patch(
-        "telliot_feeds.sources.price.spot.bittrex.BittrexSpotPriceService.get_url", side_effect=mock_get_url2
+        "telliot_feeds.sources.price.spot.bittrex.BittrexSpotPriceService.get_url_async", side_effect=mock_get_url2
     ):
         v, t = await get_price("btc", "usd", service["bittrex"])
         assert v is None
@@ -197,11 +197,11 @@ async def test_gemini(caplog, monkeypatch):
     else:
         validate_price(v, t)
 
-    # mock GeminiSpotPriceService.get_url() to return None
-    def mock_get_url(*args, **kwargs):
+    # mock GeminiSpotPriceService.get_url_async() to return None
+    async def mock_get_url(*args, **kwargs):
         return None
 
-    monkeypatch.setattr(GeminiSpotPriceService, "get_url", mock_get_url)
+    monkeypatch.setattr(GeminiSpotPriceService, "get_url_async", mock_get_url)
     v, t = await get_price("btc", "usd", service["gemini"])
     assert v is None
     assert t is None
@@ -0,0 +1,146 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from telliot_feeds.sources.price.spot.twap_lp import TWAPLPSpotPriceService
+
+
+class FakeMulticall:
+    """Stand-in for multicall.Multicall answering from the given results"""
+
+    instances = []
+
+    def __init__(self, calls, _w3, block_id=None, require_success=True):
+        self.calls = calls
+        self.block_id = block_id
+        self.multicall_address = "0xcA11bde05977b3631167028862bE2a173976CA11"
+        FakeMulticall.instances.append(self)
+
+    async def coroutine(self):
+        await asyncio.sleep(0.01)
+        results = {"blockNumber": 123, "blockTimestamp": 2**32 + 5000}
+        for call in self.calls:
+            name = call.returns[0][0]
+            if name.endswith("getReserves"):
+                results[name] = (10, 20, 4990)
+            elif name.endswith("CumulativeLast"):
+                results[name] = 7
+        return results
+
+
+class PastBlocksMulticall(FakeMulticall):
+    """FakeMulticall answering with one block per second, the latest being block 10000"""
+
+    async def coroutine(self):
+        block = 10000 if self.block_id is None else self.block_id
+        results = {"blockNumber": block, "blockTimestamp": block}
+        for call in self.calls:
+            name = call.returns[0][0]
+            if name.endswith("getReserves"):
+                results[name] = (10, 20, block)
+            elif name.endswith("CumulativeLast"):
+                results[name] = block
+        return results
+
+
+@pytest.fixture
+def service(monkeypatch, tmp_path):
+    monkeypatch.setattr(TWAPLPSpotPriceService, "_snapshot", None)
+    monkeypatch.setattr(TWAPLPSpotPriceService, "_snapshot_task", None)
+    monkeypatch.setattr(TWAPLPSpotPriceService, "_stores", {})
+    monkeypatch.setattr(TWAPLPSpotPriceService, "_sampler_task", None)
+    monkeypatch.setattr(TWAPLPSpotPriceService, "_backfill_task", None)
+    monkeypatch.chdir(tmp_path)
+    FakeMulticall.instances = []
+    with mock.patch("telliot_feeds.sources.price.spot.twap_lp.Multicall", FakeMulticall):
+        service = TWAPLPSpotPriceService()
+        service.contract_addresses = service._get_contract_address()
+        service.lps_order = service._get_lps_order()
+        yield service
+
+
+@pytest.mark.asyncio
+async def test_single_multicall_for_all_pairs(service):
+    snapshot = await service.multicall_lps(block_id=100)
+
+    assert len(FakeMulticall.instances) == 1
+    mc = FakeMulticall.instances[0]
+    assert mc.block_id == 100
+    # block number + timestamp, then 3 calls per pair
+    assert len(mc.calls) == 2 + 3 * len(service.contract_addresses)
+    assert snapshot["blockNumber"] == 123
+    assert snapshot["blockTimestamp"] == 5000
+    assert snapshot["pairs"] == {currency: (7, 7, 10, 20, 4990) for currency in service.contract_addresses}
+
+
+@pytest.mark.asyncio
+async def test_snapshot_shared_between_pairs(service):
+    other = TWAPLPSpotPriceService()
+    other.contract_addresses = service.contract_addresses
+    other.lps_order = service.lps_order
+
+    results = await asyncio.gather(service.get_currentPrices("dai"), other.get_currentPrices("usdc"))
+    assert len(FakeMulticall.instances) == 1
+
+    # cumulative prices are extrapolated to the block timestamp of the same snapshot
+    for price0, price1, reserve0, reserve1, block_timestamp in results:
+        assert block_timestamp == 5000
+        assert (reserve0, reserve1) == (10, 20)
+        assert price0 == 7 + int((20 / 10) * 2**112) * 10
+
+    # reused while fresh
+    await service.get_currentPrices("usdt")
+    assert len(FakeMulticall.instances) == 1
+    service.SNAPSHOT_MAX_AGE = 0
+    await service.get_currentPrices("usdt")
+    assert len(FakeMulticall.instances) == 2
+
+
+@pytest.mark.asyncio
+async def test_sampler_records_every_pair(service):
+    service.FETCH_LP_INTERVAL = 0.05
+    await service.handleActivateTwapService()
+    await asyncio.sleep(0.03)
+    TWAPLPSpotPriceService._sampler_task.cancel()
+
+    for currency in service.lps_order:
+        store = service._get_store(service._get_pair_json_key(currency))
+        assert [p.blockTimestampLast for p in store] == [4990]
+
+
+@pytest.mark.asyncio
+async def test_backfill_from_past_blocks(service, monkeypatch):
+    w3 = mock.Mock()
+    w3.eth.get_block.side_effect = lambda number: mock.Mock(number=number, timestamp=number)
+    monkeypatch.setattr(TWAPLPSpotPriceService, "w3", property(lambda self: w3))
+    service.TWAP_TIMESPAN = 1800
+    service.FETCH_LP_INTERVAL = 60
+    service.BACKFILL_POINTS = 5
+
+    with mock.patch("telliot_feeds.sources.price.spot.twap_lp.Multicall", PastBlocksMulticall):
+        await service._backfill()
+
+    for currency in service.lps_order:
+        store = service._get_store(service._get_pair_json_key(currency))
+        assert [p.blockTimestampLast for p in store] == [8139, 8511, 8883, 9255, 9627, 10000]
+        # the TWAP window is covered right away
+        assert store.find_before(10000 - 1800) is not None
+
+    # already covered, no more past blocks are sampled
+    w3.eth.get_block.reset_mock()
+    with mock.patch("telliot_feeds.sources.price.spot.twap_lp.Multicall", PastBlocksMulticall):
+        await service._backfill()
+    w3.eth.get_block.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_backfill_without_archive_node(service, monkeypatch):
+    w3 = mock.Mock()
+    w3.eth.get_block.side_effect = ValueError("missing trie node")
+    monkeypatch.setattr(TWAPLPSpotPriceService, "w3", property(lambda self: w3))
+
+    await service._backfill()
+    for currency in service.lps_order:
+        store = service._get_store(service._get_pair_json_key(currency))
+        assert [p.blockTimestampLast for p in store] == [4990]
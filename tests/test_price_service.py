@@ -2,8 +2,17 @@ from unittest import mock
 
 import pytest
 import requests
+from aiohttp import web
 
 from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.sources.price.historical.kraken import KrakenHistoricalPriceService
+from telliot_feeds.sources.price.historical.poloniex import PoloniexHistoricalPriceService
+from telliot_feeds.sources.price.spot.binance import BinanceSpotPriceService
+from telliot_feeds.sources.price.spot.coinbase import CoinbaseSpotPriceService
+from telliot_feeds.sources.price.spot.gemini import GeminiSpotPriceService
+from telliot_feeds.sources.price.spot.kraken import KrakenSpotPriceService
+from telliot_feeds.utils.http_client import close_client_session
+from telliot_feeds.utils.http_client import get_client_session
 
 
 @pytest.mark.asyncio
@@ -26,3 +35,95 @@ async def test_webpriceservice_errors(caplog):
 
         assert "error" in result
         assert "JSON Decode Error" == result["error"]
+
+
+@pytest.mark.asyncio
+async def test_webpriceservice_async_requests():
+    """Async requests of all web price services share one client session"""
+
+    class FakePriceService(WebPriceService):
+        async def get_price(self, asset, currency):
+            return None, None
+
+    async def price(request):
+        return web.json_response({"price": 1.0})
+
+    async def not_json(request):
+        return web.Response(text="<html>rate limited</html>")
+
+    async def graphql(request):
+        body = await request.json()
+        return web.json_response({"data": body["query"]})
+
+    app = web.Application()
+    app.router.add_get("/price", price)
+    app.router.add_get("/html", not_json)
+    app.router.add_post("/graphql", graphql)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        wsp1 = FakePriceService(name="FakePriceService1", url=f"http://127.0.0.1:{port}")
+        wsp2 = FakePriceService(name="FakePriceService2", url=f"http://127.0.0.1:{port}")
+
+        result = await wsp1.get_url_async("/price")
+        assert result == {"response": {"price": 1.0}}
+        session = get_client_session()
+
+        result = await wsp2.get_url_async("/html")
+        assert "error" in result
+        assert "JSON Decode Error" == result["error"]
+        assert get_client_session() is session
+
+        result = await wsp2.post_url_async("/graphql", json_data={"query": "{ token }"})
+        assert result == {"response": {"data": "{ token }"}}
+    finally:
+        await close_client_session()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_historical_services_async_requests():
+    """Historical price services request through the shared client session"""
+    kraken_trades = {"response": {"result": {"XETHZUSD": [["1500.5", "1", 1650000000]]}}}
+    with mock.patch("telliot_feeds.pricing.price_service.get_json", return_value=kraken_trades) as get_json:
+        price, _ = await KrakenHistoricalPriceService(ts=1650000060).get_price("eth", "usd")
+    assert price == 1500.5
+    assert get_json.call_args[0][0] == "https://api.kraken.com/0/public/Trades?pair=ETHUSD&since=1650000000"
+
+    poloniex_trades = {"response": [{"rate": "1500.5"}]}
+    with mock.patch(
+        "telliot_feeds.sources.price.historical.poloniex.get_json", return_value=poloniex_trades
+    ) as get_json:
+        trades, _ = await PoloniexHistoricalPriceService(ts=1650000000).get_trades("eth", "dai")
+    assert trades == [{"rate": "1500.5"}]
+    assert get_json.call_args[0][0].startswith("https://poloniex.com/public?command=returnTradeHistory")
+
+
+@pytest.mark.asyncio
+async def test_spot_services_async_requests():
+    """Spot price services request through the shared client session"""
+    responses = {
+        "https://api.binance.com": [[0, "1", "1", "1", "1500.5"]],
+        "https://api.pro.coinbase.com": {"price": "1500.5"},
+        "https://api.gemini.com": {"bid": "1500", "ask": "1501", "last": "1500.5", "volume": {}},
+        "https://api.kraken.com": {"result": {"XETHZUSD": {"c": ["1500.5"]}}},
+    }
+
+    async def get_json(url, timeout, headers=None):
+        return {"response": next(r for base, r in responses.items() if url.startswith(base))}
+
+    services = [
+        BinanceSpotPriceService(),
+        CoinbaseSpotPriceService(),
+        GeminiSpotPriceService(),
+        KrakenSpotPriceService(),
+    ]
+    with mock.patch("telliot_feeds.pricing.price_service.get_json", side_effect=get_json) as patched:
+        for service in services:
+            price, _ = await service.get_price("eth", "usd")
+            assert price == 1500.5
+    assert patched.call_count == 4
@@ -0,0 +1,188 @@
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+import telliot_core
+from eth_abi import encode_abi
+from eth_abi import encode_single
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.abi import collapse_if_tuple
+
+from telliot_feeds.reporters.tips.listener.autopay_mirror import AutopayMirror
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
+
+
+ABI_DIR = f"{telliot_core.__path__[0]}/data/abi"
+AUTOPAY_ADDRESS = "0x0000000000000000000000000000000000000001"
+ORACLE_ADDRESS = "0x0000000000000000000000000000000000000002"
+
+query_data = b"query data"
+query_id = bytes(Web3.keccak(query_data))
+details = (10, 100, 0, 60, 10, 0, 0, 1)
+feed_id, _ = FundedFeedFilter().generate_ids(QueryIdandFeedDetails(params=FeedDetails(*details), query_data=query_data))
+
+
+def contract(address, abi_file):
+    with open(f"{ABI_DIR}/{abi_file}") as f:
+        web3_contract = Web3().eth.contract(address=address, abi=json.load(f))
+    # view calls are answered by the test
+    return SimpleNamespace(
+        address=address,
+        contract=SimpleNamespace(abi=web3_contract.abi, events=web3_contract.events, functions=mock.Mock()),
+    )
+
+
+def make_log(contract, name, block, index, **args):
+    abi = next(e for e in contract.contract.abi if e.get("type") == "event" and e["name"] == name)
+    topics = [event_abi_to_log_topic(abi)]
+    data_types, data = [], []
+    for arg in abi["inputs"]:
+        if arg["indexed"]:
+            topics.append(encode_single(arg["type"], args[arg["name"]]))
+        else:
+            data_types.append(collapse_if_tuple(arg))
+            data.append(args[arg["name"]])
+    return {
+        "address": contract.address,
+        "topics": [HexBytes(topic) for topic in topics],
+        "data": HexBytes(encode_abi(data_types, data)).hex(),
+        "blockNumber": block,
+        "blockHash": HexBytes(bytes([block]) * 32),
+        "logIndex": index,
+        "transactionIndex": 0,
+        "transactionHash": HexBytes(b"\0" * 32),
+    }
+
+
+class FakeChain:
+    """Blocks and logs answered to the mirror, reorgs change the block hashes"""
+
+    def __init__(self):
+        self.head = 100
+        self.forks = [(0, b"a")]
+        self.logs = []
+
+    def reorg(self, from_block):
+        self.forks.append((from_block, bytes([self.forks[-1][1][0] + 1])))
+
+    def get_block(self, number):
+        number = self.head if number == "latest" else number
+        fork = next(fork for fork_block, fork in reversed(self.forks) if number >= fork_block)
+        return SimpleNamespace(number=number, hash=fork * 31 + bytes([number]))
+
+    def get_logs(self, params):
+        from_block = 0 if params["fromBlock"] == "earliest" else params["fromBlock"]
+        return [log for log in self.logs if from_block <= log["blockNumber"] <= params["toBlock"]]
+
+
+@pytest.fixture
+def mirror():
+    chain = FakeChain()
+    autopay = contract(AUTOPAY_ADDRESS, "tellor360-autopay-abi.json")
+    autopay.node = SimpleNamespace(_web3=SimpleNamespace(eth=chain))
+    autopay.contract.functions.getFundedFeedDetails.return_value.call.return_value = []
+    autopay.contract.functions.getFundedSingleTipsInfo.return_value.call.return_value = [(b"", 0)]
+    oracle = contract(ORACLE_ADDRESS, "tellor360-oracle-abi.json")
+    mirror = AutopayMirror(autopay, oracle)
+    mirror.chain = chain
+    return mirror
+
+
+@pytest.mark.asyncio
+async def test_mirror_applies_autopay_and_oracle_logs(mirror):
+    autopay, oracle, chain = mirror.autopay, mirror.oracle, mirror.chain
+    assert await mirror.sync()
+    assert mirror.block_number == 100
+    assert mirror.funded_feed_details() == []
+
+    chain.head = 102
+    chain.logs = [
+        # feed set up before the bootstrap block
+        make_log(
+            autopay,
+            "NewDataFeed",
+            50,
+            0,
+            _queryId=query_id,
+            _feedId=feed_id,
+            _queryData=query_data,
+            _feedCreator=AUTOPAY_ADDRESS,
+        ),
+        make_log(
+            autopay,
+            "DataFeedFunded",
+            101,
+            0,
+            _queryId=query_id,
+            _feedId=feed_id,
+            _amount=100,
+            _feedFunder=AUTOPAY_ADDRESS,
+            _feedDetails=details,
+        ),
+        make_log(
+            autopay, "TipAdded", 101, 1, _queryId=query_id, _amount=5, _queryData=query_data, _tipper=AUTOPAY_ADDRESS
+        ),
+        make_log(
+            autopay, "TipAdded", 102, 0, _queryId=query_id, _amount=7, _queryData=query_data, _tipper=AUTOPAY_ADDRESS
+        ),
+    ]
+    assert await mirror.sync()
+    assert mirror.funded_feed_details() == [(FeedDetails(*details), query_data)]
+    assert mirror.funded_single_tips() == [(query_data, 12)]
+
+    chain.head = 103
+    chain.logs += [
+        make_log(
+            oracle,
+            "NewReport",
+            103,
+            0,
+            _queryId=query_id,
+            _time=1000,
+            _value=b"\x01",
+            _nonce=1,
+            _queryData=query_data,
+            _reporter=ORACLE_ADDRESS,
+        ),
+        make_log(
+            autopay, "TipClaimed", 103, 1, _feedId=feed_id, _queryId=query_id, _amount=100, _reporter=ORACLE_ADDRESS
+        ),
+    ]
+    assert await mirror.sync()
+    assert mirror.funded_single_tips() == []
+    assert mirror.funded_feed_details() == []
+    assert mirror.state.last_report[query_id].timestamp == 1000
+
+
+@pytest.mark.asyncio
+async def test_mirror_rolls_back_reorged_blocks(mirror):
+    autopay, chain = mirror.autopay, mirror.chain
+    tip = dict(_queryId=query_id, _queryData=query_data, _tipper=AUTOPAY_ADDRESS)
+    assert await mirror.sync()
+
+    chain.head = 101
+    chain.logs = [make_log(autopay, "TipAdded", 101, 0, _amount=5, **tip)]
+    assert await mirror.sync()
+    assert mirror.funded_single_tips() == [(query_data, 5)]
+
+    # block 101 is replaced and the tip lands in block 102 instead
+    chain.reorg(101)
+    chain.head = 102
+    chain.logs = [make_log(autopay, "TipAdded", 102, 0, _amount=3, **tip)]
+    with mock.patch.object(mirror, "_bootstrap") as bootstrap:
+        assert await mirror.sync()
+    bootstrap.assert_not_called()
+    assert [number for number, _, _ in mirror.checkpoints] == [100, 102]
+    assert mirror.funded_single_tips() == [(query_data, 3)]
+
+    # no checkpoint left on the chain
+    chain.reorg(0)
+    chain.head = 103
+    assert await mirror.sync()
+    assert [number for number, _, _ in mirror.checkpoints] == [103]
+    assert mirror.funded_single_tips() == []
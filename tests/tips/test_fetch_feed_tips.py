@@ -0,0 +1,57 @@
+from unittest import mock
+
+import pytest
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.reporters.tips import tip_amount
+from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
+
+
+qid_a, qid_b, qid_c = b"a" * 32, b"b" * 32, b"c" * 32
+feed_a, feed_b = b"1" * 32, b"2" * 32
+autopay = mock.Mock(address="0x0000000000000000000000000000000000000001")
+
+
+async def fake_multi_call(self, calls, success=False):
+    """Answer the getCurrentTip/getCurrentFeeds/getMultipleValuesBefore, getDataFeed and
+    getRewardClaimStatusList batches"""
+    signatures = {call.function.split("(")[0] for call in calls}
+    fake_multi_call.batches.append(signatures)
+    if "getCurrentTip" in signatures:
+        return {
+            ("current_tip", qid_a): 5,
+            ("current_tip", qid_b): None,  # reverted, no tip
+            ("current_tip", qid_c): 7,
+            qid_a: (feed_a,),
+            qid_b: (feed_b,),
+            qid_c: (),
+            ("values_array", qid_a): (b"\x01", b"\x02"),
+            ("timestamps_array", qid_a): (500, 1550),
+            ("values_array", qid_b): (b"\x01",),
+            ("timestamps_array", qid_b): (2005,),
+            ("values_array", qid_c): None,
+            ("timestamps_array", qid_c): None,
+        }, ResponseStatus()
+    if "getDataFeed" in signatures:
+        # reward, balance, startTime, interval, window, priceThreshold, rewardIncreasePerSecond
+        return {feed_a: (10, 100, 0, 1000, 100, 0, 0), feed_b: (20, 100, 0, 1000, 100, 0, 0)}, ResponseStatus()
+    return {(feed_a, qid_a): 0}, ResponseStatus()
+
+
+@pytest.mark.asyncio
+async def test_fetch_feed_tips_shares_batches():
+    fake_multi_call.batches = []
+    with mock.patch.object(MulticallAutopay, "multi_call", fake_multi_call):
+        tips = await tip_amount.fetch_feed_tips(autopay, [qid_a, qid_b, qid_c, qid_a], timestamp=2010)
+
+    # feed a is first in window, feed b was already reported in this window
+    assert tips == {qid_a: 15, qid_b: 0, qid_c: 7}
+    assert [sorted(batch) for batch in fake_multi_call.batches] == [
+        ["getCurrentFeeds", "getCurrentTip", "getMultipleValuesBefore"],
+        ["getDataFeed"],
+        ["getRewardClaimStatusList"],
+    ]
+
+    fake_multi_call.batches = []
+    with mock.patch.object(MulticallAutopay, "multi_call", fake_multi_call):
+        assert await tip_amount.fetch_feed_tip(autopay, qid_a, timestamp=2010) == 15
@@ -0,0 +1,112 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from telliot_feeds.reporters.tips.listener import funded_feeds_filter
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
+
+
+def value(price):
+    return int(price * 10**18).to_bytes(32, "big")
+
+
+def feed(price_threshold=0, balance=100, submissions=(), feed_id=b"f", current_timestamp=0, current_value=b""):
+    return QueryIdandFeedDetails(
+        params=FeedDetails(
+            reward=10,
+            balance=balance,
+            startTime=1000,
+            interval=100,
+            window=10,
+            priceThreshold=price_threshold,
+            rewardIncreasePerSecond=1,
+        ),
+        feed_id=feed_id,
+        query_id=b"q",
+        current_value_timestamp=current_timestamp,
+        current_queryid_value=current_value,
+        queryid_timestamps_values_list=[Values(value(price), t) for t, price in submissions],
+    )
+
+
+def test_filter_historical_submissions():
+    filtr = FundedFeedFilter()
+    # before start, first in window, second in the same window, first in the next window
+    no_threshold = feed(submissions=[(900, 1), (950, 1), (1101, 1), (1105, 1), (1200, 1)])
+    # not first in window but a 10% price change, then a 0.1% price change
+    threshold = feed(price_threshold=500, submissions=[(1101, 100), (1105, 110), (1108, 110.1)])
+    month = feed(submissions=[(1000 + 50 * i, 1) for i in range(20_000)])
+
+    filtr.filter_historical_submissions([no_threshold, threshold, month])
+
+    assert [v.timestamp for v in no_threshold.queryid_timestamps_values_list] == [900, 1101, 1200]
+    assert [v.timestamp for v in threshold.queryid_timestamps_values_list] == [1101, 1105]
+    # one eligible submission per interval, plus the oldest one
+    assert len(month.queryid_timestamps_values_list) == 10_000
+
+
+def test_calculate_true_feed_balance():
+    filtr = FundedFeedFilter()
+    feeds = [feed(feed_id=b"a"), feed(feed_id=b"b"), feed(feed_id=b"c")]
+
+    funded = filtr.calculate_true_feed_balance(feeds, {(b"a", b"q"): 3, (b"b", b"q"): 10})
+
+    assert funded is feeds
+    assert [(f.feed_id, f.params.balance) for f in funded] == [(b"a", 70), (b"c", 100)]
+
+
+@pytest.mark.asyncio
+async def test_window_and_price_threshold_unmet_filter():
+    filtr = FundedFeedFilter()
+    in_window = feed(feed_id=b"a")
+    low_balance = feed(feed_id=b"b", balance=12)
+    out_of_window = feed(feed_id=b"c", current_timestamp=1205)
+    undecodable = feed(feed_id=b"d", price_threshold=500, current_timestamp=1205)
+    feeds = [in_window, low_balance, out_of_window, undecodable]
+
+    eligible = await filtr.window_and_priceThreshold_unmet_filter(feeds, now_timestamp=1205)
+
+    assert eligible is feeds
+    assert [f.feed_id for f in eligible] == [b"a", b"d"]
+    # reward increased by rewardIncreasePerSecond for the 5 seconds since the window start
+    assert in_window.params.reward == 15
+
+
+@pytest.mark.asyncio
+async def test_price_lookups_deduplicated_and_concurrent():
+    filtr = FundedFeedFilter()
+    in_flight = []
+    fetched = []
+
+    def source(query_tag, price):
+        async def fetch_new_datapoint():
+            fetched.append(query_tag)
+            in_flight.append(query_tag)
+            await asyncio.sleep(0.05)
+            # both prices are fetched at the same time
+            assert len(in_flight) == 2
+            return price, None
+
+        return SimpleNamespace(source=SimpleNamespace(fetch_new_datapoint=fetch_new_datapoint))
+
+    catalog_query_ids = {b"eth": "eth-usd-spot", b"btc": "btc-usd-spot"}
+    catalog_feeds = {"eth-usd-spot": source("eth-usd-spot", 110), "btc-usd-spot": source("btc-usd-spot", 100.1)}
+    feeds = []
+    for i, query_id in enumerate([b"eth", b"btc", b"eth", b"btc"]):
+        threshold_feed = feed(feed_id=bytes([i]), price_threshold=500, current_timestamp=1205, current_value=value(100))
+        threshold_feed.query_id = query_id
+        feeds.append(threshold_feed)
+
+    with mock.patch.dict(funded_feeds_filter.CATALOG_QUERY_IDS, catalog_query_ids), mock.patch.dict(
+        funded_feeds_filter.CATALOG_FEEDS, catalog_feeds
+    ):
+        eligible = await filtr.window_and_priceThreshold_unmet_filter(feeds, now_timestamp=1205)
+
+    assert sorted(fetched) == ["btc-usd-spot", "eth-usd-spot"]
+    # 10% change for eth, 0.1% for btc
+    assert [f.feed_id for f in eligible] == [bytes([0]), bytes([2])]
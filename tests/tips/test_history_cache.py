@@ -0,0 +1,72 @@
+from unittest import mock
+
+import pytest
+
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.reporters.tips.listener.history_cache import AutopayHistoryCache
+from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
+
+
+query_id = b"q" * 32
+feed_id = b"f" * 32
+
+
+def test_history_cache_update_and_evict():
+    history = AutopayHistoryCache()
+    assert history.fetch_start(query_id, window_start=1000) == 1000
+
+    history.update(query_id, [b"a", b"b", b"c"], [900, 1100, 1200], window_start=1000)
+    assert history.histories[query_id].values == [Values(b"b", 1100), Values(b"c", 1200)]
+    assert history.fetch_start(query_id, window_start=1000) == 1200
+
+    # already seen reports are ignored, old ones evicted, the latest one kept
+    history.update(query_id, [b"c", b"d"], [1200, 1300], window_start=1150)
+    assert history.histories[query_id].values == [Values(b"c", 1200), Values(b"d", 1300)]
+    history.update(query_id, [], [], window_start=1400)
+    assert history.histories[query_id].values == []
+    assert history.histories[query_id].latest == Values(b"d", 1300)
+    assert history.fetch_start(query_id, window_start=1400) == 1400
+
+
+def test_history_cache_claimed_status():
+    history = AutopayHistoryCache()
+    assert history.record_claimed_status(feed_id, query_id, [1100, 1200, 1300], [True, False, True]) == 1
+    assert history.unchecked_timestamps(feed_id, query_id, [1100, 1200, 1300, 1400]) == [1200, 1400]
+    # claimed status is per feed
+    assert history.unchecked_timestamps(b"g" * 32, query_id, [1100]) == [1100]
+
+    history.update(query_id, [], [], window_start=1150)
+    assert history.histories[query_id].claimed[feed_id] == {1300}
+
+
+@pytest.mark.asyncio
+async def test_incremental_multicalls():
+    history = AutopayHistoryCache()
+    call = MulticallAutopay()
+    call.autopay = mock.Mock(address="0x0000000000000000000000000000000000000001")
+    feed = QueryIdandFeedDetails(params=FeedDetails(1, 10, 0, 60, 10, 0, 0), feed_id=feed_id, query_id=query_id)
+
+    responses = [
+        {("values_array", query_id): (b"a", b"b"), ("timestamps_array", query_id): (1100, 1200)},
+        {(feed_id, query_id): (True, False)},
+        {("values_array", query_id): (b"c",), ("timestamps_array", query_id): (1300,)},
+        {(feed_id, query_id): (False, True)},
+    ]
+    with mock.patch.object(MulticallAutopay, "multi_call", side_effect=[(r, mock.Mock(ok=True)) for r in responses]):
+        with mock.patch.object(call, "get_multiple_values_before", wraps=call.get_multiple_values_before) as get_values:
+            feeds, _ = await call.new_timestamps_and_values([feed], 2000, 1000, history)
+            assert get_values.call_args.kwargs["max_age"] == 1000
+            assert feed.current_value_timestamp == 1200
+            assert [v.timestamp for v in feed.queryid_timestamps_values_list] == [1100, 1200]
+            assert await call.unclaimed_count_call(feeds, history) == ({(feed_id, query_id): 1}, mock.ANY)
+
+            # next loop only fetches reports after 1200 and skips the claimed timestamp 1100
+            with mock.patch.object(call, "get_reward_claimed_status", wraps=call.get_reward_claimed_status) as status:
+                feeds, _ = await call.new_timestamps_and_values([feed], 2100, 1050, history)
+                assert get_values.call_args.kwargs["max_age"] == 900
+                assert [v.timestamp for v in feed.queryid_timestamps_values_list] == [1100, 1200, 1300]
+                assert await call.unclaimed_count_call(feeds, history) == ({(feed_id, query_id): 1}, mock.ANY)
+                assert status.call_args.args[2] == [1200, 1300]
+    assert history.histories[query_id].claimed[feed_id] == {1100, 1300}
@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from telliot_feeds.sources.price.spot.twap_lp import TWAPLPSpotPriceService
+from telliot_feeds.utils.cumulative_prices_store import CumulativePricesPoint
+from telliot_feeds.utils.cumulative_prices_store import _pack
+from telliot_feeds.utils.cumulative_prices_store import CumulativePricesStore
+from telliot_feeds.utils.cumulative_prices_store import RECORD_SIZE
+
+
+def point(timestamp):
+    return CumulativePricesPoint(2**255 + timestamp, timestamp, 2**111, 3, timestamp)
+
+
+def test_ring_buffer_append_and_lookup(tmp_path):
+    path = tmp_path / "WPLS_DAI.bin"
+    store = CumulativePricesStore(path, 5)
+    assert len(store) == 0
+    assert store.last() is None
+    assert store.find_before(100) is None
+
+    for t in range(100, 200, 10):
+        assert store.append(point(t))
+    assert not store.append(point(50))
+
+    assert len(store) == 5
+    assert [p.blockTimestampLast for p in store] == [150, 160, 170, 180, 190]
+    assert store[0] == point(150)
+    assert store.last() == point(190)
+    assert store.find_before(175) == point(170)
+    assert store.find_before(190) == point(190)
+    assert store.find_before(149) is None
+    assert store.find_anchors(190, [0, 15, 30, 300]) == {0: point(190), 15: point(170), 30: point(160), 300: None}
+    store.close()
+
+    # reopened with the same capacity
+    store = CumulativePricesStore(path, 5)
+    assert list(store) == [point(t) for t in range(150, 200, 10)]
+    store.close()
+
+    # reopened with a smaller capacity, keeping the latest points
+    store = CumulativePricesStore(path, 3)
+    assert list(store) == [point(t) for t in range(170, 200, 10)]
+    store.append(point(200))
+    assert list(store) == [point(t) for t in range(180, 210, 10)]
+    store.close()
+
+
+def test_interrupted_append_is_dropped(tmp_path):
+    path = tmp_path / "WPLS_DAI.bin"
+    store = CumulativePricesStore(path, 3)
+    for t in (10, 20, 30, 40):
+        store.append(point(t))
+    # corrupt the last record, as a partially written append would
+    offset = store._offset(2)
+    store._mmap[offset + 3] ^= 0xFF
+    store.close()
+
+    store = CumulativePricesStore(path, 3)
+    assert list(store) == [point(20), point(30)]
+    store.close()
+
+
+def test_interrupted_append_on_full_ring_is_dropped(tmp_path):
+    path = tmp_path / "WPLS_DAI.bin"
+    store = CumulativePricesStore(path, 3)
+    for t in (10, 20, 30):
+        store.append(point(t))
+    # crash after writing the next record over the oldest one, before bumping the count
+    offset = store._offset(0)
+    store._mmap[offset : offset + RECORD_SIZE] = _pack(point(40))
+    store.close()
+
+    store = CumulativePricesStore(path, 3)
+    assert list(store) == [point(20), point(30)]
+    assert store.find_before(25) == point(20)
+    assert store.append(point(40))
+    store.close()
+
+    store = CumulativePricesStore(path, 3)
+    assert list(store) == [point(20), point(30), point(40)]
+    store.close()
+
+
+def test_merge_backfilled_points(tmp_path):
+    store = CumulativePricesStore(tmp_path / "WPLS_DAI.bin", 4)
+    for t in (300, 400):
+        store.append(point(t))
+
+    store.merge([point(100), point(200), point(400)])
+    assert list(store) == [point(t) for t in (100, 200, 300, 400)]
+    assert store.find_before(250) == point(200)
+
+    # the oldest points are dropped beyond capacity
+    store.merge([point(50), point(250)])
+    assert [p.blockTimestampLast for p in store] == [200, 250, 300, 400]
+    store.append(point(500))
+    store.close()
+
+    store = CumulativePricesStore(tmp_path / "WPLS_DAI.bin", 4)
+    assert [p.blockTimestampLast for p in store] == [250, 300, 400, 500]
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_twap_lp_service_store(tmp_path, monkeypatch):
+    legacy = {
+        "WPLS/DAI": [
+            {
+                "price0CumulativeLast": str(p),
+                "price1CumulativeLast": str(p),
+                "reserve0": "5",
+                "reserve1": "7",
+                "blockTimestampLast": str(t),
+            }
+            for t, p in [(1000, 1), (2000, 2), (3000, 3)]
+        ]
+    }
+    (tmp_path / "prevPricesCumulative.json").write_text(json.dumps(legacy))
+    monkeypatch.chdir(tmp_path)
+
+    service = TWAPLPSpotPriceService()
+    service.lps_order = {"dai": "wpls/dai"}
+    service.TWAP_TIMESPAN = 1800
+
+    # legacy data points are migrated, the anchor is the latest point at least TWAP_TIMESPAN old
+    assert await service.get_prev_prices_cumulative("dai", 3800) == (2, 2, 2000)
+    assert (tmp_path / "prevPricesCumulative" / "WPLS_DAI.bin").exists()
+
+    service._update_cumulative_prices(4, 4, 6, 8, 4000, "WPLS/DAI")
+    service._update_cumulative_prices(4, 5, 6, 9, 4100, "WPLS/DAI")  # same price0CumulativeLast, skipped
+    assert [p.blockTimestampLast for p in service._get_store("WPLS/DAI")] == [1000, 2000, 3000, 4000]
+    assert await service.get_prev_prices_cumulative("dai", 4800) == (3, 3, 3000)
+    anchors = service.get_twap_anchors("dai", 4300, [300, 1800, 3600])
+    assert anchors[300].blockTimestampLast == 4000
+    assert anchors[1800].blockTimestampLast == 2000
+    assert anchors[3600] is None
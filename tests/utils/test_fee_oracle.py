@@ -0,0 +1,83 @@
+import random
+from unittest import mock
+
+from web3._utils.fee_utils import _fee_history_priority_fee_estimate
+
+from telliot_feeds.utils.fee_oracle import FEE_ORACLE_PERCENTILES
+from telliot_feeds.utils.fee_oracle import FeeOracle
+
+
+class FakeChain:
+    """Node returning fee history of made up blocks"""
+
+    def __init__(self, latest):
+        rng = random.Random(0)
+        self.latest = latest
+        self.base_fees = {n: rng.randrange(10**9, 10**11) for n in range(latest + 100)}
+        self.rewards = {
+            n: sorted(rng.choice([0, rng.randrange(10**8, 10**10)]) for _ in FEE_ORACLE_PERCENTILES)
+            for n in range(latest + 100)
+        }
+        self.w3 = mock.Mock()
+        type(self.w3.eth).block_number = mock.PropertyMock(side_effect=lambda: self.latest)
+        self.w3.eth.fee_history.side_effect = self.fee_history
+
+    def fee_history(self, block_count, newest_block, reward_percentiles):
+        assert list(reward_percentiles) == list(FEE_ORACLE_PERCENTILES)
+        oldest = newest_block - block_count + 1
+        return {
+            "oldestBlock": oldest,
+            "baseFeePerGas": [self.base_fees[n] for n in range(oldest, newest_block + 2)],
+            "reward": [self.rewards[n] for n in range(oldest, newest_block + 1)],
+        }
+
+
+def test_update_fetches_new_blocks_only():
+    chain = FakeChain(latest=1000)
+    oracle = FeeOracle(chain.w3, window=10)
+    assert not oracle.fresh
+
+    assert oracle.update() == 10
+    chain.w3.eth.fee_history.assert_called_once_with(10, 1000, list(FEE_ORACLE_PERCENTILES))
+    assert oracle.fresh
+    assert [block.number for block in oracle.blocks] == list(range(991, 1001))
+    assert oracle.base_fee == chain.base_fees[1000]
+    assert oracle.next_base_fee == chain.base_fees[1001]
+
+    # no new block, no fee history request
+    assert oracle.update() == 0
+    assert chain.w3.eth.fee_history.call_count == 1
+
+    chain.latest = 1003
+    assert oracle.update() == 3
+    chain.w3.eth.fee_history.assert_called_with(3, 1003, list(FEE_ORACLE_PERCENTILES))
+    assert [block.number for block in oracle.blocks] == list(range(994, 1004))
+
+    # more new blocks than the window
+    chain.latest = 1050
+    assert oracle.update() == 10
+    assert [block.number for block in oracle.blocks] == list(range(1041, 1051))
+
+
+def test_percentiles_over_window():
+    chain = FakeChain(latest=500)
+    oracle = FeeOracle(chain.w3, window=8)
+    oracle.update()
+    for latest in (501, 502, 505, 511, 512):
+        chain.latest = latest
+        oracle.update()
+        window = range(latest - 7, latest + 1)
+        for i, p in enumerate(FEE_ORACLE_PERCENTILES):
+            expected = sorted(chain.rewards[n][i] for n in window if chain.rewards[n][i] > 0)
+            assert oracle.sorted_rewards(p) == expected
+            assert oracle.percentile(p) == (expected[len(expected) // 2] if expected else None)
+
+
+def test_priority_fee_estimate_matches_web3():
+    chain = FakeChain(latest=300)
+    oracle = FeeOracle(chain.w3, window=10)
+    oracle.update()
+
+    history = chain.fee_history(5, 300, FEE_ORACLE_PERCENTILES)
+    history["reward"] = [[rewards[1]] for rewards in history["reward"]]
+    assert oracle.priority_fee_estimate(blocks=5, percentile=25) == _fee_history_priority_fee_estimate(history)
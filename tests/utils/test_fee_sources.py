@@ -0,0 +1,56 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from telliot_feeds.utils.fee_sources import EstimatorFeeSource
+from telliot_feeds.utils.fee_sources import FeeSource
+from telliot_feeds.utils.fee_sources import FeeSourceChain
+from telliot_feeds.utils.fee_sources import GASNOW_API_URLS
+from telliot_feeds.utils.fee_sources import GasNowFeeSource
+from telliot_feeds.utils.fee_sources import NodeGasPriceFeeSource
+
+
+class SlowFeeSource(FeeSource):
+    name = "slow"
+
+    async def fetch(self):
+        await asyncio.sleep(60)
+
+
+@pytest.mark.asyncio
+async def test_gasnow_fees_cached():
+    response = {"response": {"data": {"rapid": 2_500_000_000}}}
+    with mock.patch("telliot_feeds.utils.fee_sources.get_json", return_value=response) as get_json:
+        source = GasNowFeeSource(943, timeout=1, ttl=60)
+        assert await source.get_fees() == (2.5, 2.5)
+        assert await source.get_fees() == (2.5, 2.5)
+
+    get_json.assert_called_once_with(GASNOW_API_URLS[943], timeout=1, headers={"Accept": "application/json"})
+
+
+@pytest.mark.asyncio
+async def test_chain_fails_over():
+    w3 = mock.Mock()
+    w3.eth.gas_price = 3 * 10**9
+    error = {"error": "Timeout Error", "exception": asyncio.TimeoutError()}
+    chain = FeeSourceChain(
+        [
+            SlowFeeSource(timeout=0.01),
+            GasNowFeeSource(369),
+            EstimatorFeeSource("get_fee_info", lambda: (None, None)),
+            NodeGasPriceFeeSource(w3),
+        ]
+    )
+
+    with mock.patch("telliot_feeds.utils.fee_sources.get_json", return_value=error):
+        assert await asyncio.wait_for(chain.get_fees(), 1) == (3.0, 3.0, "gas_price")
+
+    chain = FeeSourceChain([EstimatorFeeSource("estimate_fees", lambda: (1.0, 20.0)), NodeGasPriceFeeSource(w3)])
+    assert await chain.get_fees() == (1.0, 20.0, "estimate_fees")
+
+
+@pytest.mark.asyncio
+async def test_no_source_available():
+    chain = FeeSourceChain([EstimatorFeeSource("broken", mock.Mock(side_effect=ValueError("down")))])
+    assert await chain.get_fees() == (None, None, None)
@@ -0,0 +1,105 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from multicall import Call
+from web3.exceptions import ContractLogicError
+
+from telliot_feeds.utils.multicall_executor import CALL_OVERHEAD
+from telliot_feeds.utils.multicall_executor import get_multicall_executor
+from telliot_feeds.utils.multicall_executor import MulticallExecutor
+
+
+TARGET = "0x0000000000000000000000000000000000000001"
+
+
+def calls(n):
+    return [
+        Call(TARGET, ["getTimestampbyQueryIdandIndex(bytes32,uint256)(uint256)", b"\0" * 32, i], [[i, None]])
+        for i in range(n)
+    ]
+
+
+class FakeMulticall:
+    """Stand-in for multicall.Multicall failing for more than `max_calls` calls"""
+
+    max_calls = 1000
+    in_flight = 0
+    max_in_flight = 0
+    sizes: list = []
+
+    def __init__(self, calls, _w3, block_id=None, require_success=True):
+        self.calls = calls
+
+    async def coroutine(self):
+        cls = FakeMulticall
+        cls.sizes.append(len(self.calls))
+        cls.in_flight += 1
+        cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if len(self.calls) > cls.max_calls:
+                raise ValueError("out of gas")
+            return {call.returns[0][0]: call.args[1] * 10 for call in self.calls}
+        finally:
+            cls.in_flight -= 1
+
+
+@pytest.fixture
+def fake_multicall():
+    FakeMulticall.max_calls = 1000
+    FakeMulticall.sizes = []
+    FakeMulticall.max_in_flight = 0
+    with mock.patch("telliot_feeds.utils.multicall_executor.Multicall", FakeMulticall):
+        yield FakeMulticall
+
+
+def test_chunk_by_budget():
+    executor = MulticallExecutor(mock.Mock(), budget=10 * (4 + 64 + CALL_OVERHEAD))
+    chunks = executor.chunk(calls(25))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert [call.args[1] for chunk in chunks for call in chunk] == list(range(25))
+    # a call over budget still gets its own chunk
+    executor.budget = 1
+    assert [len(chunk) for chunk in executor.chunk(calls(3))] == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_execute_concurrent_chunks(fake_multicall):
+    executor = MulticallExecutor(mock.Mock(), max_concurrency=2, budget=50 * (4 + 64 + CALL_OVERHEAD), max_budget=0)
+    data = await executor.execute(calls(500))
+
+    assert data == {i: i * 10 for i in range(500)}
+    assert fake_multicall.sizes == [50] * 10
+    assert fake_multicall.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_chunks_bisected_and_budget_adapts(fake_multicall):
+    fake_multicall.max_calls = 30
+    executor = MulticallExecutor(mock.Mock(), budget=100 * (4 + 64 + CALL_OVERHEAD))
+    data = await executor.execute(calls(100))
+
+    assert data == {i: i * 10 for i in range(100)}
+    assert fake_multicall.sizes[:3] == [100, 50, 25]
+    failed = [size for size in fake_multicall.sizes if size > 30]
+
+    # the next batch is chunked by the learned budget
+    fake_multicall.sizes = []
+    assert await executor.execute(calls(100)) == data
+    assert len([size for size in fake_multicall.sizes if size > 30]) < len(failed)
+
+    # single calls that keep failing are raised, reverts are not bisected
+    fake_multicall.max_calls = 0
+    with pytest.raises(ValueError):
+        await executor.execute(calls(4))
+    with mock.patch.object(FakeMulticall, "coroutine", side_effect=ContractLogicError):
+        fake_multicall.sizes = []
+        with pytest.raises(ContractLogicError):
+            await executor.execute(calls(4), require_success=True)
+
+
+def test_executor_shared_per_connection():
+    w3, other = mock.Mock(), mock.Mock()
+    assert get_multicall_executor(w3) is get_multicall_executor(w3)
+    assert get_multicall_executor(w3) is not get_multicall_executor(other)
@@ -0,0 +1,78 @@
+import threading
+from unittest import mock
+
+from telliot_feeds.utils.nonce_manager import NonceManager
+
+
+ADDRESS = "0x0000000000000000000000000000000000000001"
+
+
+def test_sync_asks_node_once():
+    w3 = mock.Mock()
+    w3.eth.get_transaction_count.return_value = 5
+    nm = NonceManager(w3, ADDRESS)
+
+    assert nm.sync() == 5
+    assert nm.reserve() == 5
+    assert nm.reserve() == 6
+    assert nm.sync() == 7
+    w3.eth.get_transaction_count.assert_called_once_with(ADDRESS, "pending")
+
+    # reconciled with the node when forced
+    w3.eth.get_transaction_count.return_value = 9
+    assert nm.sync(force=True) == 9
+
+
+def test_concurrent_reservations_are_unique():
+    w3 = mock.Mock()
+    w3.eth.get_transaction_count.return_value = 0
+    nm = NonceManager(w3, ADDRESS)
+    nonces = []
+
+    def reserve_many():
+        for _ in range(100):
+            nonces.append(nm.reserve())
+
+    threads = [threading.Thread(target=reserve_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(nonces) == list(range(800))
+    w3.eth.get_transaction_count.assert_called_once()
+
+
+def test_release_and_reset():
+    w3 = mock.Mock()
+    w3.eth.get_transaction_count.return_value = 3
+    nm = NonceManager(w3, ADDRESS)
+
+    nonce = nm.reserve()
+    nm.release(nonce)
+    assert nm.reserve() == 3
+
+    # releasing a nonce with later ones out leaves a gap, ask the node again
+    first, _ = nm.reserve(), nm.reserve()
+    nm.release(first)
+    w3.eth.get_transaction_count.return_value = 4
+    assert nm.reserve() == 4
+    assert w3.eth.get_transaction_count.call_count == 2
+
+    nm.reset()
+    w3.eth.get_transaction_count.return_value = 10
+    assert nm.reserve() == 10
+
+
+def test_pending_transactions():
+    w3 = mock.Mock()
+    w3.eth.get_transaction_count.return_value = 0
+    nm = NonceManager(w3, ADDRESS)
+
+    for nonce in (nm.reserve(), nm.reserve()):
+        nm.track(nonce, bytes([nonce]))
+    assert sorted(nm.pending) == [0, 1]
+    assert nm.pending[1].tx_hash == b"\x01"
+
+    nm.confirm(0)
+    assert list(nm.pending) == [1]
@@ -0,0 +1,32 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from telliot_feeds.utils.price_cache import PriceCache
+
+
+def price_feed(prices):
+    async def fetch_new_datapoint():
+        await asyncio.sleep(0.01)
+        source.fetches += 1
+        source.latest = (prices.pop(0), None)
+
+    source = SimpleNamespace(latest=(None, None), fetches=0, fetch_new_datapoint=fetch_new_datapoint)
+    return SimpleNamespace(source=source)
+
+
+@pytest.mark.asyncio
+async def test_price_fetched_once_per_ttl():
+    feed, other = price_feed([None, 2.0, 3.0]), price_feed([10.0])
+    cache = PriceCache(ttl=60)
+
+    # concurrent callers share the fetch, failures aren't cached
+    assert await cache.fetch_all([feed, feed, other]) == [None, None, 10.0]
+    assert feed.source.fetches == 1
+    assert await cache.fetch(feed) == 2.0
+    assert await cache.fetch_all([feed, other]) == [2.0, 10.0]
+    assert (feed.source.fetches, other.source.fetches) == (2, 1)
+
+    cache.ttl = 0
+    assert await cache.fetch(feed) == 3.0
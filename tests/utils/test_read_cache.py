@@ -0,0 +1,178 @@
+import asyncio
+import gc
+import weakref
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from eth_abi import encode_abi
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+from web3.contract import ContractFunction
+
+from telliot_feeds.utils.read_cache import cached_read
+from telliot_feeds.utils.read_cache import ContractReadCache
+from telliot_feeds.utils.read_cache import get_read_cache
+
+
+ORACLE_ADDRESS = "0x0000000000000000000000000000000000000001"
+STAKER = "0x0000000000000000000000000000000000000002"
+ABI = [
+    {
+        "name": "getStakeAmount",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "uint256"}],
+    },
+    {
+        "name": "getStakerInfo",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "_stakerAddress", "type": "address"}],
+        "outputs": [{"name": "", "type": "uint256"}, {"name": "", "type": "address"}],
+    },
+    {
+        "name": "getReportsSubmittedByAddress",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "_reporter", "type": "address"}],
+        "outputs": [{"name": "", "type": "uint256"}],
+    },
+]
+OUTPUTS = {
+    "getStakeAmount": encode_abi(["uint256"], [10]),
+    "getStakerInfo": encode_abi(["uint256", "address"], [5, STAKER]),
+}
+
+
+def selector(signature):
+    return bytes(Web3.keccak(text=signature))[:4]
+
+
+SELECTORS = {selector("getStakeAmount()"): "getStakeAmount", selector("getStakerInfo(address)"): "getStakerInfo"}
+
+
+class FakeAggregate:
+    """Stand-in for ContractFunction.call answering tryBlockAndAggregate, reverting unknown functions"""
+
+    batches: list = []
+
+    @staticmethod
+    def call(function, block_identifier=None):
+        assert function.fn_name == "tryBlockAndAggregate"
+        _, calls = function.args
+        names = [SELECTORS.get(data[:4]) for _, data in calls]
+        FakeAggregate.batches.append((block_identifier, names))
+        return block_identifier, b"", [(name is not None, OUTPUTS.get(name, b"")) for name in names]
+
+
+async def read(func_name, **kwargs):
+    """Contract.read, failing for a reverted call"""
+    if func_name == "getStakeAmount":
+        return 10, ResponseStatus()
+    return None, ResponseStatus(ok=False, error="error reading from contract")
+
+
+class FakeWeb3:
+    """Connection answering the block number"""
+
+    def __init__(self):
+        self.eth = SimpleNamespace(block_number=100, chain_id=1, contract=Web3().eth.contract)
+        self.codec = Web3().codec
+
+
+@pytest.fixture
+def oracle():
+    w3 = FakeWeb3()
+    contract = SimpleNamespace(
+        address=ORACLE_ADDRESS,
+        contract=Web3().eth.contract(address=ORACLE_ADDRESS, abi=ABI),
+        node=SimpleNamespace(_web3=w3),
+        read=mock.AsyncMock(side_effect=read),
+    )
+    FakeAggregate.batches = []
+    with mock.patch.object(ContractFunction, "call", autospec=True, side_effect=FakeAggregate.call):
+        yield contract
+
+
+@pytest.mark.asyncio
+async def test_reads_coalesced_and_cached_per_block(oracle):
+    cache = ContractReadCache(oracle.node._web3, block_ttl=0)
+
+    results = await asyncio.gather(
+        cache.read(oracle, "getStakeAmount"),
+        cache.read(oracle, "getStakerInfo", _stakerAddress=STAKER),
+        cache.read(oracle, "getStakeAmount"),
+        cache.read(oracle, "getReportsSubmittedByAddress", _reporter=STAKER),
+    )
+
+    assert [value for value, _ in results] == [10, [5, STAKER], 10, None]
+    assert [status.ok for _, status in results] == [True, True, True, False]
+    # one multicall at the current block, the reverted call is read again for its error
+    assert FakeAggregate.batches == [(100, ["getStakeAmount", "getStakerInfo", None])]
+    oracle.read.assert_awaited_once_with("getReportsSubmittedByAddress", _reporter=STAKER)
+
+    # same block, served from the cache
+    assert await cache.read(oracle, "getStakerInfo", _stakerAddress=STAKER) == results[1]
+    assert len(FakeAggregate.batches) == 1
+
+    # a new block drops the cached values, a lone miss is a plain read
+    oracle.node._web3.eth.block_number = 101
+    assert (await cache.read(oracle, "getStakeAmount"))[0] == 10
+    assert (await cache.read(oracle, "getStakeAmount"))[0] == 10
+    assert len(FakeAggregate.batches) == 1
+    assert oracle.read.await_count == 2
+
+    # and so does invalidate, e.g. after a transaction
+    cache.block_ttl = 60
+    cache.invalidate()
+    await asyncio.gather(
+        cache.read(oracle, "getStakeAmount"), cache.read(oracle, "getStakerInfo", _stakerAddress=STAKER)
+    )
+    assert FakeAggregate.batches[-1] == (101, ["getStakeAmount", "getStakerInfo"])
+
+
+@pytest.mark.asyncio
+async def test_cached_read_falls_back_to_contract_read(oracle):
+    assert get_read_cache(oracle.node._web3) is get_read_cache(oracle.node._web3)
+
+    with mock.patch.object(ContractFunction, "call", side_effect=ValueError("no multicall")):
+        results = await asyncio.gather(
+            cached_read(oracle, "getStakeAmount"), cached_read(oracle, "getStakerInfo", _stakerAddress=STAKER)
+        )
+    assert [status.ok for _, status in results] == [True, False]
+    assert oracle.read.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_keeps_values_of_the_same_block(oracle):
+    cache = ContractReadCache(oracle.node._web3, block_ttl=60)
+    await asyncio.gather(
+        cache.read(oracle, "getStakeAmount"), cache.read(oracle, "getStakerInfo", _stakerAddress=STAKER)
+    )
+    assert len(FakeAggregate.batches) == 1
+
+    # same block: the values read by other reporters are reused
+    cache.refresh()
+    assert (await cache.read(oracle, "getStakeAmount"))[0] == 10
+    assert len(FakeAggregate.batches) == 1
+    assert oracle.read.await_count == 0
+
+    # new block: seen within the block ttl only after a refresh, then read again
+    oracle.node._web3.eth.block_number = 101
+    assert (await cache.read(oracle, "getStakeAmount"))[0] == 10
+    assert oracle.read.await_count == 0
+    cache.refresh()
+    assert (await cache.read(oracle, "getStakeAmount"))[0] == 10
+    assert oracle.read.await_count == 1
+
+
+def test_cache_does_not_keep_connection_alive():
+    w3 = Web3()
+    cache = get_read_cache(w3)
+    assert cache.w3 is w3
+    w3_ref = weakref.ref(w3)
+    del w3
+    gc.collect()
+    assert w3_ref() is None
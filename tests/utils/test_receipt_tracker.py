@@ -0,0 +1,99 @@
+import asyncio
+import gc
+import weakref
+from unittest import mock
+
+import pytest
+from hexbytes import HexBytes
+from web3.exceptions import TransactionNotFound
+
+from telliot_feeds.utils.receipt_tracker import get_receipt_tracker
+from telliot_feeds.utils.receipt_tracker import ReceiptTracker
+
+
+HASHES = [HexBytes(bytes([i]) * 32) for i in range(3)]
+
+
+def raw_receipt(tx_hash, status=1):
+    return {"transactionHash": tx_hash.hex(), "status": hex(status), "blockNumber": "0x66", "logs": []}
+
+
+@pytest.mark.asyncio
+async def test_receipts_delivered_per_block():
+    w3 = mock.Mock()
+    blocks = iter(range(100, 200))
+    type(w3.eth).block_number = mock.PropertyMock(side_effect=lambda: next(blocks))
+    # mined: first hash at block 101, second at block 102 (reverted), third never
+    mined = {HASHES[0]: (101, 1), HASHES[1]: (102, 0)}
+    current = {}
+
+    def get_transaction_receipt(tx_hash):
+        block, status = mined.get(tx_hash, (None, None))
+        if block is None or current["block"] < block:
+            raise TransactionNotFound(tx_hash)
+        return {"transactionHash": tx_hash, "status": status}
+
+    w3.eth.get_transaction_receipt.side_effect = get_transaction_receipt
+    tracker = ReceiptTracker(w3, poll_interval=0)
+    original_check = tracker._check_receipts
+
+    async def check_receipts():
+        current["block"] = tracker.block
+        await original_check()
+
+    tracker._check_receipts = check_receipts
+    callback = mock.Mock()
+    futures = [tracker.watch(tx_hash, callback) for tx_hash in HASHES]
+
+    receipts = await asyncio.wait_for(asyncio.gather(*futures[:2]), 1)
+
+    assert [receipt["status"] for receipt in receipts] == [1, 0]
+    assert callback.call_count == 2
+    assert tracker.in_flight == [HASHES[2]]
+    assert tracker.metrics.confirmed == 1
+    assert tracker.metrics.reverted == 1
+    assert tracker.metrics.mean_confirmation_seconds is not None
+
+    tracker.forget(HASHES[2])
+    assert futures[2].cancelled()
+    await asyncio.wait_for(tracker.task, 1)
+
+
+@pytest.mark.asyncio
+async def test_receipts_batched_over_http():
+    w3 = mock.Mock()
+    w3.provider.endpoint_uri = "http://node:8545"
+    w3.eth.block_number = 100
+    tracker = ReceiptTracker(w3, poll_interval=0)
+    response = {
+        "response": [
+            {"jsonrpc": "2.0", "id": 0, "result": raw_receipt(HASHES[0])},
+            {"jsonrpc": "2.0", "id": 1, "result": None},
+            {"jsonrpc": "2.0", "id": 2, "result": raw_receipt(HASHES[2], status=0)},
+        ]
+    }
+
+    with mock.patch("telliot_feeds.utils.receipt_tracker.post_json", return_value=response) as post_json:
+        receipts = await tracker.get_receipts(HASHES)
+
+    post_json.assert_called_once()
+    url, batch = post_json.call_args[0]
+    assert url == "http://node:8545"
+    assert [call["params"] for call in batch] == [[tx_hash.hex()] for tx_hash in HASHES]
+    assert set(receipts) == {HASHES[0], HASHES[2]}
+    assert receipts[HASHES[0]].transactionHash == HASHES[0]
+    assert receipts[HASHES[0]].blockNumber == 102
+    assert receipts[HASHES[2]].status == 0
+    w3.eth.get_transaction_receipt.assert_not_called()
+
+
+def test_tracker_does_not_keep_connection_alive():
+    w3 = mock.Mock()
+    tracker = get_receipt_tracker(w3)
+    assert tracker.w3 is w3 and get_receipt_tracker(w3) is tracker
+    w3_ref = weakref.ref(w3)
+    del w3
+    gc.collect()
+    assert w3_ref() is None
+    with pytest.raises(ReferenceError):
+        tracker.w3
@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from hexbytes import HexBytes
+from web3.exceptions import TransactionNotFound
+
+from telliot_feeds.utils.nonce_manager import NonceManager
+from telliot_feeds.utils.receipt_tracker import ReceiptTracker
+from telliot_feeds.utils.tx_manager import bump_fees
+from telliot_feeds.utils.tx_manager import TransactionManager
+
+
+ACCOUNT = "0x0000000000000000000000000000000000000001"
+TX = {
+    "to": "0x0000000000000000000000000000000000000002",
+    "value": 0,
+    "data": b"submit",
+    "nonce": 4,
+    "gas": 100_000,
+    "chainId": 1,
+    "maxFeePerGas": 100,
+    "maxPriorityFeePerGas": 10,
+}
+
+
+class FakeChain:
+    """Node mining the n-th transaction sent once `mine_at` blocks are reached"""
+
+    def __init__(self, mine_index=None, mine_at=0):
+        self.block = 100
+        self.sent = []
+        self.mine_index = mine_index
+        self.mine_at = mine_at
+        self.w3 = mock.Mock()
+        type(self.w3.eth).block_number = mock.PropertyMock(side_effect=self.next_block)
+        self.w3.eth.send_raw_transaction.side_effect = self.send
+        self.w3.eth.get_transaction_receipt.side_effect = self.receipt
+
+    def next_block(self):
+        self.block += 1
+        return self.block
+
+    def send(self, tx):
+        self.sent.append(tx)
+        return HexBytes(bytes([len(self.sent)]))
+
+    def receipt(self, tx_hash):
+        index = tx_hash[0] - 1
+        if index == self.mine_index and self.block >= self.mine_at:
+            return {"transactionHash": tx_hash, "status": 1}
+        raise TransactionNotFound(tx_hash)
+
+
+def manager(chain):
+    account = mock.Mock(address=ACCOUNT)
+    account.local_account.sign_transaction.side_effect = lambda tx: SimpleNamespace(rawTransaction=dict(tx))
+    nonce_manager = NonceManager(chain.w3, ACCOUNT)
+    tracker = ReceiptTracker(chain.w3, poll_interval=0)
+    return (
+        TransactionManager(chain.w3, account, nonce_manager, bump_after_blocks=2, receipt_tracker=tracker),
+        nonce_manager,
+    )
+
+
+def test_bump_fees():
+    assert bump_fees(TX, 1.125) == {**TX, "maxFeePerGas": 113, "maxPriorityFeePerGas": 12}
+    assert bump_fees({"gasPrice": 1}, 1.1) == {"gasPrice": 2}
+
+
+@pytest.mark.asyncio
+async def test_stuck_transaction_replaced():
+    chain = FakeChain(mine_index=2, mine_at=106)
+    tx_manager, nonce_manager = manager(chain)
+
+    receipt, status = await tx_manager.submit(TX, timeout=5)
+
+    assert status.ok
+    assert receipt["transactionHash"] == HexBytes(b"\x03")
+    # same transaction at the same nonce, fees bumped twice
+    assert [tx["maxFeePerGas"] for tx in chain.sent][:3] == [100, 113, 128]
+    assert all({**tx, "maxFeePerGas": 100, "maxPriorityFeePerGas": 10} == TX for tx in chain.sent)
+    assert not nonce_manager.pending
+
+
+@pytest.mark.asyncio
+async def test_unneeded_transaction_cancelled():
+    chain = FakeChain(mine_index=1, mine_at=0)
+    tx_manager, nonce_manager = manager(chain)
+    still_needed = mock.AsyncMock(return_value=False)
+
+    receipt, status = await tx_manager.submit(TX, timeout=5, still_needed=still_needed)
+
+    assert not status.ok
+    assert "cancelled" in status.error
+    cancel = chain.sent[1]
+    assert cancel == {
+        "to": ACCOUNT,
+        "value": 0,
+        "data": b"",
+        "gas": 21000,
+        "nonce": 4,
+        "chainId": 1,
+        "maxFeePerGas": 113,
+        "maxPriorityFeePerGas": 12,
+    }
+    still_needed.assert_awaited_once()
+    assert not nonce_manager.pending
+
+
+@pytest.mark.asyncio
+async def test_mined_transaction_not_cancelled():
+    # mined in the block that makes it due for replacement, when its report is no longer needed
+    chain = FakeChain(mine_index=0, mine_at=103)
+    tx_manager, nonce_manager = manager(chain)
+    still_needed = mock.AsyncMock(return_value=False)
+
+    receipt, status = await tx_manager.submit(TX, timeout=5, still_needed=still_needed)
+
+    assert status.ok
+    assert receipt["transactionHash"] == HexBytes(b"\x01")
+    assert len(chain.sent) == 1
+    still_needed.assert_not_awaited()
+    assert not nonce_manager.pending
+
+
+@pytest.mark.asyncio
+async def test_not_mined_in_time():
+    chain = FakeChain()
+    tx_manager, nonce_manager = manager(chain)
+    tx_manager.max_replacements = 1
+
+    receipt, status = await tx_manager.submit(TX, timeout=0.05)
+
+    assert receipt is None
+    assert "not mined" in status.error
+    assert len(chain.sent) == 2
+    # still pending
+    assert list(nonce_manager.pending) == [4]